@@ -0,0 +1,200 @@
+"""
+Service App Factory
+
+모든 서비스가 공유하는 FastAPI 앱 구성입니다.
+
+- 기본 응답 클래스로 ORJSONResponse를 사용합니다.
+- AuthException / 일반 예외 핸들러를 등록합니다. (응답 본문은 미리 직렬화, exceptions.handlers)
+- Redis, Mongo, Kafka Producer, Session View를 하나의 lifespan에서 열고 닫습니다.
+- /health 는 백엔드를 확인하지 않는 고정 응답(liveness)이고,
+  /ready 는 백엔드 확인 결과를 READINESS_CACHE_SECONDS 동안 캐시해 응답합니다(readiness).
+- GZIP_MINIMUM_SIZE 바이트 이상의 응답은 gzip으로 압축합니다.
+- 라우트별 지연 시간을 기록하고 /metrics 에서 Prometheus 텍스트 형식으로 노출합니다. (commons.metrics)
+- /admin/profiler 로 샘플링 프로파일러를 켜고 끕니다. (commons.profiler)
+
+Example:
+    app = create_app(
+        "chat",
+        routers=[websocket.router, history.router],
+        db_name=settings.CHAT_DB_NAME,
+        models=[MessageBucket],
+        use_session_view=True,
+        lifespans=[connection_hub_lifespan],
+    )
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncContextManager, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import APIRouter, FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+
+from commons.logger import get_marigold_logger
+from commons.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from commons.profile_client import profile_client
+from commons.profiler import SlowRequestMiddleware, profiler, profiler_router
+from commons.session_view import session_view
+from commons.settings import settings
+from databases.mongo_client import get_mongo_client, mongo_lifespan
+from databases.redis_client import get_redis_client, redis_lifespan
+from exceptions.auth_exceptions import AuthException
+from exceptions.handlers import JSON_MEDIA_TYPE, auth_exception_handler, general_exception_handler
+from kafka.producer import kafka_producer_lifespan
+
+logger = get_marigold_logger(__name__)
+
+Check = Callable[[], Awaitable[None]]
+Lifespan = Callable[[], AsyncContextManager]
+
+HEALTH_BODY = orjson.dumps({"status": "ok"})
+
+
+class ReadinessProbe:
+    """
+    백엔드 상태 확인 결과를 ttl 동안 캐시합니다.
+
+    동시에 들어온 확인 요청은 하나의 확인 작업을 공유하므로,
+    /ready 호출 빈도와 무관하게 백엔드에는 ttl당 최대 한 번만 요청합니다.
+    """
+
+    def __init__(self, checks: Dict[str, Check], ttl: float = settings.READINESS_CACHE_SECONDS,
+                 timeout: float = settings.READINESS_CHECK_TIMEOUT_SECONDS):
+        """
+        Args:
+            checks: 이름 → 확인 코루틴 (예외 발생 시 not ready)
+            ttl: 결과 캐시 시간
+            timeout: 확인 하나의 제한 시간
+        """
+        self.checks = checks
+        self.ttl = ttl
+        self.timeout = timeout
+        self._result: Optional[Tuple[bool, bytes]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _run_check(self, name: str, check: Check) -> Tuple[str, str]:
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+            return name, "ok"
+        except Exception as e:
+            logger.warning(f"Readiness check failed: {name}: {e}")
+            return name, "fail"
+
+    async def result(self) -> Tuple[bool, bytes]:
+        """
+        Returns:
+            (ready 여부, 응답 본문)
+        """
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+
+        async with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+                return self._result
+
+            statuses = dict(await asyncio.gather(
+                *(self._run_check(name, check) for name, check in self.checks.items())
+            ))
+            ready = all(status == "ok" for status in statuses.values())
+            body = orjson.dumps({"status": "ok" if ready else "fail", "checks": statuses})
+
+            self._result = (ready, body)
+            self._checked_at = time.monotonic()
+            return self._result
+
+
+async def _check_redis() -> None:
+    redis = await get_redis_client()
+    await redis.ping()
+
+
+async def _check_mongo() -> None:
+    await get_mongo_client().admin.command("ping")
+
+
+def create_app(
+        service_name: str,
+        routers: Sequence[APIRouter] = (),
+        db_name: Optional[str] = None,
+        models: Sequence = (),
+        use_kafka: bool = False,
+        use_session_view: bool = False,
+        use_profile_client: bool = False,
+        lifespans: Sequence[Lifespan] = (),
+        gzip_minimum_size: int = settings.GZIP_MINIMUM_SIZE
+) -> FastAPI:
+    """
+    서비스 앱을 생성합니다.
+
+    Args:
+        service_name: 서비스 이름 (앱 제목, 로그)
+        routers: 등록할 라우터 목록
+        db_name: Mongo DB 이름 (None이면 Mongo를 사용하지 않음)
+        models: Beanie Document 목록
+        use_kafka: Kafka Producer 사용 여부
+        use_session_view: 세션 이벤트 구독 여부 (JWT 세션 확인을 하는 서비스)
+        use_profile_client: 프로필 near-cache 사용 여부 (프로필 변경 이벤트 구독)
+        lifespans: 공통 리소스가 열린 뒤 순서대로 진입할 추가 lifespan (역순으로 종료)
+        gzip_minimum_size: 압축할 최소 응답 크기 (바이트)
+
+    Returns:
+        FastAPI 앱
+    """
+    checks: Dict[str, Check] = {"redis": _check_redis}
+    if db_name:
+        checks["mongo"] = _check_mongo
+    readiness = ReadinessProbe(checks)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(redis_lifespan())
+            if db_name:
+                await stack.enter_async_context(mongo_lifespan(db_name, list(models)))
+            if use_kafka:
+                await stack.enter_async_context(kafka_producer_lifespan())
+            if use_session_view:
+                await session_view.start()
+                stack.push_async_callback(session_view.stop)
+            if use_profile_client:
+                await profile_client.start()
+                stack.push_async_callback(profile_client.stop)
+            for extra in lifespans:
+                await stack.enter_async_context(extra())
+
+            logger.info(f"Service started: {service_name}")
+            yield
+            logger.info(f"Service stopping: {service_name}")
+            profiler.stop()
+
+    app = FastAPI(title=service_name, lifespan=lifespan, default_response_class=ORJSONResponse)
+
+    app.add_exception_handler(AuthException, auth_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+    app.add_middleware(GZipMiddleware, minimum_size=gzip_minimum_size)
+    app.add_middleware(SlowRequestMiddleware)
+    # 마지막에 추가한 미들웨어가 가장 바깥에서 실행되므로 압축 시간까지 포함해 측정
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/health", include_in_schema=False)
+    async def health():
+        return Response(content=HEALTH_BODY, media_type=JSON_MEDIA_TYPE)
+
+    @app.get("/ready", include_in_schema=False)
+    async def ready():
+        is_ready, body = await readiness.result()
+        return Response(content=body, status_code=200 if is_ready else 503, media_type=JSON_MEDIA_TYPE)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+    app.include_router(profiler_router)
+    for router in routers:
+        app.include_router(router)
+
+    return app
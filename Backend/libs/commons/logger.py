@@ -1,37 +1,182 @@
+import atexit
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
 
+import orjson
 
-class MarigoldLogger:
-    def __init__(self, service_name: str):
-        self.logger = logging.getLogger(service_name)
-        self.logger.setLevel(logging.INFO)
+from commons.settings import settings
+
+LOG_FORMAT = '[%(asctime)s] [%(name)s] [%(levelname)s] - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 포맷 (LOG_FORMAT=json)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(data).decode()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    레코드를 큐에 넣기만 하는 핸들러
+
+    메시지 인자만 합쳐두고 시간 포맷/traceback/JSON 직렬화는 리스너 스레드에서 처리합니다.
+    큐가 가득 차면 이벤트 루프를 막지 않도록 레코드를 버리고 개수만 셉니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 내 큐이므로 exc_info는 그대로 넘겨도 됨
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _PerLoggerFileHandler(logging.Handler):
+    """logger 이름별 RotatingFileHandler로 분배 ({log_dir}/{name}.log)"""
+
+    def __init__(self, log_dir: str, formatter: logging.Formatter):
+        super().__init__()
+        self.log_dir = log_dir
+        self.setFormatter(formatter)
+        self._handlers: Dict[str, RotatingFileHandler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self._handlers.get(record.name)
+
+        if handler is None:
+            handler = RotatingFileHandler(
+                filename=f"{self.log_dir}/{record.name}.log",
+                maxBytes=10 * 1024 * 1024,  # 10MB마다 파일 롤링
+                backupCount=5,  # 최대 5개까지 보관
+                encoding='utf-8'
+            )
+            handler.setFormatter(self.formatter)
+            self._handlers[record.name] = handler
+
+        handler.handle(record)
+
+    def close(self) -> None:
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
 
-        # 로그 포맷 정의
-        formatter = logging.Formatter(
-            '[%(asctime)s] [%(name)s] [%(levelname)s] - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+
+class _LoggingPipeline:
+    """프로세스당 하나의 큐와 리스너 스레드"""
+
+    def __init__(self):
+        if settings.LOG_FORMAT == "json":
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
 
         stream_handler = logging.StreamHandler(sys.stdout)
         stream_handler.setFormatter(formatter)
-        self.logger.addHandler(stream_handler)
+        handlers: List[logging.Handler] = [stream_handler]
+
+        log_dir = settings.LOG_DIR
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+            handlers.append(_PerLoggerFileHandler(log_dir, formatter))
+
+        log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        self.handler = _DeferredQueueHandler(log_queue)
+        self.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+        atexit.register(self.listener.stop)
+
+
+class MarigoldLogger:
+    _pipeline: Optional[_LoggingPipeline] = None
+    _loggers: Dict[str, logging.Logger] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, service_name: str):
+        with MarigoldLogger._lock:
+            logger = MarigoldLogger._loggers.get(service_name)
+
+            if logger is None:
+                if MarigoldLogger._pipeline is None:
+                    MarigoldLogger._pipeline = _LoggingPipeline()
+
+                # 이름당 한 번만 핸들러를 붙임 (중복 출력 방지)
+                logger = logging.getLogger(service_name)
+                logger.setLevel(settings.LOG_LEVEL)
+                logger.handlers = [MarigoldLogger._pipeline.handler]
+                logger.propagate = False
+                MarigoldLogger._loggers[service_name] = logger
+
+        self.logger = logger
+
+
+class LogSampler:
+    """
+    빈번한 로그 제한기
+
+    같은 key의 로그를 interval초마다 최대 limit개까지만 통과시킵니다.
+
+    Example:
+        suppressed = sampler.allow(exc.error_code)
+        if suppressed is not None:
+            logger.warning(f"... (suppressed: {suppressed})")
+    """
+
+    def __init__(self, limit: int = 10, interval: float = 1.0, max_keys: int = 1024):
+        self.limit = limit
+        self.interval = interval
+        self.max_keys = max_keys
+        # key → [구간 시작 시각, 구간 내 통과 수, 생략된 수]
+        self._windows: Dict[str, List[float]] = {}
+
+    def allow(self, key: str) -> Optional[int]:
+        """
+        Returns:
+            통과 시 지금까지 생략된 로그 수, 차단 시 None
+        """
+        now = time.monotonic()
+        window = self._windows.get(key)
+
+        if window is None or now - window[0] >= self.interval:
+            if window is None and len(self._windows) >= self.max_keys:
+                self._windows.clear()
+            suppressed = int(window[2]) if window else 0
+            self._windows[key] = [now, 1, 0]
+            return suppressed
 
-        log_dir = "/app/logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        if window[1] < self.limit:
+            window[1] += 1
+            return 0
 
-        file_handler = RotatingFileHandler(
-            filename=f"{log_dir}/{service_name}.log",
-            maxBytes=10 * 1024 * 1024,  # 10MB마다 파일 롤링
-            backupCount=5,  # 최대 5개까지 보관
-            encoding='utf-8'
-        )
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        window[2] += 1
+        return None
 
 
 def get_marigold_logger(service_name: str):
-    return MarigoldLogger(service_name).logger
\ No newline at end of file
+    return MarigoldLogger(service_name).logger
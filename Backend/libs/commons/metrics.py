@@ -0,0 +1,309 @@
+"""
+Metrics
+
+프로세스 내 카운터/히스토그램과 Prometheus 텍스트 출력입니다.
+
+- 히스토그램은 버킷 경계가 고정된 리스트에 개수를 누적하므로 관측 시 새 객체를 만들지 않습니다.
+  (bisect로 버킷 위치를 찾고 리스트 원소 하나를 증가)
+- 라벨 조합별 자식 객체는 처음 한 번만 만들어 dict에 캐시합니다.
+  라벨 값은 명령어/라우트 템플릿처럼 종류가 한정된 값만 사용해야 합니다.
+- 단일 이벤트 루프 스레드에서 갱신하므로 락을 사용하지 않습니다.
+
+Example:
+    redis_seconds = histogram("redis_command_seconds", "Redis command latency", ["command"])
+    redis_seconds.labels("GET").observe(0.0004)
+
+    text = REGISTRY.render()
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from commons.logger import get_marigold_logger
+
+logger = get_marigold_logger(__name__)
+
+# 초 단위 (0.25ms ~ 10s)
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 상한 기준 근사 분위수 (벤치마크/디버깅용)"""
+        if self.count == 0:
+            return None
+
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            child = self._new_child()
+            self._children[values] = child
+        return child
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in self._children.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(child.value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def total_count(self) -> int:
+        """모든 라벨 조합의 관측 횟수 합"""
+        return sum(child.count for child in self._children.values())
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = _format_labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class CallbackGauge(_Metric):
+    """수집 시점에 callback으로 값을 읽는 게이지 (풀 사용량 등)"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception as e:
+            logger.warning(f"Gauge callback failed: {self.name}: {e}")
+            return []
+        if value is None:
+            return []
+        return self._header() + [f"{self.name} {_format_value(value)}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = cls(name, *args, **kwargs)
+            self._metrics[name] = metric
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, label_names, buckets)
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> CallbackGauge:
+        return self._get_or_create(CallbackGauge, name, documentation, callback)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+    return REGISTRY.counter(name, documentation, label_names)
+
+
+def histogram(
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.histogram(name, documentation, label_names, buckets)
+
+
+def gauge(name: str, documentation: str, callback: Callable[[], float]) -> CallbackGauge:
+    return REGISTRY.gauge(name, documentation, callback)
+
+
+# ==================== HTTP ====================
+
+http_request_seconds = histogram(
+    "http_request_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 지연 시간을 기록하는 ASGI 미들웨어
+
+    BaseHTTPMiddleware와 달리 요청/응답을 감싸는 Task나 스트림을 만들지 않습니다.
+    라벨에는 실제 경로 대신 라우트 템플릿(/rooms/{room_id}/messages)을 사용하며,
+    매칭되지 않은 요청은 "unmatched"로 묶습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_seconds.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status)
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,154 @@
+"""
+Profile Client
+
+다른 서비스(chat, notification 등)에서 사용자 표시 정보(이름, 아바타)를 조회하는 클라이언트입니다.
+
+- 프로세스 내 near-cache(TTLCache, PROFILE_NEAR_CACHE_TTL_SECONDS)에서 먼저 찾고,
+  없는 ID만 모아 user 서비스의 POST /profiles/batch를 한 번 호출합니다. (INTERNAL_SERVICE_TOKEN으로 인증)
+  존재하지 않는 사용자도 캐시합니다. (_MISSING)
+- PROFILE_EVENTS_CHANNEL을 구독해 프로필 수정 시 해당 항목을 즉시 지웁니다.
+  이벤트를 놓쳐도 near-cache TTL이 지나면 다시 조회하므로, 오래된 값이 보이는 시간은 TTL로 제한됩니다.
+
+Example:
+    profiles = await profile_client.get_many(member_ids)  # 500명 → 최대 HTTP 1회
+"""
+
+import asyncio
+from typing import Dict, Iterable, Optional
+
+import httpx
+import orjson
+
+from commons.logger import get_marigold_logger
+from commons.service_auth import service_headers
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from databases.redis_client import get_redis_client
+from dto.profile_dto import ProfileBatchResponse, ProfileSummary
+
+logger = get_marigold_logger(__name__)
+
+# 존재하지 않는 사용자 (TTLCache는 None을 캐시 miss로 취급하므로 별도 표식 사용)
+_MISSING = object()
+
+
+class ProfileClient:
+    def __init__(
+            self,
+            base_url: str = settings.USER_SERVICE_URL,
+            ttl: float = settings.PROFILE_NEAR_CACHE_TTL_SECONDS,
+            max_size: int = settings.PROFILE_NEAR_CACHE_MAX_SIZE,
+            channel: str = settings.PROFILE_EVENTS_CHANNEL,
+            batch_size: int = 1000
+    ):
+        self.base_url = base_url
+        self.channel = channel
+        self.batch_size = batch_size
+        self._cache: TTLCache[str, object] = TTLCache(max_size, default_ttl=ttl)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Content-Type": "application/json", **service_headers()},
+                timeout=httpx.Timeout(5.0),
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            )
+        return self._http
+
+    async def get_many(self, user_ids: Iterable[str]) -> Dict[str, ProfileSummary]:
+        """
+        여러 사용자의 프로필을 조회합니다.
+
+        Returns:
+            user_id → 프로필 (존재하지 않는 사용자는 제외)
+
+        Raises:
+            httpx.HTTPError: user 서비스 호출 실패
+        """
+        profiles: Dict[str, ProfileSummary] = {}
+        misses = []
+
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cache.get(user_id)
+            if cached is None:
+                misses.append(user_id)
+            elif cached is not _MISSING:
+                profiles[user_id] = cached
+
+        for i in range(0, len(misses), self.batch_size):
+            chunk = misses[i:i + self.batch_size]
+            response = await self._client().post("/profiles/batch", content=orjson.dumps({"ids": chunk}))
+            response.raise_for_status()
+            loaded = ProfileBatchResponse.model_validate_json(response.content).profiles
+
+            for user_id in chunk:
+                profile = loaded.get(user_id)
+                self._cache.set(user_id, profile if profile is not None else _MISSING)
+                if profile is not None:
+                    profiles[user_id] = profile
+
+        return profiles
+
+    async def get(self, user_id: str) -> Optional[ProfileSummary]:
+        return (await self.get_many([user_id])).get(user_id)
+
+    def invalidate(self, user_id: str) -> None:
+        self._cache.delete(user_id)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    # ==================== 수명 주기 ====================
+
+    async def start(self) -> None:
+        """프로필 변경 이벤트 구독을 시작합니다 (서비스 시작 시 호출)."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                redis = await get_redis_client()
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+
+                # 구독 전에 발생한 변경은 놓쳤을 수 있으므로 비움
+                self._cache.clear()
+
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        try:
+                            self.invalidate(orjson.loads(message["data"])["userId"])
+                        except (orjson.JSONDecodeError, KeyError, TypeError):
+                            logger.warning(f"Invalid profile event: {message['data']!r}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Profile event subscription failed: {e}")
+                self._cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+
+profile_client = ProfileClient()
@@ -0,0 +1,395 @@
+"""
+Profiler
+
+운영 중인 프로세스에서 필요할 때만 켜는 샘플링 프로파일러입니다.
+관리자 엔드포인트(/admin/profiler, PROFILER_ADMIN_TOKEN 필요)로 프로세스별로 켜고 끕니다.
+
+- 샘플링: 별도 스레드가 sample_interval마다 이벤트 루프 스레드의 스택을 읽어
+  collapsed stack("file:func;file:func count", flamegraph.pl / speedscope 호환)으로 누적합니다.
+- 이벤트 루프 블로킹 감지: 루프에서 sample_interval마다 heartbeat를 기록하고,
+  샘플링 스레드가 heartbeat 지연이 block_threshold를 넘는 구간을 블로킹 구간으로 기록합니다.
+  (동기 파일 로깅, CPU를 많이 쓰는 jwt.decode 연속 호출 등) 구간 동안의 스택도 함께 남깁니다.
+- 느린 요청: slow_request_threshold를 넘은 요청의 시간 정보, 임계값 시점에 요청이 대기 중이던 스택,
+  요청 동안 이벤트 루프에서 샘플링된 스택을 크기가 고정된 링 버퍼에 보관합니다.
+
+꺼져 있을 때는 스레드/heartbeat가 없고, 미들웨어는 플래그 확인만 합니다.
+켜진 상태도 max_duration이 지나면 자동으로 꺼집니다.
+"""
+
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from exceptions.auth_exceptions import AdminAccessDeniedException
+
+logger = get_marigold_logger(__name__)
+
+OTHER_STACK = "[other]"
+
+
+@dataclass
+class BlockEpisode:
+    """이벤트 루프가 block_threshold 이상 응답하지 않은 구간"""
+    started_at: float
+    duration_ms: float
+    stacks: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SlowRequest:
+    method: str
+    path: str
+    route: str
+    status: int
+    started_at: float
+    duration_ms: float
+    blocked_ms: float
+    awaiting_stack: List[str] = field(default_factory=list)
+    loop_stacks: Dict[str, int] = field(default_factory=dict)
+
+
+def _awaiting_stack(task: asyncio.Task, limit: int = 64) -> List[str]:
+    """
+    Task가 대기 중인 코루틴 체인 (바깥 → 안쪽)
+
+    task.get_stack()은 일시 중단된 코루틴의 맨 바깥 프레임만 반환하므로 cr_await를 따라갑니다.
+    """
+    stack: List[str] = []
+    awaitable = task.get_coro()
+
+    while awaitable is not None and len(stack) < limit:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) \
+            or getattr(awaitable, "ag_frame", None)
+        if frame is None:
+            break
+
+        code = frame.f_code
+        stack.append(f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}")
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None) \
+            or getattr(awaitable, "ag_await", None)
+
+    return stack
+
+
+def _frame_name(code, cache: Dict[object, str]) -> str:
+    name = cache.get(code)
+    if name is None:
+        qualname = getattr(code, "co_qualname", code.co_name)
+        name = f"{os.path.basename(code.co_filename)}:{qualname}".replace(";", ":").replace(" ", "_")
+        cache[code] = name
+    return name
+
+
+class SamplingProfiler:
+    def __init__(
+            self,
+            sample_interval: float = settings.PROFILER_SAMPLE_INTERVAL_SECONDS,
+            block_threshold: float = settings.PROFILER_BLOCK_THRESHOLD_SECONDS,
+            slow_request_threshold: float = settings.PROFILER_SLOW_REQUEST_SECONDS,
+            buffer_size: int = settings.PROFILER_BUFFER_SIZE,
+            max_stacks: int = settings.PROFILER_MAX_STACKS,
+            max_duration: float = settings.PROFILER_MAX_DURATION_SECONDS
+    ):
+        """
+        Args:
+            sample_interval: 스택 샘플링 / heartbeat 주기 (초)
+            block_threshold: 블로킹으로 판단할 heartbeat 지연 (초)
+            slow_request_threshold: 느린 요청 기준 (초)
+            buffer_size: 블로킹 구간 / 느린 요청 링 버퍼 크기
+            max_stacks: 누적할 서로 다른 스택 수 (초과분은 [other]로 합산)
+            max_duration: 자동 종료까지의 시간 (초)
+        """
+        self.sample_interval = sample_interval
+        self.block_threshold = block_threshold
+        self.slow_request_threshold = slow_request_threshold
+        self.max_stacks = max_stacks
+        self.max_duration = max_duration
+
+        self.active = False
+        self.started_at: Optional[float] = None
+
+        self._stacks: Counter = Counter()
+        # 느린 요청에 붙일 최근 샘플 (약 60초 분량)
+        self._recent: Deque[Tuple[float, str]] = deque(maxlen=max(1, int(60 / sample_interval)))
+        self.blocks: Deque[BlockEpisode] = deque(maxlen=buffer_size)
+        self.slow_requests: Deque[SlowRequest] = deque(maxlen=buffer_size)
+
+        self._lock = threading.Lock()
+        self._names: Dict[object, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.TimerHandle] = None
+        self._auto_stop: Optional[asyncio.TimerHandle] = None
+        self._last_tick = 0.0
+        self._episode: Optional[BlockEpisode] = None
+
+    # ==================== 켜기/끄기 (이벤트 루프에서 호출) ====================
+
+    def start(self, duration: Optional[float] = None) -> None:
+        """
+        프로파일링을 시작합니다.
+
+        Args:
+            duration: 자동 종료까지의 시간 (None이면 max_duration, max_duration을 넘을 수 없음)
+        """
+        if self.active:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self.active = True
+        self.started_at = time.time()
+
+        self._tick()
+        duration = min(duration or self.max_duration, self.max_duration)
+        self._auto_stop = self._loop.call_later(duration, self.stop)
+
+        self._thread = threading.Thread(target=self._sample_loop, name="marigold-profiler", daemon=True)
+        self._thread.start()
+        logger.warning(f"Profiler started (interval: {self.sample_interval}s, duration: {duration}s)")
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+
+        self.active = False
+        self._stop.set()
+        for handle in (self._heartbeat, self._auto_stop):
+            if handle is not None:
+                handle.cancel()
+        self._heartbeat = None
+        self._auto_stop = None
+        self._thread = None
+        logger.warning("Profiler stopped")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self._recent.clear()
+        self.blocks.clear()
+        self.slow_requests.clear()
+
+    def _tick(self) -> None:
+        self._last_tick = time.monotonic()
+        if self.active:
+            self._heartbeat = self._loop.call_later(self.sample_interval, self._tick)
+
+    # ==================== 샘플링 스레드 ====================
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None:
+            names.append(_frame_name(frame.f_code, self._names))
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            now = time.monotonic()
+            stack = self._collapse(frame)
+            del frame
+
+            with self._lock:
+                self._recent.append((now, stack))
+                if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] += 1
+                else:
+                    self._stacks[OTHER_STACK] += 1
+
+            lag = now - self._last_tick
+            episode = self._episode
+            if lag > self.block_threshold:
+                if episode is None:
+                    episode = BlockEpisode(started_at=time.time() - lag, duration_ms=0.0)
+                    self._episode = episode
+                episode.duration_ms = lag * 1000
+                episode.stacks[stack] = episode.stacks.get(stack, 0) + 1
+
+            elif episode is not None:
+                self.blocks.append(episode)
+                self._episode = None
+                top = max(episode.stacks, key=episode.stacks.get)
+                logger.warning(f"Event loop blocked for {episode.duration_ms:.0f}ms at {top.rsplit(';', 3)[-3:]}")
+
+    # ==================== 조회 ====================
+
+    def loop_stacks_between(self, start: float, end: float) -> Dict[str, int]:
+        """start ~ end(monotonic) 동안 샘플링된 이벤트 루프 스택"""
+        with self._lock:
+            samples = list(self._recent)
+        return dict(Counter(stack for ts, stack in samples if start <= ts <= end))
+
+    def blocked_ms_between(self, start_wall: float, end_wall: float) -> float:
+        """start_wall ~ end_wall 동안 이벤트 루프가 블로킹된 시간 (아직 끝나지 않은 구간 포함)"""
+        episodes = list(self.blocks)
+        if self._episode is not None:
+            episodes.append(self._episode)
+
+        blocked = 0.0
+        for episode in episodes:
+            episode_end = episode.started_at + episode.duration_ms / 1000
+            overlap = min(end_wall, episode_end) - max(start_wall, episode.started_at)
+            if overlap > 0:
+                blocked += overlap * 1000
+        return blocked
+
+    def collapsed(self) -> str:
+        """전체 샘플을 collapsed stack 형식으로 반환합니다."""
+        with self._lock:
+            items = list(self._stacks.items())
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def status(self) -> dict:
+        with self._lock:
+            samples = sum(self._stacks.values())
+        return {
+            "active": self.active,
+            "started_at": self.started_at,
+            "samples": samples,
+            "blocks": len(self.blocks),
+            "slow_requests": len(self.slow_requests),
+        }
+
+
+profiler = SamplingProfiler()
+
+
+class SlowRequestMiddleware:
+    """
+    프로파일러가 켜져 있을 때 느린 요청을 기록하는 ASGI 미들웨어
+
+    요청이 slow_request_threshold를 넘는 순간 요청 Task가 대기 중인 스택(task.get_stack)을 잡아두고,
+    끝난 뒤 전체 시간과 그동안의 이벤트 루프 샘플을 함께 링 버퍼에 저장합니다.
+    """
+
+    def __init__(self, app, target: SamplingProfiler = profiler):
+        self.app = app
+        self.profiler = target
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.active:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        awaiting: List[str] = []
+        task = asyncio.current_task()
+        started_wall = time.time()
+        start = time.monotonic()
+
+        def capture() -> None:
+            awaiting.extend(_awaiting_stack(task))
+
+        watchdog = asyncio.get_running_loop().call_later(self.profiler.slow_request_threshold, capture)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            watchdog.cancel()
+            end = time.monotonic()
+            duration = end - start
+
+            if duration >= self.profiler.slow_request_threshold:
+                route = scope.get("route")
+                self.profiler.slow_requests.append(SlowRequest(
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=getattr(route, "path", "unmatched"),
+                    status=status,
+                    started_at=started_wall,
+                    duration_ms=duration * 1000,
+                    blocked_ms=self.profiler.blocked_ms_between(started_wall, started_wall + duration),
+                    awaiting_stack=awaiting,
+                    loop_stacks=self.profiler.loop_stacks_between(start, end),
+                ))
+
+
+# ==================== 관리자 엔드포인트 ====================
+
+async def require_admin_token(x_admin_token: str = Header(default=None)) -> None:
+    """
+    X-Admin-Token 헤더를 PROFILER_ADMIN_TOKEN과 비교합니다. (상수 시간 비교)
+
+    Raises:
+        AdminAccessDeniedException: 토큰이 설정되지 않았거나 일치하지 않음
+    """
+    expected = settings.PROFILER_ADMIN_TOKEN
+    if not expected or not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise AdminAccessDeniedException()
+
+
+profiler_router = APIRouter(
+    prefix="/admin/profiler",
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False
+)
+
+
+@profiler_router.post("/start")
+async def start_profiler(duration: Optional[float] = None, reset: bool = True):
+    if reset and not profiler.active:
+        profiler.reset()
+    profiler.start(duration)
+    return profiler.status()
+
+
+@profiler_router.post("/stop")
+async def stop_profiler():
+    profiler.stop()
+    return profiler.status()
+
+
+@profiler_router.get("/status")
+async def profiler_status():
+    return profiler.status()
+
+
+@profiler_router.get("/collapsed", response_class=PlainTextResponse)
+async def collapsed_stacks():
+    """flamegraph.pl / speedscope에 바로 넣을 수 있는 collapsed stack"""
+    return PlainTextResponse(profiler.collapsed())
+
+
+@profiler_router.get("/blocks")
+async def block_episodes():
+    return [asdict(episode) for episode in profiler.blocks]
+
+
+@profiler_router.get("/slow-requests")
+async def slow_requests():
+    return [asdict(request) for request in profiler.slow_requests]
+
+
+@profiler_router.get("/slow-requests/collapsed", response_class=PlainTextResponse)
+async def slow_request_stacks():
+    """느린 요청 동안의 이벤트 루프 샘플을 합친 collapsed stack"""
+    merged: Counter = Counter()
+    for request in profiler.slow_requests:
+        merged.update(request.loop_stacks)
+    return PlainTextResponse("".join(f"{stack} {count}\n" for stack, count in merged.items()))
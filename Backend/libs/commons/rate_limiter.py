@@ -0,0 +1,265 @@
+"""
+Rate Limiter
+
+Redis Lua 토큰 버킷 기반의 분산 Rate Limiter입니다.
+
+- 버킷 상태(tokens, ts)는 Redis 해시 하나에 저장하고, 충전/차감은 Lua 스크립트 안에서
+  redis.call('TIME') 기준으로 원자적으로 처리합니다. (서버 간 시계 차이 영향 없음)
+- 요청마다 Redis를 거치지 않도록 프로세스가 토큰을 lease_size개씩 미리 빌려(lease) 로컬에서 소모합니다.
+  빌린 토큰은 lease_ttl 안에 쓰지 않으면 버려지므로, 전체 허용량은 설정값을 넘지 않습니다. (보수적으로 동작)
+- 거절되면 Redis가 알려준 재시도 시각까지 로컬에서 바로 거절하므로, 폭주 시에도 Redis 부하가 늘지 않습니다.
+- Redis 장애 시 기본적으로 요청을 통과시킵니다. (fail_open)
+
+Example:
+    login_limit = RateLimit(RateLimiter("login", rate=5, period=60, burst=5, lease_size=1))
+
+    @router.post("/login", dependencies=[Depends(login_limit)])
+    async def login(...): ...
+"""
+
+import asyncio
+import ipaddress
+import math
+import time
+from typing import Callable, List, Optional, Union
+
+from fastapi import Request
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from databases.redis_client import get_redis_client
+from exceptions.auth_exceptions import RateLimitExceededException
+
+logger = get_marigold_logger(__name__)
+
+RATE_LIMIT_PREFIX = "rate_limit"
+
+# KEYS[1] = 버킷 키
+# ARGV[1] = 초당 충전량, ARGV[2] = 최대 토큰 수(burst), ARGV[3] = 요청 토큰 수
+# 반환: {지급한 토큰 수, 재시도까지 남은 ms}
+LEASE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+
+local retry_ms = 0
+if granted == 0 then
+    retry_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+return {granted, retry_ms}
+"""
+
+
+class _Lease:
+    __slots__ = ("tokens", "expires_at", "denied_until", "lock")
+
+    def __init__(self):
+        self.tokens = 0
+        self.expires_at = 0.0
+        self.denied_until = 0.0
+        self.lock = asyncio.Lock()
+
+
+class RateLimiter:
+    def __init__(
+            self,
+            name: str,
+            rate: float,
+            period: float,
+            burst: Optional[float] = None,
+            lease_size: int = settings.RATE_LIMIT_LEASE_SIZE,
+            lease_ttl: float = settings.RATE_LIMIT_LEASE_TTL_SECONDS,
+            max_keys: int = settings.RATE_LIMIT_MAX_LOCAL_KEYS,
+            fail_open: bool = True
+    ):
+        """
+        Args:
+            name: 리미터 이름 (Redis 키 구분용)
+            rate: period 동안 허용할 요청 수
+            period: 기간 (초)
+            burst: 순간 허용량 (기본값: rate)
+            lease_size: 한 번에 빌려올 토큰 수 (키별 한도가 작으면 1 권장)
+            lease_ttl: 빌린 토큰의 로컬 유효 시간
+            max_keys: 로컬에 유지할 최대 키 수
+            fail_open: Redis 장애 시 통과 여부
+        """
+        self.name = name
+        self.rate_per_second = rate / period
+        self.burst = burst if burst is not None else rate
+        self.lease_size = max(1, min(lease_size, int(self.burst)))
+        self.lease_ttl = lease_ttl
+        self.fail_open = fail_open
+
+        self._leases: TTLCache[str, _Lease] = TTLCache(max_size=max_keys)
+        self._redis: Optional[Redis] = None
+        self._script: Optional[AsyncScript] = None
+
+        self.local_hits = 0
+        self.redis_calls = 0
+        self.rejected = 0
+
+    def _key(self, identity: str) -> str:
+        return f"{RATE_LIMIT_PREFIX}:{self.name}:{identity}"
+
+    async def _get_script(self) -> AsyncScript:
+        redis = await get_redis_client()
+
+        if redis is not self._redis:
+            self._script = redis.register_script(LEASE_SCRIPT)
+            self._redis = redis
+
+        return self._script
+
+    def _get_lease(self, identity: str) -> _Lease:
+        lease = self._leases.get(identity, count=False)
+        if lease is None:
+            lease = _Lease()
+            self._leases.set(identity, lease)
+        return lease
+
+    @staticmethod
+    def _spend(lease: _Lease, now: float) -> bool:
+        if lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, identity: str) -> float:
+        """
+        토큰 하나를 소모합니다.
+
+        Args:
+            identity: 제한 대상 (사용자 ID, IP 등)
+
+        Returns:
+            float: 허용되면 0, 거절되면 재시도까지 남은 시간(초)
+        """
+        lease = self._get_lease(identity)
+        now = time.monotonic()
+
+        if self._spend(lease, now):
+            self.local_hits += 1
+            return 0.0
+        if now < lease.denied_until:
+            self.rejected += 1
+            return lease.denied_until - now
+
+        async with lease.lock:
+            # 대기하는 동안 다른 코루틴이 lease를 채웠을 수 있음
+            now = time.monotonic()
+            if self._spend(lease, now):
+                self.local_hits += 1
+                return 0.0
+            if now < lease.denied_until:
+                self.rejected += 1
+                return lease.denied_until - now
+
+            try:
+                script = await self._get_script()
+                granted, retry_ms = await script(
+                    keys=[self._key(identity)],
+                    args=[self.rate_per_second, self.burst, self.lease_size]
+                )
+                self.redis_calls += 1
+            except Exception as e:
+                logger.error(f"Rate limiter '{self.name}' unavailable: {e}")
+                if self.fail_open:
+                    return 0.0
+                self.rejected += 1
+                return 1.0
+
+            now = time.monotonic()
+            if int(granted) > 0:
+                lease.tokens = int(granted) - 1
+                lease.expires_at = now + self.lease_ttl
+                return 0.0
+
+            lease.denied_until = now + int(retry_ms) / 1000
+            self.rejected += 1
+            return int(retry_ms) / 1000
+
+    async def check(self, identity: str) -> None:
+        """
+        토큰 하나를 소모하고, 한도를 넘으면 예외를 발생시킵니다.
+
+        Raises:
+            RateLimitExceededException: 한도 초과
+        """
+        retry_after = await self.acquire(identity)
+        if retry_after > 0:
+            raise RateLimitExceededException(retry_after=math.ceil(retry_after))
+
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_trusted_proxies(value: str) -> List[Network]:
+    return [ipaddress.ip_network(cidr.strip(), strict=False) for cidr in value.split(",") if cidr.strip()]
+
+
+TRUSTED_PROXIES = parse_trusted_proxies(settings.RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def is_trusted_proxy(host: str, trusted: List[Network] = TRUSTED_PROXIES) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted)
+
+
+def client_ip(request: Request) -> str:
+    """
+    요청자 IP
+
+    X-Forwarded-For의 값은 클라이언트가 마음대로 넣을 수 있으므로 첫 번째 값을 믿지 않습니다.
+    연결한 주소가 신뢰하는 프록시(RATE_LIMIT_TRUSTED_PROXIES)일 때만 헤더를 오른쪽부터 읽어
+    신뢰하는 프록시가 아닌 첫 번째 주소를 사용합니다.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(peer):
+        return peer
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded:
+        return peer
+
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not is_trusted_proxy(hop):
+            return hop
+
+    # 모든 hop이 신뢰하는 프록시면 가장 앞의 주소
+    return hops[0] if hops else peer
+
+
+class RateLimit:
+    """
+    FastAPI 의존성
+
+    Example:
+        @router.post("/refresh", dependencies=[Depends(RateLimit(refresh_limiter))])
+    """
+
+    def __init__(self, limiter: RateLimiter, key_func: Callable[[Request], str] = client_ip):
+        self.limiter = limiter
+        self.key_func = key_func
+
+    async def __call__(self, request: Request) -> None:
+        await self.limiter.check(self.key_func(request))
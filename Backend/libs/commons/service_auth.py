@@ -0,0 +1,41 @@
+"""
+Service Auth
+
+서비스 간 내부 호출(예: user 서비스의 POST /profiles/batch)을 인증합니다.
+
+호출하는 쪽은 X-Service-Token 헤더에 INTERNAL_SERVICE_TOKEN을 담아 보내고,
+받는 쪽은 require_service_token 의존성으로 상수 시간 비교합니다.
+토큰이 설정되지 않은 서비스에서는 내부 엔드포인트가 항상 403을 반환합니다.
+
+Example:
+    @router.post("/profiles/batch", dependencies=[Depends(require_service_token)])
+    async def get_profiles(...): ...
+"""
+
+import hmac
+from typing import Dict
+
+from fastapi import Header
+
+from commons.settings import settings
+from exceptions.auth_exceptions import ServiceAccessDeniedException
+
+SERVICE_TOKEN_HEADER = "X-Service-Token"
+
+
+def service_headers() -> Dict[str, str]:
+    """내부 호출에 붙일 인증 헤더 (토큰이 없으면 빈 dict)"""
+    token = settings.INTERNAL_SERVICE_TOKEN
+    return {SERVICE_TOKEN_HEADER: token} if token else {}
+
+
+async def require_service_token(x_service_token: str = Header(default=None)) -> None:
+    """
+    X-Service-Token 헤더를 INTERNAL_SERVICE_TOKEN과 비교합니다. (상수 시간 비교)
+
+    Raises:
+        ServiceAccessDeniedException: 토큰이 설정되지 않았거나 일치하지 않음
+    """
+    expected = settings.INTERNAL_SERVICE_TOKEN
+    if not expected or not x_service_token or not hmac.compare_digest(x_service_token.encode(), expected.encode()):
+        raise ServiceAccessDeniedException()
@@ -0,0 +1,119 @@
+"""
+Session View
+
+사용자별 활성 세션 여부를 프로세스 내에 유지합니다.
+auth 서비스의 세션 스크립트가 발급/무효화 시 SESSION_EVENTS_CHANNEL로 이벤트를 발행하고,
+각 서비스는 이를 구독해 로컬 상태를 즉시 갱신합니다.
+
+이벤트를 놓치더라도(재연결 등) 각 항목은 SESSION_VIEW_MAX_STALENESS_SECONDS 후 만료되어
+Redis(ZCARD)에서 다시 확인하므로, 로컬 상태가 오래될 수 있는 시간은 이 값으로 제한됩니다.
+
+이벤트 형식 (JSON):
+    {"type": "issued", "userId": "..."}
+    {"type": "revoked", "userId": "...", "remaining": 0}
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from databases.redis_client import get_redis_client
+
+logger = get_marigold_logger(__name__)
+
+
+class SessionView:
+    def __init__(
+            self,
+            channel: str = settings.SESSION_EVENTS_CHANNEL,
+            max_staleness: float = settings.SESSION_VIEW_MAX_STALENESS_SECONDS,
+            max_size: int = settings.SESSION_VIEW_MAX_SIZE
+    ):
+        self.channel = channel
+        # user_id → 활성 세션 존재 여부
+        self._states: TTLCache[str, bool] = TTLCache(max_size, default_ttl=max_staleness)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def has_active_session(self, user_id: str) -> bool:
+        """
+        사용자의 활성 세션 존재 여부를 반환합니다.
+
+        로컬 상태가 없거나 만료된 경우에만 Redis를 조회합니다.
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        active = self._states.get(user_id)
+
+        if active is None:
+            redis = await get_redis_client()
+            active = await redis.zcard(f"user_tokens:{user_id}") > 0
+            self._states.set(user_id, active)
+
+        return active
+
+    def apply_event(self, data: str) -> None:
+        """세션 이벤트 하나를 로컬 상태에 반영합니다."""
+        try:
+            event = json.loads(data)
+            user_id = event["userId"]
+
+            if event["type"] == "issued":
+                self._states.set(user_id, True)
+            elif event["type"] == "revoked":
+                self._states.set(user_id, event.get("remaining", 0) > 0)
+
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignored malformed session event: {e}")
+
+    async def start(self) -> None:
+        """세션 이벤트 구독을 시작합니다 (서비스 시작 시 호출)."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """세션 이벤트 구독을 종료합니다 (서비스 종료 시 호출)."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> dict:
+        return self._states.stats()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                redis = await get_redis_client()
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(self.channel)
+
+                # 구독 전에 발생한 이벤트는 놓쳤을 수 있으므로 로컬 상태를 비움
+                self._states.clear()
+                logger.info(f"Subscribed to session events: {self.channel}")
+
+                while True:
+                    # listen()은 REDIS_SOCKET_TIMEOUT에 걸려 끊기므로 짧은 timeout으로 폴링
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        self.apply_event(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Session event subscription failed: {e}")
+                self._states.clear()
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+
+session_view = SessionView()
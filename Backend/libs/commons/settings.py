@@ -1,24 +1,89 @@
 import os
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class RootSettings(BaseSettings):
     # MongoDB
     MONGO_URL: str
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = 5000  # 풀 고갈 시 대기 시간
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
 
     AUTH_DB_NAME: str
     CHAT_DB_NAME: str
     AI_DB_NAME: str
     CALENDAR_DB_NAME: str
+    USER_DB_NAME: str = "user"
 
     # Kafka
     KAFKA_BOOTSTRAP_SERVERS: str
+    KAFKA_SERIALIZER: str = "orjson"  # orjson | msgpack
+    KAFKA_PRODUCER_LINGER_MS: int = 5
+    KAFKA_PRODUCER_MAX_BATCH_SIZE: int = 64 * 1024
+    KAFKA_PRODUCER_COMPRESSION: Optional[str] = "lz4"  # gzip | snappy | lz4 | zstd | None
+    KAFKA_PRODUCER_MAX_IN_FLIGHT: int = 10000  # 응답 대기 중인 최대 메시지 수
+    KAFKA_PRODUCER_ACKS: str = "all"
+    KAFKA_CONSUMER_BATCH_SIZE: int = 500
+    KAFKA_CONSUMER_FETCH_TIMEOUT_MS: int = 1000
+    KAFKA_CONSUMER_MAX_CONCURRENCY: int = 16  # 동시에 처리할 최대 파티션 수
+    KAFKA_CONSUMER_MAX_RETRIES: int = 3
+    KAFKA_DEAD_LETTER_SUFFIX: str = ".dlq"
+
+    # Service
+    GZIP_MINIMUM_SIZE: int = 1000  # 이 크기 이상의 응답만 압축 (바이트)
+    READINESS_CACHE_SECONDS: float = 5.0  # /ready 백엔드 확인 결과 캐시 시간
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0
+
+    # Profiler
+    PROFILER_ADMIN_TOKEN: Optional[str] = None  # 설정하지 않으면 /admin/profiler 비활성화
+    PROFILER_SAMPLE_INTERVAL_SECONDS: float = 0.02
+    PROFILER_BLOCK_THRESHOLD_SECONDS: float = 0.1  # 이벤트 루프 블로킹으로 판단할 지연
+    PROFILER_SLOW_REQUEST_SECONDS: float = 1.0
+    PROFILER_BUFFER_SIZE: int = 100  # 블로킹 구간 / 느린 요청 보관 수
+    PROFILER_MAX_STACKS: int = 10000
+    PROFILER_MAX_DURATION_SECONDS: float = 300.0  # 켜진 뒤 자동으로 꺼질 때까지의 시간
+
+    # Rate Limit
+    RATE_LIMIT_LEASE_SIZE: int = 10  # 한 번에 Redis에서 빌려올 토큰 수
+    RATE_LIMIT_LEASE_TTL_SECONDS: float = 1.0  # 빌린 토큰의 로컬 유효 시간
+    RATE_LIMIT_MAX_LOCAL_KEYS: int = 100000
+    # X-Forwarded-For를 믿을 프록시 주소 (쉼표로 구분한 CIDR, 예: "10.0.0.0/8,172.16.0.0/12")
+    # 비어 있으면 헤더를 무시하고 연결한 주소를 사용
+    RATE_LIMIT_TRUSTED_PROXIES: str = ""
+    LOGIN_RATE_PER_MINUTE: int = 10  # 사용자별
+    REFRESH_RATE_PER_MINUTE: int = 30  # 사용자별
 
     # Redis
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0  # 풀 고갈 시 연결 대기 시간(초)
+    REDIS_SOCKET_TIMEOUT: Optional[float] = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
 
     # Ollama
     OLLAMA_BASE_URL: str
+    OLLAMA_MAX_CONCURRENCY: int = 4  # 모델 서버 동시 요청 수
+    OLLAMA_MAX_CONNECTIONS: int = 16
+    OLLAMA_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    OLLAMA_READ_TIMEOUT_SECONDS: float = 120.0
+
+    # Embedding
+    EMBEDDING_CACHE_DIR: str = "/app/cache/embeddings"
+    EMBEDDING_CACHE_LRU_SIZE: int = 50000  # 프로세스 내 캐시 벡터 수
+
+    # Vector Index
+    VECTOR_INDEX_DIR: str = "/app/cache/vector_index"
+    VECTOR_INDEX_MAX_OPEN: int = 256  # 동시에 열어둘 인덱스 수
+    VECTOR_INDEX_COMPACT_RATIO: float = 0.2  # 삭제 비율이 이 값 이상이면 compaction
+    VECTOR_INDEX_IVF_MIN_SIZE: int = 50000  # 이 벡터 수 이상이면 IVF 빌드
+    VECTOR_INDEX_IVF_NPROBE: int = 8
 
     # JWT
     JWT_SECRET_KEY: str
@@ -26,7 +91,72 @@ class RootSettings(BaseSettings):
     JWT_ISSUER: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_ROTATION: bool = False  # 갱신 시 Refresh Token 교체 여부
+    REFRESH_REUSE_GRACE_SECONDS: int = 10  # 교체 직후 동시 요청을 재사용으로 보지 않는 시간
     MAX_DEVICES_PER_USER: int
+    JWT_CACHE_MAX_SIZE: int = 10000  # 검증된 토큰 캐시 최대 항목 수
+
+    # Session
+    SESSION_EVENTS_CHANNEL: str = "session_events"
+    SESSION_VIEW_MAX_STALENESS_SECONDS: float = 5.0  # 로컬 세션 상태 최대 유지 시간
+    SESSION_VIEW_MAX_SIZE: int = 100000
+
+    # Chat
+    CHAT_HUB_SHARDS: int = 16  # 노드 내 방 fan-out shard 수
+    CHAT_SEND_QUEUE_SIZE: int = 256  # 소켓별 송신 큐 크기 (초과 시 연결 종료)
+    CHAT_SEND_BATCH_SIZE: int = 32  # 한 프레임에 묶을 최대 메시지 수
+    CHAT_SHARD_INBOX_SIZE: int = 10000  # shard별 dispatch 대기 프레임 수 (초과 시 버림)
+    CHAT_FANOUT_CHANNEL_PREFIX: str = "chat:fanout"
+    CHAT_BUCKET_SIZE: int = 200  # 버킷 문서당 최대 메시지 수
+    CHAT_BUCKET_SPAN_MINUTES: int = 60  # 버킷 시간 구간
+    CHAT_RECENT_CACHE_SIZE: int = 50  # 방별 Redis 최신 메시지 캐시 크기
+    CHAT_RECENT_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    CHAT_PRESENCE_TTL_SECONDS: int = 60  # heartbeat가 없으면 offline으로 판정
+    CHAT_PRESENCE_HEARTBEAT_SECONDS: float = 20.0
+    CHAT_ACTIVITY_WINDOW_SECONDS: float = 1.0  # typing / read 이벤트 집계 윈도우
+    CHAT_READ_FLUSH_SECONDS: float = 5.0  # 읽음 위치 MongoDB 반영 주기
+    CHAT_READ_FLUSH_BATCH: int = 1000
+    CHAT_READ_STATE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    CHAT_READ_MAX_CLOCK_SKEW_SECONDS: int = 5  # 생성 시각이 현재보다 이만큼 넘게 앞선 messageId는 읽음 처리 거부
+
+    # Calendar
+    CALENDAR_INDEX_TTL_SECONDS: float = 30.0  # 사용자별 일정 인덱스 캐시 유지 시간
+    CALENDAR_INDEX_MAX_USERS: int = 10000
+
+    # Notification
+    NOTIFICATION_EVENTS_TOPIC: str = "chat.notification-events"  # 병합할 채팅 이벤트 입력 토픽
+    NOTIFICATION_DELIVERY_TOPIC: str = "notification.deliveries"  # 발송할 알림 출력 토픽
+    NOTIFICATION_CONSUMER_GROUP: str = "notification"
+    NOTIFICATION_SCHEDULER_BUCKET_SECONDS: int = 60  # 예약 시각 bucket 크기
+    NOTIFICATION_SCHEDULER_BATCH_SIZE: int = 500
+    NOTIFICATION_SCHEDULER_CONCURRENCY: int = 64
+    NOTIFICATION_SCHEDULER_LEASE_SECONDS: float = 60.0  # 처리 제한 시간 (초과 시 재전달)
+    NOTIFICATION_SCHEDULER_MAX_ATTEMPTS: int = 5  # 초과 시 dead-letter로 이동
+    NOTIFICATION_SCHEDULER_POLL_INTERVAL_SECONDS: float = 0.5
+    NOTIFICATION_COALESCE_WINDOW_SECONDS: float = 10.0  # (수신자, 대화방)별 병합 윈도우
+    NOTIFICATION_DELIVERY_BATCH_SIZE: int = 500
+    NOTIFICATION_MAX_PENDING: int = 100000  # 대기 알림 상한 (초과 시 새 알림은 버림)
+    NOTIFICATION_MAX_EVENT_IDS: int = 20  # 알림별로 유지할 최근 이벤트 ID 수
+    NOTIFICATION_USER_RATE_PER_MINUTE: float = 6.0
+    NOTIFICATION_USER_BURST: float = 3.0
+    NOTIFICATION_SEEN_SET_CAPACITY: int = 1000000  # 세대당 이벤트 ID 수
+    NOTIFICATION_SEEN_SET_ERROR_RATE: float = 0.001
+    NOTIFICATION_SEEN_SET_ROTATE_SECONDS: float = 3600.0
+
+    # User Profile
+    USER_SERVICE_URL: str = "http://user-service:8000"
+    INTERNAL_SERVICE_TOKEN: Optional[str] = None  # 서비스 간 호출 인증, 설정하지 않으면 내부 엔드포인트 비활성화
+    PROFILE_CACHE_TTL_SECONDS: int = 60 * 60  # Redis 프로필 캐시
+    PROFILE_MISSING_TTL_SECONDS: int = 60  # 존재하지 않는 사용자 캐시
+    PROFILE_NEAR_CACHE_TTL_SECONDS: float = 30.0  # 각 서비스의 프로세스 내 캐시
+    PROFILE_NEAR_CACHE_MAX_SIZE: int = 50000
+    PROFILE_EVENTS_CHANNEL: str = "profile_events"
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # text | json
+    LOG_DIR: str = "/app/logs"  # 빈 값이면 파일 로그 비활성화
+    LOG_QUEUE_SIZE: int = 10000  # 가득 차면 로그를 버림 (이벤트 루프 블로킹 방지)
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(__file__), "../../infrastructure/.env"),
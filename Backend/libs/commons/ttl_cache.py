@@ -0,0 +1,96 @@
+"""
+TTL LRU Cache
+
+크기가 제한된 프로세스 내 캐시입니다.
+항목마다 만료 시각(epoch seconds)을 가지며, 가득 차면 가장 오래 사용하지 않은 항목부터 제거합니다.
+asyncio 이벤트 루프 한 곳에서 사용하는 것을 전제로 하며 락을 사용하지 않습니다.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, max_size: int, default_ttl: Optional[float] = None):
+        """
+        Args:
+            max_size: 최대 항목 수 (초과 시 LRU 제거)
+            default_ttl: set에서 만료 시각을 생략했을 때 사용할 TTL(초), None이면 만료 없음
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, count=False) is not None
+
+    def get(self, key: K, count: bool = True) -> Optional[V]:
+        """
+        캐시된 값을 반환합니다. 없거나 만료되었으면 None.
+
+        Args:
+            key: 캐시 키
+            count: hit/miss 카운터 반영 여부
+        """
+        item = self._items.get(key)
+
+        if item is not None:
+            value, expires_at = item
+            if expires_at is None or expires_at > time.time():
+                self._items.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return value
+
+            del self._items[key]
+
+        if count:
+            self.misses += 1
+        return None
+
+    def set(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        """
+        값을 저장합니다.
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            expires_at: 만료 시각 (epoch seconds), None이면 default_ttl 적용
+        """
+        if expires_at is None and self.default_ttl is not None:
+            expires_at = time.time() + self.default_ttl
+
+        self._items[key] = (value, expires_at)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,24 +1,38 @@
+import hashlib
+
 import jwt
 
-from Backend.libs.commons.logger import get_marigold_logger
-from Backend.libs.databases.redis_client import get_redis_client
-from Backend.libs.exceptions.auth_exceptions import (
-    InvalidTokenException, NoActiveSessionException,
+from commons.logger import get_marigold_logger
+from commons.session_view import session_view
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from exceptions.auth_exceptions import (
+    AuthException, InvalidTokenException, NoActiveSessionException,
     RedisConnectionException, TokenExpiredException,
     TokenRevokedException, InvalidTokenTypeException
 )
-from settings import settings
-
 
+# 검증에 성공한 토큰만 저장 (key: 토큰 SHA-256 digest, 만료: 토큰의 exp)
+# 위조 토큰은 서명 검증에 실패하므로 캐시에 들어가지 않습니다.
+verified_token_cache: TTLCache[bytes, dict] = TTLCache(settings.JWT_CACHE_MAX_SIZE)
 
 
 class JWTValidator:
     def __init__(self):
         self.logger = get_marigold_logger(__name__)
+        self.token_cache = verified_token_cache
 
-    async def _validate_jwt(self, token: str) -> dict:
-        try:
-            # JWT 디코딩 및 기본 검증
+    def _decode(self, token: str) -> dict:
+        """
+        JWT를 디코딩합니다. 이미 검증된 토큰은 캐시에서 반환합니다.
+
+        exp가 지난 캐시 항목은 무시되고 jwt.decode가 다시 실행되므로
+        만료된 토큰은 항상 ExpiredSignatureError가 발생합니다.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+
+        payload = self.token_cache.get(key)
+        if payload is None:
             payload = jwt.decode(
                 token,
                 settings.JWT_SECRET_KEY,
@@ -26,6 +40,22 @@ class JWTValidator:
                 issuer=settings.JWT_ISSUER
             )
 
+            exp = payload.get("exp")
+            if isinstance(exp, (int, float)):
+                self.token_cache.set(key, payload, expires_at=exp)
+
+        # 호출자가 payload를 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return dict(payload)
+
+    def cache_stats(self) -> dict:
+        """검증 토큰 캐시 hit/miss 통계"""
+        return self.token_cache.stats()
+
+    async def _validate_jwt(self, token: str, check_session: bool = True) -> dict:
+        try:
+            # JWT 디코딩 및 기본 검증 (캐시 우선)
+            payload = self._decode(token)
+
             # 2단계 검증: Redis 세션 확인
             if check_session:
                 user_id = payload.get("userId")
@@ -33,19 +63,16 @@ class JWTValidator:
                     raise InvalidTokenException("Missing userId in token")
 
                 try:
-                    redis = await get_redis_client()
-                    # 해당 유저가 활성 세션을 가지고 있는지 확인
-                    session_count = await redis.zcard(f"user_tokens:{user_id}")
-
-                    if session_count == 0:
-                        raise NoActiveSessionException()
+                    # 해당 유저가 활성 세션을 가지고 있는지 확인 (로컬 세션 상태 우선)
+                    active = await session_view.has_active_session(user_id)
 
-                except NoActiveSessionException:
-                    raise
                 except Exception as e:
                     self.logger.error(f"Redis error during session check: {e}")
                     raise RedisConnectionException(str(e))
 
+                if not active:
+                    raise NoActiveSessionException()
+
             return payload
 
         except jwt.ExpiredSignatureError:
@@ -54,7 +81,7 @@ class JWTValidator:
         except jwt.InvalidTokenError as e:
             raise InvalidTokenException(f"Invalid token: {str(e)}")
 
-        except (InvalidTokenException, TokenExpiredException, NoActiveSessionException) as e:
+        except AuthException as e:
             raise e
 
         except Exception as e:
@@ -0,0 +1,156 @@
+"""
+Base Repository
+
+Beanie Document용 공통 비동기 Repository입니다.
+대량 쓰기는 chunk 단위 bulk_write로, 대량 읽기는 커서 스트리밍(async generator)으로 처리하여
+컬렉션 전체를 메모리에 올리거나 문서를 하나씩 쓰지 않도록 합니다.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, AsyncIterator, Generic, Iterable, List, Mapping, Optional, Sequence, Type, TypeVar
+
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+
+DocumentT = TypeVar("DocumentT", bound=Document)
+ProjectionT = TypeVar("ProjectionT", bound=BaseModel)
+
+
+@dataclass
+class BulkWriteSummary:
+    inserted: int = 0
+    matched: int = 0
+    modified: int = 0
+    upserted: int = 0
+
+
+def _chunks(items: Iterable, size: int) -> Iterable[List]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class BaseRepository(Generic[DocumentT]):
+    def __init__(self, model: Type[DocumentT], chunk_size: int = 1000):
+        """
+        Args:
+            model: Beanie Document 모델
+            chunk_size: bulk_write 한 번에 보낼 최대 연산 수
+        """
+        self.model = model
+        self.chunk_size = chunk_size
+
+    @property
+    def collection(self) -> AsyncCollection:
+        return self.model.get_pymongo_collection()
+
+    async def insert_many(self, documents: Iterable[DocumentT]) -> int:
+        """
+        문서를 chunk 단위로 삽입합니다 (ordered=False).
+
+        Returns:
+            삽입된 문서 수
+        """
+        inserted = 0
+
+        for chunk in _chunks(documents, self.chunk_size):
+            result = await self.model.insert_many(chunk, ordered=False)
+            inserted += len(result.inserted_ids)
+
+        return inserted
+
+    async def bulk_upsert(
+            self,
+            items: Iterable[Mapping[str, Any]],
+            key_fields: Sequence[str]
+    ) -> BulkWriteSummary:
+        """
+        key_fields 기준으로 upsert 합니다 ($set).
+
+        Args:
+            items: 필드 dict 목록 (key_fields 포함)
+            key_fields: 문서를 식별할 필드 (unique 인덱스 권장)
+        """
+        return await self.bulk_write(
+            UpdateOne(
+                {field: item[field] for field in key_fields},
+                {"$set": dict(item)},
+                upsert=True
+            )
+            for item in items
+        )
+
+    async def bulk_write(self, operations: Iterable) -> BulkWriteSummary:
+        """
+        pymongo 연산(InsertOne, UpdateOne 등)을 chunk 단위 bulk_write로 실행합니다.
+        operations는 제너레이터여도 되며, 메모리에는 chunk 하나만 유지됩니다.
+        """
+        summary = BulkWriteSummary()
+
+        for chunk in _chunks(operations, self.chunk_size):
+            result = await self.collection.bulk_write(chunk, ordered=False)
+            summary.inserted += result.inserted_count
+            summary.matched += result.matched_count
+            summary.modified += result.modified_count
+            summary.upserted += result.upserted_count
+
+        return summary
+
+    async def find_projected(
+            self,
+            filter_: Mapping[str, Any],
+            projection: Type[ProjectionT],
+            sort: Optional[List] = None,
+            limit: int = 0
+    ) -> List[ProjectionT]:
+        """projection 모델에 선언된 필드만 조회합니다."""
+        query = self.model.find(filter_, projection_model=projection)
+        if sort:
+            query = query.sort(sort)
+        if limit:
+            query = query.limit(limit)
+
+        return await query.to_list()
+
+    async def stream(
+            self,
+            filter_: Mapping[str, Any],
+            projection: Optional[Type[BaseModel]] = None,
+            sort: Optional[List] = None,
+            batch_size: int = 500
+    ) -> AsyncIterator:
+        """
+        커서로 문서를 하나씩 반환합니다 (batch_size개씩 서버에서 가져옴).
+
+        Example:
+            async for event in repository.stream({"user_id": user_id}, EventTime):
+                ...
+        """
+        query = self.model.find(filter_, projection_model=projection, batch_size=batch_size)
+        if sort:
+            query = query.sort(sort)
+
+        async for document in query:
+            yield document
+
+    async def stream_batches(
+            self,
+            filter_: Mapping[str, Any],
+            projection: Optional[Type[BaseModel]] = None,
+            sort: Optional[List] = None,
+            batch_size: int = 500
+    ) -> AsyncIterator[List]:
+        """stream과 같으나 batch_size개씩 묶어 반환합니다."""
+        batch = []
+
+        async for document in self.stream(filter_, projection, sort, batch_size):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
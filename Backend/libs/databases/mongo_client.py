@@ -1,10 +1,124 @@
-from beanie import init_beanie
+"""
+MongoDB Client Registry
+
+프로세스당 연결 URL별로 하나의 AsyncMongoClient를 공유합니다.
+Connection Pool 크기와 타임아웃은 RootSettings에서 가져옵니다.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Dict, List, Type, Union
+
+from beanie import Document, init_beanie
 from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.monitoring import CommandFailedEvent, CommandListener, CommandStartedEvent, CommandSucceededEvent
+
+from commons.logger import get_marigold_logger
+from commons.metrics import counter, histogram
+from commons.settings import settings
+
+logger = get_marigold_logger("mongo-client")
+
+mongo_command_seconds = histogram("mongo_command_seconds", "MongoDB command latency", ["command"])
+mongo_command_errors = counter("mongo_command_errors_total", "MongoDB command errors", ["command"])
+
+
+class MongoCommandMetrics(CommandListener):
+    """드라이버가 측정한 명령 지연 시간(duration_micros)을 명령별로 기록"""
+
+    def started(self, event: CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        mongo_command_seconds.labels(event.command_name).observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        mongo_command_seconds.labels(event.command_name).observe(event.duration_micros / 1_000_000)
+        mongo_command_errors.labels(event.command_name).inc()
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+_clients: Dict[str, AsyncMongoClient] = {}
+
 
+def get_mongo_client(connection_url: str = settings.MONGO_URL) -> AsyncMongoClient:
+    """
+    연결 URL에 해당하는 공유 클라이언트를 반환합니다 (없으면 생성).
+
+    AsyncMongoClient는 첫 명령 실행 시 연결하므로 생성 자체는 I/O가 없습니다.
+    """
+    client = _clients.get(connection_url)
+
+    if client is None:
+        client = AsyncMongoClient(
+            connection_url,
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+            event_listeners=[mongo_command_metrics]
+        )
+        _clients[connection_url] = client
+        logger.info(f"MongoDB client created (maxPoolSize: {settings.MONGO_MAX_POOL_SIZE})")
+
+    return client
+
+
+async def init_database(
+        connection_url: str,
+        db_name: str,
+        models: List[Union[Type[Document], str]]
+) -> AsyncDatabase:
+    """
+    Beanie를 초기화합니다.
+
+    각 Document 모델의 Settings.indexes에 선언된 인덱스를 시작 시 생성합니다.
+
+    Args:
+        connection_url: MongoDB URL
+        db_name: 데이터베이스 이름
+        models: Document 모델 목록
+
+    Returns:
+        데이터베이스 객체
+    """
+    database = get_mongo_client(connection_url)[db_name]
 
-async def init_database(connection_url: str, db_name: str, models: str):
-    client = AsyncMongoClient(connection_url)
     await init_beanie(
-        database=client[db_name],
-        document_models=models
-    )
\ No newline at end of file
+        database=database,
+        document_models=models,
+        skip_indexes=False
+    )
+
+    return database
+
+
+async def close_mongo_clients() -> None:
+    for connection_url, client in list(_clients.items()):
+        try:
+            await client.close()
+            logger.info("MongoDB client closed")
+        except Exception as e:
+            logger.error(f"Error closing MongoDB client: {e}")
+        finally:
+            _clients.pop(connection_url, None)
+
+
+@asynccontextmanager
+async def mongo_lifespan(db_name: str, models: List[Union[Type[Document], str]]):
+    """
+    FastAPI lifespan용 컨텍스트
+
+    Example:
+        async with mongo_lifespan(settings.CHAT_DB_NAME, [Message]):
+            yield
+    """
+    await init_database(settings.MONGO_URL, db_name, models)
+    try:
+        yield
+    finally:
+        await close_mongo_clients()
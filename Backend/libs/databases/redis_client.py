@@ -2,55 +2,200 @@
 Redis Client Manager
 
 전역 Redis 연결을 관리합니다.
-Connection Pool을 사용하여 효율적인 연결 관리를 제공합니다.
+프로세스당 하나의 BlockingConnectionPool을 락으로 보호하여 생성하며,
+풀이 가득 차면 실패하는 대신 REDIS_POOL_TIMEOUT까지 대기합니다.
 """
 
-from redis.asyncio import Redis, RedisError
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from redis.asyncio import BlockingConnectionPool, Redis, RedisError
+from redis.asyncio.client import Pipeline
 from commons.settings import settings
 from commons.logger import get_marigold_logger
+from commons.metrics import counter, gauge, histogram
 
 logger = get_marigold_logger("redis-client")
 
-_redis_client: Redis = None
+redis_command_seconds = histogram("redis_command_seconds", "Redis command latency", ["command"])
+redis_command_errors = counter("redis_command_errors_total", "Redis command errors", ["command"])
 
 
-async def get_redis_client() -> Redis:
-    global _redis_client
+class MeteredPipeline(Pipeline):
+    """execute 한 번(1 round trip)을 command="PIPELINE"으로 기록"""
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error=raise_on_error)
+        except Exception:
+            redis_command_errors.labels("PIPELINE").inc()
+            raise
+        finally:
+            redis_command_seconds.labels("PIPELINE").observe(time.perf_counter() - start)
+
+
+class MeteredRedis(Redis):
+    """모든 명령의 지연 시간을 명령어별로 기록하는 클라이언트 (EVALSHA 포함)"""
 
-    if _redis_client is None:
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        start = time.perf_counter()
         try:
-            _redis_client = await Redis.from_url(
+            return await super().execute_command(*args, **options)
+        except Exception:
+            redis_command_errors.labels(command).inc()
+            raise
+        finally:
+            redis_command_seconds.labels(command).observe(time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> MeteredPipeline:
+        return MeteredPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class MeteredConnectionPool(BlockingConnectionPool):
+    """대기 시간과 고갈 횟수를 기록하는 BlockingConnectionPool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exhausted_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        if self.can_get_connection():
+            return await super().get_connection(*args, **kwargs)
+
+        # 풀 고갈: 연결이 반환될 때까지 대기 (timeout 초과 시 ConnectionError)
+        self.exhausted_count += 1
+        start = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def metrics(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "exhausted_count": self.exhausted_count,
+            "wait_time_total_seconds": self.wait_time_total,
+            "wait_time_max_seconds": self.wait_time_max,
+        }
+
+
+class RedisConnectionManager:
+    def __init__(self):
+        self._client: Optional[Redis] = None
+        self._pool: Optional[MeteredConnectionPool] = None
+        self._lock = asyncio.Lock()
+
+    async def get_client(self) -> Redis:
+        """
+        Redis 클라이언트를 반환합니다. 최초 호출 시 한 번만 연결합니다.
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        if self._client is not None:
+            return self._client
+
+        async with self._lock:
+            # 락 대기 중 다른 코루틴이 이미 생성했을 수 있음
+            if self._client is not None:
+                return self._client
+
+            pool = MeteredConnectionPool.from_url(
                 settings.REDIS_URL,
                 encoding="utf-8",
                 decode_responses=True,  # 자동으로 bytes -> str 변환
-                max_connections=10,      # Connection Pool 크기
-                socket_connect_timeout=5,
-                socket_keepalive=True
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,  # 풀 고갈 시 대기 시간
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                socket_keepalive=True,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL
             )
+            client = MeteredRedis.from_pool(pool)
+
+            try:
+                # 연결 테스트
+                await client.ping()
+
+            except RedisError as e:
+                logger.error(f"Failed to connect to Redis: {e}")
+                await client.aclose()
+                raise e
+
+            self._pool = pool
+            self._client = client
+            logger.info(
+                f"Redis connection established successfully "
+                f"(max_connections: {settings.REDIS_MAX_CONNECTIONS})"
+            )
+
+        return self._client
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._client is None:
+                return
+
+            try:
+                await self._client.aclose()  # from_pool로 생성했으므로 풀도 함께 종료
+                logger.info("Redis connection closed")
+            except Exception as e:
+                logger.error(f"Error closing Redis connection: {e}")
+            finally:
+                self._client = None
+                self._pool = None
+
+    def metrics(self) -> dict:
+        if self._pool is None:
+            return {}
+        return self._pool.metrics()
+
+
+redis_manager = RedisConnectionManager()
+
+gauge("redis_pool_in_use", "Redis connections in use", lambda: redis_manager.metrics().get("in_use"))
+gauge("redis_pool_exhausted_total", "Redis pool exhaustion count",
+      lambda: redis_manager.metrics().get("exhausted_count"))
+
+
+async def get_redis_client() -> Redis:
+    return await redis_manager.get_client()
+
+
+async def close_redis_client() -> None:
+    await redis_manager.close()
+
+
+def get_redis_pool_metrics() -> dict:
+    """
+    Connection Pool 지표
+
+    Returns:
+        in_use, idle, exhausted_count, wait_time_total_seconds, wait_time_max_seconds 등
+    """
+    return redis_manager.metrics()
+
+
+@asynccontextmanager
+async def redis_lifespan(app=None):
+    """
+    FastAPI lifespan용 컨텍스트
 
-            # 연결 테스트
-            await _redis_client.ping()
-            logger.info("Redis connection established successfully")
-
-        except RedisError as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            _redis_client = None
-            raise e
-        except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            raise e.with_traceback(e.__traceback__)
-
-    return _redis_client
-
-
-# async def close_redis_client():
-#     global _redis_client
-#
-#     if _redis_client:
-#         try:
-#             await _redis_client.aclose()  # close() → aclose()
-#             logger.info("Redis connection closed")
-#         except Exception as e:
-#             logger.error(f"Error closing Redis connection: {e}")
-#         finally:
-#             _redis_client = None
\ No newline at end of file
+    Example:
+        app = FastAPI(lifespan=redis_lifespan)
+    """
+    await get_redis_client()
+    try:
+        yield
+    finally:
+        await close_redis_client()
@@ -0,0 +1,20 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileSummary(BaseModel):
+    """표시용 사용자 프로필 (이름, 아바타)"""
+    user_id: str
+    display_name: str
+    avatar_url: Optional[str] = None
+
+
+class ProfileBatchRequest(BaseModel):
+    """프로필 일괄 조회 요청"""
+    ids: List[str] = Field(max_length=1000)
+
+
+class ProfileBatchResponse(BaseModel):
+    """프로필 일괄 조회 응답 (존재하지 않는 사용자는 포함하지 않음)"""
+    profiles: Dict[str, ProfileSummary]
@@ -1,16 +1,18 @@
 class AuthException(Exception):
     """인증/인가 관련 기본 예외 클래스"""
 
-    def __init__(self, detail: str, error_code: str, status_code: int = 401):
+    def __init__(self, detail: str, error_code: str, status_code: int = 401, headers: dict = None):
         """
         Args:
             detail: 사람이 읽을 수 있는 에러 메시지
             error_code: 프로그램이 처리할 수 있는 에러 코드 (SCREAMING_SNAKE_CASE)
             status_code: HTTP 상태 코드
+            headers: 응답에 추가할 헤더
         """
         self.detail = detail
         self.error_code = error_code
         self.status_code = status_code
+        self.headers = headers
         super().__init__(detail)
 
 
@@ -78,6 +80,17 @@ class NoActiveSessionException(AuthException):
         )
 
 
+class TokenReuseDetectedException(AuthException):
+    """이미 교체된 Refresh Token 재사용 (탈취 의심, 사용자 세션 전체 무효화됨)"""
+
+    def __init__(self, detail: str = "Refresh token reuse detected"):
+        super().__init__(
+            detail=detail,
+            error_code="TOKEN_REUSE_DETECTED",
+            status_code=401
+        )
+
+
 # ==================== 기기/권한 제한 (403) ====================
 
 class MaxDevicesExceededException(AuthException):
@@ -91,6 +104,43 @@ class MaxDevicesExceededException(AuthException):
         )
 
 
+class AdminAccessDeniedException(AuthException):
+    """관리자 엔드포인트 접근 거부"""
+
+    def __init__(self, detail: str = "Admin access denied"):
+        super().__init__(
+            detail=detail,
+            error_code="ADMIN_ACCESS_DENIED",
+            status_code=403
+        )
+
+
+class ServiceAccessDeniedException(AuthException):
+    """서비스 간 내부 엔드포인트 접근 거부"""
+
+    def __init__(self, detail: str = "Service access denied"):
+        super().__init__(
+            detail=detail,
+            error_code="SERVICE_ACCESS_DENIED",
+            status_code=403
+        )
+
+
+# ==================== 요청 제한 (429) ====================
+
+class RateLimitExceededException(AuthException):
+    """요청 한도 초과"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            detail=f"Too many requests, retry after {retry_after} seconds",
+            error_code="RATE_LIMIT_EXCEEDED",
+            status_code=429,
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+
 # ==================== 인프라 에러 (500) ====================
 
 class RedisConnectionException(AuthException):
@@ -0,0 +1,75 @@
+"""
+Exception Handlers
+
+모든 서비스가 공유하는 예외 핸들러입니다. (commons.app_factory가 등록)
+
+에러 응답 본문은 ErrorResponse 형식으로 한 번만 직렬화하고 (error_code, detail)별로 캐시하므로,
+같은 에러가 반복될 때 dict 생성과 JSON 직렬화를 다시 하지 않습니다.
+"""
+
+from functools import lru_cache
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from commons.logger import LogSampler, get_marigold_logger
+from dto.error_response_dto import ErrorDetail, ErrorResponse
+from exceptions.auth_exceptions import AuthException
+
+logger = get_marigold_logger("exception-handler")
+
+# 토큰 만료 등은 요청마다 발생하므로 에러 코드별로 초당 10건까지만 기록
+auth_warning_sampler = LogSampler(limit=10, interval=1.0)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=1024)
+def error_body(error_code: str, message: str) -> bytes:
+    """ErrorResponse를 직렬화한 응답 본문"""
+    return orjson.dumps(ErrorResponse(error=ErrorDetail(code=error_code, message=message)).model_dump())
+
+
+INTERNAL_ERROR_BODY = error_body("INTERNAL_SERVER_ERROR", "An unexpected error occurred")
+
+
+async def auth_exception_handler(request: Request, exc: AuthException):
+    """
+    AuthException 전용 핸들러
+
+    모든 인증/인가 에러를 일관된 형식으로 반환합니다.
+    """
+    suppressed = auth_warning_sampler.allow(exc.error_code)
+    if suppressed is not None:
+        logger.warning(
+            f"Auth exception: {exc.error_code} - {exc.detail} "
+            f"[path: {request.url.path}, method: {request.method}]"
+            + (f" (suppressed: {suppressed})" if suppressed else "")
+        )
+
+    return Response(
+        content=error_body(exc.error_code, exc.detail),
+        status_code=exc.status_code,
+        headers=exc.headers,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+async def general_exception_handler(request: Request, exc: Exception):
+    """
+    일반 예외 핸들러
+
+    예상하지 못한 에러를 처리합니다.
+    """
+    logger.error(
+        f"Unexpected error: {str(exc)} "
+        f"[path: {request.url.path}, method: {request.method}]",
+        exc_info=True
+    )
+
+    return Response(
+        content=INTERNAL_ERROR_BODY,
+        status_code=500,
+        media_type=JSON_MEDIA_TYPE
+    )
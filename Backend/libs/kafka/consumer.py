@@ -0,0 +1,286 @@
+"""
+Kafka Consumer
+
+메시지를 배치로 가져와(getmany) 비동기 핸들러에 전달합니다.
+
+- 파티션 내 메시지는 순서대로 처리하고, 파티션 간에는 병렬로 처리합니다
+  (동시에 처리하는 파티션 수는 KAFKA_CONSUMER_MAX_CONCURRENCY로 제한).
+- 자동 커밋을 끄고, 배치 처리가 끝난 뒤 오프셋을 수동 커밋합니다 (at-least-once).
+- 재시도 후에도 실패한 메시지는 Dead Letter 토픽({topic}{KAFKA_DEAD_LETTER_SUFFIX})으로 보냅니다.
+- fetch/커밋 등 배치 단위 오류가 나면 커밋하지 않은 배치의 처음으로 되돌리고,
+  지수 백오프 후 계속 소비합니다 (stop 전까지 루프가 끝나지 않음).
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiokafka import AIOKafkaConsumer, ConsumerRecord, TopicPartition
+from aiokafka.errors import CommitFailedError
+
+from commons.logger import get_marigold_logger
+from commons.metrics import counter, histogram
+from commons.settings import settings
+from kafka.producer import get_kafka_producer
+from kafka.serializers import Serializer, get_serializer
+
+logger = get_marigold_logger("kafka-consumer")
+
+
+@dataclass
+class ConsumedMessage:
+    """핸들러에 전달되는 메시지 (value는 역직렬화된 값)"""
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[str]
+    value: Any
+    headers: Sequence[Tuple[str, bytes]]
+    timestamp: int
+
+
+Handler = Callable[[ConsumedMessage], Awaitable[None]]
+
+kafka_consume_seconds = histogram("kafka_consume_seconds", "Kafka handler latency per message", ["topic"])
+kafka_consume_lag_seconds = histogram(
+    "kafka_consume_lag_seconds", "Time from record timestamp to handling", ["topic"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+kafka_handler_errors = counter("kafka_handler_errors_total", "Kafka handler failures", ["topic"])
+kafka_dead_letters = counter("kafka_dead_letters_total", "Messages sent to the dead letter topic", ["topic"])
+
+
+class MarigoldConsumer:
+    LOOP_BACKOFF_SECONDS = 0.5
+    LOOP_BACKOFF_MAX_SECONDS = 30.0
+
+    def __init__(
+            self,
+            topics: Sequence[str],
+            group_id: str,
+            handler: Handler,
+            bootstrap_servers: str = settings.KAFKA_BOOTSTRAP_SERVERS,
+            serializer: Optional[Serializer] = None,
+            batch_size: int = settings.KAFKA_CONSUMER_BATCH_SIZE,
+            fetch_timeout_ms: int = settings.KAFKA_CONSUMER_FETCH_TIMEOUT_MS,
+            max_concurrency: int = settings.KAFKA_CONSUMER_MAX_CONCURRENCY,
+            max_retries: int = settings.KAFKA_CONSUMER_MAX_RETRIES,
+            dead_letter_suffix: str = settings.KAFKA_DEAD_LETTER_SUFFIX
+    ):
+        """
+        Args:
+            topics: 구독할 토픽 목록
+            group_id: Consumer Group ID
+            handler: 메시지 처리 코루틴 (예외 발생 시 재시도 후 DLQ)
+            batch_size: getmany 한 번에 가져올 최대 메시지 수
+            fetch_timeout_ms: getmany 대기 시간
+            max_concurrency: 동시에 처리할 최대 파티션 수
+            max_retries: 핸들러 재시도 횟수
+            dead_letter_suffix: DLQ 토픽 접미사
+        """
+        self.topics = list(topics)
+        self.group_id = group_id
+        self.handler = handler
+        self.serializer = serializer or get_serializer(settings.KAFKA_SERIALIZER)
+        self.batch_size = batch_size
+        self.fetch_timeout_ms = fetch_timeout_ms
+        self.max_retries = max_retries
+        self.dead_letter_suffix = dead_letter_suffix
+
+        self._consumer = AIOKafkaConsumer(
+            *self.topics,
+            bootstrap_servers=bootstrap_servers,
+            group_id=group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+            max_poll_records=batch_size
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self._consumer.start()
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Kafka consumer started: {self.group_id} {self.topics}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        # 진행 중인 배치를 마치고 커밋한 뒤 종료
+        self._running = False
+        try:
+            await self._task
+        except Exception as e:
+            logger.error(f"Kafka consumer loop failed: {e}")
+        finally:
+            self._task = None
+            await self._consumer.stop()
+            logger.info(f"Kafka consumer stopped: {self.group_id}")
+
+    async def _run(self) -> None:
+        failures = 0
+
+        while self._running:
+            batches: Dict[TopicPartition, List[ConsumerRecord]] = {}
+            try:
+                batches = await self._consumer.getmany(
+                    timeout_ms=self.fetch_timeout_ms,
+                    max_records=self.batch_size
+                )
+                if batches:
+                    await self._process_batch(batches)
+                failures = 0
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                delay = min(self.LOOP_BACKOFF_MAX_SECONDS, self.LOOP_BACKOFF_SECONDS * 2 ** (failures - 1))
+                logger.error(f"Kafka consumer loop failed ({self.group_id}), retrying in {delay:.1f}s: {e}")
+                self._rewind(batches)
+                await asyncio.sleep(delay)
+
+    def _rewind(self, batches: Dict[TopicPartition, List[ConsumerRecord]]) -> None:
+        """커밋하지 못한 배치를 처음부터 다시 가져오도록 되돌립니다 (회수된 파티션은 제외)."""
+        assigned = self._consumer.assignment()
+
+        for tp, records in batches.items():
+            if records and tp in assigned:
+                try:
+                    self._consumer.seek(tp, records[0].offset)
+                except Exception as e:
+                    logger.error(f"Failed to rewind {tp.topic}:{tp.partition}: {e}")
+
+    async def _process_batch(self, batches: Dict[TopicPartition, List[ConsumerRecord]]) -> None:
+        """파티션별로 병렬 처리한 뒤 처리한 오프셋을 한 번에 커밋합니다."""
+        results = await asyncio.gather(*(
+            self._process_partition(tp, records) for tp, records in batches.items()
+        ))
+
+        offsets: Dict[TopicPartition, int] = {
+            tp: next_offset for tp, next_offset in results if next_offset is not None
+        }
+        if offsets:
+            try:
+                await self._consumer.commit(offsets)
+            except CommitFailedError as e:
+                # 리밸런스로 파티션이 회수됨 → 새 소유자가 마지막 커밋부터 다시 처리
+                logger.warning(f"Offset commit failed after rebalance: {e}")
+
+    async def _process_partition(
+            self,
+            tp: TopicPartition,
+            records: List[ConsumerRecord]
+    ) -> Tuple[TopicPartition, Optional[int]]:
+        """
+        파티션 하나의 메시지를 순서대로 처리합니다.
+
+        Returns:
+            (파티션, 커밋할 다음 오프셋), 처리한 메시지가 없으면 오프셋은 None
+        """
+        next_offset = None
+
+        async with self._semaphore:
+            for record in records:
+                if not await self._handle(record):
+                    # DLQ 전송까지 실패 → 이 메시지부터 다시 가져오도록 되돌림
+                    self._consumer.seek(tp, record.offset)
+                    break
+                next_offset = record.offset + 1
+
+        return tp, next_offset
+
+    async def _handle(self, record: ConsumerRecord) -> bool:
+        """
+        메시지 하나를 처리합니다.
+
+        Returns:
+            처리(또는 DLQ 전송) 완료 여부
+        """
+        try:
+            message = ConsumedMessage(
+                topic=record.topic,
+                partition=record.partition,
+                offset=record.offset,
+                key=record.key.decode() if record.key is not None else None,
+                value=self.serializer.loads(record.value),
+                headers=record.headers,
+                timestamp=record.timestamp
+            )
+        except Exception as e:
+            # 역직렬화 실패는 재시도해도 같으므로 바로 DLQ
+            return await self._dead_letter(record, e)
+
+        if record.timestamp > 0:
+            kafka_consume_lag_seconds.labels(record.topic).observe(max(0.0, time.time() - record.timestamp / 1000))
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                await self.handler(message)
+                kafka_consume_seconds.labels(record.topic).observe(time.perf_counter() - start)
+                return True
+            except Exception as e:
+                kafka_handler_errors.labels(record.topic).inc()
+                if attempt == self.max_retries:
+                    return await self._dead_letter(record, e)
+
+                logger.warning(
+                    f"Handler failed (attempt {attempt + 1}/{self.max_retries + 1}) "
+                    f"[{record.topic}:{record.partition}@{record.offset}]: {e}"
+                )
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+        return False
+
+    async def _dead_letter(self, record: ConsumerRecord, error: Exception) -> bool:
+        topic = f"{record.topic}{self.dead_letter_suffix}"
+        headers = list(record.headers or ()) + [
+            ("x-original-topic", record.topic.encode()),
+            ("x-original-partition", str(record.partition).encode()),
+            ("x-original-offset", str(record.offset).encode()),
+            ("x-error", repr(error)[:1024].encode()),
+        ]
+
+        try:
+            producer = await get_kafka_producer()
+            await producer.send_and_wait(
+                topic,
+                record.value,
+                key=record.key,
+                headers=headers
+            )
+            kafka_dead_letters.labels(record.topic).inc()
+            logger.error(
+                f"Sent to dead letter topic {topic} "
+                f"[{record.topic}:{record.partition}@{record.offset}]: {error}"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to send to dead letter topic {topic}: {e}")
+            return False
+
+
+@asynccontextmanager
+async def kafka_consumer_lifespan(*consumers: MarigoldConsumer):
+    """
+    여러 Consumer를 함께 시작/종료합니다.
+
+    Example:
+        async with kafka_consumer_lifespan(chat_consumer):
+            yield
+    """
+    for consumer in consumers:
+        await consumer.start()
+    try:
+        yield
+    finally:
+        for consumer in consumers:
+            await consumer.stop()
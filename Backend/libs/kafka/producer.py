@@ -0,0 +1,169 @@
+"""
+Kafka Producer
+
+프로세스당 하나의 AIOKafkaProducer를 공유합니다.
+linger / batch size / 압축은 설정값으로 조정하며,
+전송 중(in-flight)인 메시지 수를 세마포어로 제한해 브로커가 느려도 메모리가 무한히 늘지 않습니다.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Optional, Sequence, Tuple
+
+from aiokafka import AIOKafkaProducer
+from aiokafka.structs import RecordMetadata
+
+from commons.logger import get_marigold_logger
+from commons.metrics import counter, histogram
+from commons.settings import settings
+from kafka.serializers import Serializer, get_serializer
+
+logger = get_marigold_logger("kafka-producer")
+
+Headers = Sequence[Tuple[str, bytes]]
+
+# 배치 버퍼에 넣은 시점부터 브로커 응답까지 (linger 포함)
+kafka_produce_seconds = histogram("kafka_produce_seconds", "Kafka send-to-ack latency", ["topic"])
+kafka_produce_errors = counter("kafka_produce_errors_total", "Kafka send failures", ["topic"])
+
+
+class MarigoldProducer:
+    def __init__(
+            self,
+            bootstrap_servers: str = settings.KAFKA_BOOTSTRAP_SERVERS,
+            serializer: Optional[Serializer] = None,
+            linger_ms: int = settings.KAFKA_PRODUCER_LINGER_MS,
+            max_batch_size: int = settings.KAFKA_PRODUCER_MAX_BATCH_SIZE,
+            compression_type: Optional[str] = settings.KAFKA_PRODUCER_COMPRESSION,
+            max_in_flight: int = settings.KAFKA_PRODUCER_MAX_IN_FLIGHT,
+            acks: str = settings.KAFKA_PRODUCER_ACKS
+    ):
+        self.serializer = serializer or get_serializer(settings.KAFKA_SERIALIZER)
+        acks = int(acks) if acks.isdigit() else acks  # "0" | "1" | "all"
+        self._producer = AIOKafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            linger_ms=linger_ms,
+            max_batch_size=max_batch_size,
+            compression_type=compression_type,
+            acks=acks,
+            enable_idempotence=acks == "all",
+            key_serializer=lambda key: key.encode() if isinstance(key, str) else key
+        )
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._started = False
+
+    async def start(self) -> None:
+        if not self._started:
+            await self._producer.start()
+            self._started = True
+            logger.info("Kafka producer started")
+
+    async def stop(self) -> None:
+        if self._started:
+            # 버퍼에 남은 배치를 모두 전송한 뒤 종료
+            await self._producer.stop()
+            self._started = False
+            logger.info("Kafka producer stopped")
+
+    async def send(
+            self,
+            topic: str,
+            value: Any,
+            key: Optional[str] = None,
+            headers: Optional[Headers] = None
+    ) -> "asyncio.Future[RecordMetadata]":
+        """
+        메시지를 배치 버퍼에 넣고 전송 결과 Future를 반환합니다.
+
+        in-flight 메시지가 KAFKA_PRODUCER_MAX_IN_FLIGHT에 도달하면
+        앞선 메시지의 전송이 끝날 때까지 대기합니다 (backpressure).
+
+        Args:
+            topic: 토픽
+            value: 직렬화할 값 (bytes면 그대로 전송)
+            key: 파티션 키
+            headers: 메시지 헤더
+
+        Returns:
+            브로커 응답(RecordMetadata) Future
+        """
+        data = value if isinstance(value, bytes) else self.serializer.dumps(value)
+
+        await self._in_flight.acquire()
+        start = time.perf_counter()
+        try:
+            future = await self._producer.send(topic, data, key=key, headers=headers)
+        except BaseException:
+            self._in_flight.release()
+            kafka_produce_errors.labels(topic).inc()
+            raise
+
+        future.add_done_callback(lambda f: self._on_delivered(f, topic, start))
+        return future
+
+    def _on_delivered(self, future: asyncio.Future, topic: str, start: float) -> None:
+        self._in_flight.release()
+        kafka_produce_seconds.labels(topic).observe(time.perf_counter() - start)
+        if future.cancelled() or future.exception() is not None:
+            kafka_produce_errors.labels(topic).inc()
+
+    async def send_and_wait(
+            self,
+            topic: str,
+            value: Any,
+            key: Optional[str] = None,
+            headers: Optional[Headers] = None
+    ) -> RecordMetadata:
+        """메시지를 전송하고 브로커 응답까지 기다립니다."""
+        future = await self.send(topic, value, key=key, headers=headers)
+        return await future
+
+    async def flush(self) -> None:
+        await self._producer.flush()
+
+
+_producer: Optional[MarigoldProducer] = None
+_lock = asyncio.Lock()
+
+
+async def get_kafka_producer() -> MarigoldProducer:
+    """프로세스 공용 Producer를 반환합니다 (최초 호출 시 시작)."""
+    global _producer
+
+    if _producer is None:
+        async with _lock:
+            if _producer is None:
+                producer = MarigoldProducer()
+                await producer.start()
+                _producer = producer
+
+    return _producer
+
+
+async def close_kafka_producer() -> None:
+    global _producer
+
+    async with _lock:
+        if _producer is not None:
+            try:
+                await _producer.stop()
+            except Exception as e:
+                logger.error(f"Error closing Kafka producer: {e}")
+            finally:
+                _producer = None
+
+
+@asynccontextmanager
+async def kafka_producer_lifespan(app=None):
+    """
+    FastAPI lifespan용 컨텍스트
+
+    Example:
+        app = FastAPI(lifespan=kafka_producer_lifespan)
+    """
+    await get_kafka_producer()
+    try:
+        yield
+    finally:
+        await close_kafka_producer()
@@ -0,0 +1,66 @@
+"""
+Kafka 메시지 직렬화
+
+KAFKA_SERIALIZER 설정으로 orjson / msgpack 중 하나를 선택합니다.
+msgpack은 선택 의존성이며, 사용할 때만 import 합니다.
+"""
+
+from typing import Any, Callable, Dict, Protocol
+
+import orjson
+
+
+class Serializer(Protocol):
+    content_type: str
+
+    def dumps(self, value: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class OrjsonSerializer:
+    content_type = "application/json"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer:
+    content_type = "application/msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError("KAFKA_SERIALIZER=msgpack requires the 'msgpack' package") from e
+
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+
+    def dumps(self, value: Any) -> bytes:
+        return self._packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return self._unpackb(data, raw=False)
+
+
+_SERIALIZERS: Dict[str, Callable[[], Serializer]] = {
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    이름으로 직렬화기를 생성합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 이름
+    """
+    try:
+        return _SERIALIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unsupported serializer: {name} (available: {', '.join(_SERIALIZERS)})")
@@ -0,0 +1,85 @@
+"""
+Ollama Client 벤치마크
+
+stub 서버를 같은 프로세스에서 띄우고, 동일/서로 다른 프롬프트를 동시에 보내
+모델 서버 호출 수(single-flight 효과)와 첫 토큰/전체 지연을 측정합니다.
+
+실행 (services/ai 디렉토리에서):
+    python -m benchmarks.bench_ollama_client --callers 200 --distinct 10
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+from typing import List
+
+import uvicorn
+
+from benchmarks.ollama_stub import app as stub_app
+from services.ollama_client import OllamaClient
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def call(client: OllamaClient, prompt: str, first: List[float], total: List[float]) -> None:
+    start = time.perf_counter()
+    received_first = False
+
+    async for _ in client.stream_generate("stub", prompt):
+        if not received_first:
+            first.append(time.perf_counter() - start)
+            received_first = True
+
+    total.append(time.perf_counter() - start)
+
+
+def p(samples: List[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[max(0, int(len(samples) * q) - 1)] * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", type=int, default=200, help="동시 호출 수")
+    parser.add_argument("--distinct", type=int, default=10, help="서로 다른 프롬프트 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="모델 서버 동시 요청 제한")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(stub_app, port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    client = OllamaClient(base_url=f"http://127.0.0.1:{port}", max_concurrency=args.concurrency)
+    first: List[float] = []
+    total: List[float] = []
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            call(client, f"prompt {i % args.distinct}", first, total) for i in range(args.callers)
+        ))
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"callers={args.callers}  upstream={stub_app.state.calls['generate']}  "
+            f"coalesced={client.coalesced_requests}  elapsed={elapsed:.2f}s"
+        )
+        print(f"first token  p50={statistics.median(first) * 1000:.1f}ms  p99={p(first, 0.99):.1f}ms")
+        print(f"full answer  p50={statistics.median(total) * 1000:.1f}ms  p99={p(total, 0.99):.1f}ms")
+
+    finally:
+        await client.aclose()
+        server.should_exit = True
+        await server_task
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
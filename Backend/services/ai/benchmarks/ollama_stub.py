@@ -0,0 +1,67 @@
+"""
+Ollama API stub 서버
+
+/api/generate (NDJSON 스트리밍), /api/embed, /api/tags를 흉내 냅니다.
+토큰 사이 지연과 임베딩 차원은 환경 변수로 조정합니다.
+
+실행 (services/ai 디렉토리에서):
+    uvicorn benchmarks.ollama_stub:app --port 11500
+    OLLAMA_BASE_URL=http://localhost:11500 python -m benchmarks.bench_ollama_client
+"""
+
+import asyncio
+import hashlib
+import os
+
+import numpy as np
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse
+
+TOKEN_DELAY = float(os.getenv("STUB_TOKEN_DELAY", "0.01"))
+TOKEN_COUNT = int(os.getenv("STUB_TOKEN_COUNT", "50"))
+EMBED_DIM = int(os.getenv("STUB_EMBED_DIM", "768"))
+
+app = FastAPI()
+app.state.calls = {"generate": 0, "embed": 0}
+
+
+def fake_embedding(text: str) -> list:
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(EMBED_DIM, dtype=np.float32).tolist()
+
+
+@app.post("/api/generate")
+async def generate(request: Request):
+    body = await request.json()
+    app.state.calls["generate"] += 1
+
+    async def tokens():
+        for i in range(TOKEN_COUNT):
+            await asyncio.sleep(TOKEN_DELAY)
+            yield orjson.dumps({"model": body["model"], "response": f"t{i} ", "done": False}) + b"\n"
+        yield orjson.dumps({"model": body["model"], "response": "", "done": True}) + b"\n"
+
+    return StreamingResponse(tokens(), media_type="application/x-ndjson")
+
+
+@app.post("/api/embed")
+async def embed(request: Request):
+    body = await request.json()
+    app.state.calls["embed"] += 1
+
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    return Response(
+        orjson.dumps({"model": body["model"], "embeddings": [fake_embedding(text) for text in inputs]}),
+        media_type="application/json"
+    )
+
+
+@app.get("/api/tags")
+async def tags():
+    return {"models": [{"name": "stub"}]}
+
+
+@app.get("/stub/calls")
+async def calls():
+    return app.state.calls
@@ -1,2 +1,27 @@
+from contextlib import asynccontextmanager
+
+from commons.app_factory import create_app
+from commons.settings import settings
+from services.ollama_client import ollama_client
+
+
+@asynccontextmanager
+async def ollama_lifespan():
+    try:
+        yield
+    finally:
+        await ollama_client.aclose()
+
+
+app = create_app(
+    "ai",
+    db_name=settings.AI_DB_NAME,
+    use_session_view=True,
+    lifespans=[ollama_lifespan],
+)
+
+
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,239 @@
+"""
+Embedding Cache
+
+(모델 이름 + 텍스트 내용)의 SHA-256을 키로 임베딩을 캐시합니다.
+
+- 1단계: 프로세스 내 LRU (TTLCache, 만료 없음)
+- 2단계: 디스크 저장소. 모델별로 float32 벡터 파일을 memory-map 하며 재시작 후에도 유지됩니다.
+
+embed_many는 배치 전체를 캐시에서 찾고, 없는 텍스트만 모아 모델에 한 번 요청합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from services.ollama_client import ollama_client
+
+logger = get_marigold_logger(__name__)
+
+KEY_SIZE = 32  # SHA-256 digest
+
+EmbedFn = Callable[[str, List[str]], Awaitable[List[List[float]]]]
+
+
+def content_key(model: str, text: str) -> bytes:
+    return hashlib.sha256(model.encode() + b"\0" + text.encode()).digest()
+
+
+class DiskVectorStore:
+    """
+    모델 하나의 디스크 벡터 저장소
+
+    파일 구성:
+        meta.json    {"dim": 768}
+        vectors.f32  (capacity, dim) float32, memory-mapped
+        keys.bin     행 순서대로 32바이트 키를 이어 붙인 파일
+
+    벡터를 먼저 쓰고(flush) 키를 나중에 추가(fsync)하므로, 중간에 종료되어도
+    keys.bin에 있는 행은 항상 완전한 벡터를 가리킵니다.
+    키 추가 도중 종료되어 남은 불완전한 마지막 레코드는 로드 시 잘라냅니다.
+    """
+
+    def __init__(self, directory: str, initial_capacity: int = 4096):
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self.dim: Optional[int] = None
+        self.count = 0
+        self._rows: Dict[bytes, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _keys_path(self) -> str:
+        return os.path.join(self.directory, "keys.bin")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _load(self) -> None:
+        if not os.path.exists(self._meta_path):
+            return
+
+        with open(self._meta_path) as f:
+            self.dim = json.load(f)["dim"]
+
+        keys = b""
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path, "rb") as f:
+                keys = f.read()
+
+        capacity = 0
+        if os.path.exists(self._vectors_path):
+            capacity = os.path.getsize(self._vectors_path) // (self.dim * 4)
+        self.count = min(len(keys) // KEY_SIZE, capacity)
+
+        # 불완전한 레코드를 남겨 두면 다음 추가분의 키가 어긋나 다른 행을 가리키게 됨
+        if len(keys) != self.count * KEY_SIZE:
+            logger.warning(f"Truncating {len(keys) - self.count * KEY_SIZE} trailing key bytes in {self.directory}")
+            with open(self._keys_path, "ab") as f:
+                f.truncate(self.count * KEY_SIZE)
+                os.fsync(f.fileno())
+
+        self._rows = {keys[i * KEY_SIZE:(i + 1) * KEY_SIZE]: i for i in range(self.count)}
+        if capacity:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+        logger.info(f"Loaded {self.count} cached embeddings from {self.directory}")
+
+    def _ensure_capacity(self, needed: int, dim: int) -> None:
+        if self.dim is None:
+            self.dim = dim
+            with open(self._meta_path, "w") as f:
+                json.dump({"dim": dim}, f)
+            open(self._keys_path, "wb").close()
+
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(self.initial_capacity, capacity * 2, needed)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim))
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            result: List[Optional[np.ndarray]] = []
+            for key in keys:
+                row = self._rows.get(key)
+                # memmap 교체 후에도 안전하도록 복사본 반환
+                result.append(None if row is None else np.array(self._vectors[row]))
+            return result
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray) -> None:
+        with self._lock:
+            new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self._rows]
+            if not new:
+                return
+
+            self._ensure_capacity(self.count + len(new), vectors.shape[1])
+
+            start = self.count
+            self._vectors[start:start + len(new)] = np.stack([vector for _, vector in new])
+            self._vectors.flush()
+
+            # 벡터(flush) → 키(fsync) 순서를 지켜야 키가 항상 기록된 벡터를 가리킴
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(key for key, _ in new))
+                f.flush()
+                os.fsync(f.fileno())
+
+            for i, (key, _) in enumerate(new):
+                self._rows[key] = start + i
+            self.count += len(new)
+
+
+class EmbeddingCache:
+    def __init__(
+            self,
+            directory: str = settings.EMBEDDING_CACHE_DIR,
+            lru_size: int = settings.EMBEDDING_CACHE_LRU_SIZE,
+            embed_fn: Optional[EmbedFn] = None
+    ):
+        """
+        Args:
+            directory: 디스크 저장소 루트 디렉토리 (모델별 하위 디렉토리)
+            lru_size: 프로세스 내 LRU 최대 벡터 수
+            embed_fn: 캐시 miss를 임베딩할 함수 (기본: ollama_client.embed)
+        """
+        self.directory = directory
+        self.embed_fn = embed_fn or ollama_client.embed
+        self._lru: TTLCache[bytes, np.ndarray] = TTLCache(lru_size)
+        self._stores: Dict[str, DiskVectorStore] = {}
+        self.disk_hits = 0
+        self.embedded = 0
+
+    def _store(self, model: str) -> DiskVectorStore:
+        store = self._stores.get(model)
+        if store is None:
+            name = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+            store = DiskVectorStore(os.path.join(self.directory, name))
+            self._stores[model] = store
+        return store
+
+    async def embed_many(self, model: str, texts: Sequence[str]) -> np.ndarray:
+        """
+        텍스트 목록의 임베딩을 (len(texts), dim) float32 배열로 반환합니다.
+
+        캐시에 없는 텍스트(중복 제거)만 모델에 한 번의 요청으로 보냅니다.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        keys = [content_key(model, text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [self._lru.get(key) for key in keys]
+
+        # 2단계: 디스크
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            store = self._store(model)
+            found = await asyncio.to_thread(store.get_many, [keys[i] for i in missing])
+            for i, vector in zip(missing, found):
+                if vector is not None:
+                    vectors[i] = vector
+                    self._lru.set(keys[i], vector)
+                    self.disk_hits += 1
+
+        # 모델 호출: 남은 miss를 중복 없이 한 번에
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            unique: Dict[bytes, str] = {}
+            for i in missing:
+                unique.setdefault(keys[i], texts[i])
+
+            embedded = np.asarray(await self.embed_fn(model, list(unique.values())), dtype=np.float32)
+            self.embedded += len(unique)
+
+            by_key = dict(zip(unique.keys(), embedded))
+            for key, vector in by_key.items():
+                self._lru.set(key, vector)
+            for i in missing:
+                vectors[i] = by_key[keys[i]]
+
+            await asyncio.to_thread(self._store(model).put_many, list(by_key.keys()), embedded)
+
+        return np.stack(vectors)
+
+    def stats(self) -> dict:
+        return {
+            "lru": self._lru.stats(),
+            "disk_hits": self.disk_hits,
+            "embedded": self.embedded,
+            "disk_vectors": {model: store.count for model, store in self._stores.items()},
+        }
+
+
+embedding_cache = EmbeddingCache()
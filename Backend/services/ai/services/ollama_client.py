@@ -0,0 +1,221 @@
+"""
+Ollama Client
+
+- httpx keep-alive Connection Pool을 재사용합니다.
+- 생성 토큰을 async generator로 바로 흘려보냅니다 (채팅 WebSocket 중계용).
+- 동시에 모델 서버로 보내는 요청 수를 OLLAMA_MAX_CONCURRENCY로 제한합니다.
+- 같은 요청(model, prompt, options 등)이 진행 중이면 새로 생성하지 않고 결과를 공유합니다 (single-flight).
+  늦게 합류한 호출자도 처음부터 모든 토큰을 받습니다.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import orjson
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+
+logger = get_marigold_logger(__name__)
+
+
+class OllamaError(Exception):
+    """Ollama API 오류"""
+
+
+class _SharedGeneration:
+    """진행 중인 생성 1건. 여러 호출자가 같은 토큰 스트림을 구독합니다."""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    async def push(self, chunk: str) -> None:
+        async with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        self.subscribers += 1
+        index = 0
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                    pending = self.chunks[index:]
+
+                index += len(pending)
+                for chunk in pending:
+                    yield chunk
+
+                if self.done and index >= len(self.chunks):
+                    if self.error:
+                        raise self.error
+                    return
+        finally:
+            self.subscribers -= 1
+            # 모든 호출자가 떠나면 생성을 중단 (모델 서버 자원 반환)
+            if self.subscribers == 0 and not self.done and self.task:
+                self.task.cancel()
+
+
+class OllamaClient:
+    def __init__(
+            self,
+            base_url: str = settings.OLLAMA_BASE_URL,
+            max_concurrency: int = settings.OLLAMA_MAX_CONCURRENCY,
+            max_connections: int = settings.OLLAMA_MAX_CONNECTIONS,
+            keepalive_expiry: float = settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS,
+            read_timeout: float = settings.OLLAMA_READ_TIMEOUT_SECONDS,
+            transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            base_url: Ollama 서버 URL (테스트 시 stub 서버 URL)
+            max_concurrency: 모델 서버로 동시에 보낼 최대 요청 수
+            max_connections: Connection Pool 크기
+            keepalive_expiry: 유휴 연결 유지 시간(초)
+            read_timeout: 토큰 사이 최대 대기 시간(초)
+            transport: httpx transport (테스트용)
+        """
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(connect=5.0, read=read_timeout, write=10.0, pool=None),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            transport=transport
+        )
+        self._limiter = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, _SharedGeneration] = {}
+        self.upstream_requests = 0
+        self.coalesced_requests = 0
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def stream_generate(
+            self,
+            model: str,
+            prompt: str,
+            system: Optional[str] = None,
+            options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        생성 토큰을 순서대로 반환합니다.
+
+        Example:
+            async for token in ollama_client.stream_generate("llama3", prompt):
+                await websocket.send_text(token)
+
+        Raises:
+            OllamaError: 모델 서버 오류
+        """
+        body: Dict[str, Any] = {"model": model, "prompt": prompt, "stream": True}
+        if system is not None:
+            body["system"] = system
+        if options:
+            body["options"] = options
+
+        key = hashlib.sha256(orjson.dumps(body, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        generation = self._inflight.get(key)
+
+        if generation is None:
+            generation = _SharedGeneration()
+            generation.task = asyncio.create_task(self._run_generation(key, generation, body))
+            self._inflight[key] = generation
+        else:
+            self.coalesced_requests += 1
+
+        subscription = generation.subscribe()
+        try:
+            async for chunk in subscription:
+                yield chunk
+        finally:
+            # 구독을 바로 정리해야 마지막 호출자가 떠난 시점에 생성이 취소됨 (GC 시점까지 미루지 않음)
+            await subscription.aclose()
+            if generation.subscribers == 0 and not generation.done:
+                # 취소된 생성에 새 호출자가 합류하지 않도록 즉시 제거
+                self._forget(key, generation)
+
+    async def generate(
+            self,
+            model: str,
+            prompt: str,
+            system: Optional[str] = None,
+            options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """생성이 끝날 때까지 기다려 전체 응답을 반환합니다."""
+        return "".join([chunk async for chunk in self.stream_generate(model, prompt, system, options)])
+
+    async def embed(self, model: str, inputs: List[str]) -> List[List[float]]:
+        """
+        여러 텍스트를 한 번의 요청으로 임베딩합니다 (/api/embed).
+
+        Raises:
+            OllamaError: 모델 서버 오류
+        """
+        async with self._limiter:
+            self.upstream_requests += 1
+            response = await self._http.post("/api/embed", json={"model": model, "input": inputs})
+
+        if response.status_code != 200:
+            raise OllamaError(f"Embed failed ({response.status_code}): {response.text}")
+
+        return response.json()["embeddings"]
+
+    async def _run_generation(self, key: str, generation: _SharedGeneration, body: Dict[str, Any]) -> None:
+        try:
+            async with self._limiter:
+                self.upstream_requests += 1
+                async with self._http.stream("POST", "/api/generate", json=body) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        raise OllamaError(f"Generate failed ({response.status_code}): {response.text}")
+
+                    # NDJSON: 한 줄에 {"response": "...", "done": false}
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+
+                        data = orjson.loads(line)
+                        if data.get("error"):
+                            raise OllamaError(data["error"])
+                        if data.get("response"):
+                            await generation.push(data["response"])
+                        if data.get("done"):
+                            break
+
+            await generation.finish()
+
+        except asyncio.CancelledError:
+            await generation.finish(OllamaError("Generation cancelled"))
+            # 취소한 쪽(마지막 구독자 이탈, 종료 처리)이 취소를 정상 완료로 오인하지 않도록 다시 발생
+            raise
+        except Exception as e:
+            logger.error(f"Ollama generation failed: {e}")
+            await generation.finish(e if isinstance(e, OllamaError) else OllamaError(str(e)))
+        finally:
+            self._forget(key, generation)
+
+    def _forget(self, key: str, generation: _SharedGeneration) -> None:
+        """같은 key로 새로 시작된 생성은 남겨 두고, 이 생성만 제거합니다."""
+        if self._inflight.get(key) is generation:
+            del self._inflight[key]
+
+
+ollama_client = OllamaClient()
@@ -0,0 +1,536 @@
+"""
+Embedded Vector Index
+
+사용자/대화 단위 RAG 검색용 프로세스 내 벡터 인덱스입니다.
+ChromaDB가 원본 저장소이며, 이 인덱스는 작은 코퍼스 검색에서 네트워크 왕복을 없애기 위한 것입니다.
+
+- 벡터는 L2 정규화된 float32로 memory-mapped 파일에 저장하고, 코사인 유사도 = 내적으로 계산합니다.
+- 검색은 여러 쿼리를 한 번의 행렬 곱으로 처리하고 argpartition으로 top-k를 고릅니다.
+- 큰 코퍼스는 선택적으로 IVF(k-means 중심점 기준 분할)로 nprobe개 리스트만 탐색합니다.
+- 삭제는 tombstone(alive=0)으로 표시하고, 일정 비율이 넘으면 백그라운드에서 compaction 합니다.
+
+파일 구성 (디렉토리 하나당 인덱스 하나, {g} = generation, 0이면 생략):
+    meta.json         {"dim": 768, "generation": g}
+    vectors.{g}.f32   (capacity, dim) float32
+    alive.{g}.u8      (capacity,) 1=유효, 0=삭제
+    assign.{g}.i32    (capacity,) IVF 리스트 번호 (-1: 미할당)
+    ids.{g}.txt       행 순서대로 문서 ID (한 줄에 하나)
+    centroids.npy     IVF 중심점 (있을 때만)
+
+compaction은 다음 generation 파일을 모두 쓰고 fsync한 뒤 meta.json을 os.replace로 교체해 전환하므로,
+중간에 프로세스가 죽어도 meta.json이 가리키는 이전 generation으로 열립니다.
+열 때 meta.json이 가리키지 않는 generation 파일은 지웁니다.
+"""
+
+import asyncio
+import io
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+
+logger = get_marigold_logger(__name__)
+
+SearchResult = List[Tuple[str, float]]
+
+DATA_FILES = ("vectors.f32", "alive.u8", "assign.i32", "ids.txt")
+DATA_FILE_PATTERN = re.compile(r"^(vectors|alive|assign|ids)(?:\.(\d+))?\.(f32|u8|i32|txt)$")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _write_durable(path: str, data: bytes, size: Optional[int] = None) -> None:
+    """파일을 쓰고 (size가 있으면 그 크기로 늘린 뒤) fsync합니다."""
+    with open(path, "wb") as f:
+        f.write(data)
+        if size is not None and size > len(data):
+            f.truncate(size)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fsync_directory(directory: str) -> None:
+    """rename 결과가 디스크에 남도록 디렉토리를 fsync합니다 (지원하지 않는 플랫폼은 건너뜀)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """scores(1차원)에서 점수 높은 순 인덱스 k개"""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class VectorIndex:
+    def __init__(self, directory: str, dim: int, initial_capacity: int = 1024):
+        self.directory = directory
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self.count = 0
+        self.dead = 0
+        self.generation = 0
+        self.centroids: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._alive: Optional[np.memmap] = None
+        self._assign: Optional[np.memmap] = None
+        # compaction 중 스냅샷 이후 삭제된 행 (compaction 중이 아니면 None)
+        self._compaction_deletes: Optional[List[int]] = None
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _data_path(self, name: str, generation: Optional[int] = None) -> str:
+        """generation별 데이터 파일 경로 (generation 0은 접미사 없는 이름)"""
+        generation = self.generation if generation is None else generation
+        if generation == 0:
+            return self._path(name)
+        base, ext = name.split(".")
+        return self._path(f"{base}.{generation}.{ext}")
+
+    # ==================== 파일 ====================
+
+    def _load(self) -> None:
+        if not os.path.exists(self._path("meta.json")):
+            # 데이터 파일을 먼저 만들고 meta.json을 마지막에 써서 생성 도중 죽어도 다시 생성되도록 함
+            open(self._data_path("ids.txt"), "w").close()
+            self._map(self.initial_capacity)
+            self._write_meta(self.generation)
+            return
+
+        with open(self._path("meta.json")) as f:
+            meta = json.load(f)
+        if meta["dim"] != self.dim:
+            raise ValueError(f"Dimension mismatch for vector index: {self.directory}")
+        self.generation = meta.get("generation", 0)
+        self._remove_stale_files()
+
+        self._ids = self._read_ids()
+
+        capacity = os.path.getsize(self._data_path("vectors.f32")) // (self.dim * 4)
+        self._map(capacity)
+        self.count = min(len(self._ids), capacity)
+        del self._ids[self.count:]
+
+        alive = np.asarray(self._alive[:self.count], dtype=bool)
+        self._rows = {self._ids[row]: row for row in np.flatnonzero(alive)}
+        self.dead = self.count - len(self._rows)
+
+        if os.path.exists(self._path("centroids.npy")):
+            self.centroids = np.load(self._path("centroids.npy"))
+
+    def _read_ids(self) -> List[str]:
+        """
+        ids.txt를 읽습니다.
+
+        추가 도중 종료되어 줄바꿈 없이 끝난 마지막 줄은 버리고 파일도 그 앞까지 잘라냅니다.
+        남겨 두면 다음 추가가 그 줄에 이어 붙어 이후 ID가 모두 한 행씩 어긋납니다.
+        """
+        with open(self._data_path("ids.txt"), "rb") as f:
+            data = f.read()
+
+        if data and not data.endswith(b"\n"):
+            size = data.rfind(b"\n") + 1
+            logger.warning(f"Dropping partial id line in {self.directory}")
+            with open(self._data_path("ids.txt"), "ab") as f:
+                f.truncate(size)
+                os.fsync(f.fileno())
+            data = data[:size]
+
+        return data.decode("utf-8").splitlines()
+
+    def _map(self, capacity: int) -> None:
+        """capacity 크기로 현재 generation 파일을 늘리고 memory-map 합니다."""
+        self._vectors, self._alive, self._assign = self._open_maps(self.generation, capacity)
+
+    def _open_maps(self, generation: int, capacity: int) -> Tuple[np.memmap, np.memmap, np.memmap]:
+        for name, itemsize in (("vectors.f32", self.dim * 4), ("alive.u8", 1), ("assign.i32", 4)):
+            with open(self._data_path(name, generation), "ab") as f:
+                if f.tell() < capacity * itemsize:
+                    f.truncate(capacity * itemsize)
+
+        return (
+            np.memmap(self._data_path("vectors.f32", generation), dtype=np.float32, mode="r+",
+                      shape=(capacity, self.dim)),
+            np.memmap(self._data_path("alive.u8", generation), dtype=np.uint8, mode="r+", shape=(capacity,)),
+            np.memmap(self._data_path("assign.i32", generation), dtype=np.int32, mode="r+", shape=(capacity,)),
+        )
+
+    def _write_meta(self, generation: int) -> None:
+        """meta.json을 원자적으로 교체합니다 (이 시점에 generation이 전환됨)."""
+        _write_durable(self._path("meta.tmp"), json.dumps({"dim": self.dim, "generation": generation}).encode())
+        os.replace(self._path("meta.tmp"), self._path("meta.json"))
+        _fsync_directory(self.directory)
+
+    def _write_generation(
+            self,
+            generation: int,
+            capacity: int,
+            vectors: np.ndarray,
+            assign: np.ndarray,
+            ids: Sequence[str]
+    ) -> None:
+        """새 generation의 데이터 파일을 모두 쓰고 fsync합니다 (meta.json 전환 전까지는 사용되지 않음)."""
+        count = len(ids)
+        contents = (
+            ("vectors.f32", np.ascontiguousarray(vectors, dtype=np.float32).tobytes(), capacity * self.dim * 4),
+            ("alive.u8", np.ones(count, dtype=np.uint8).tobytes(), capacity),
+            ("assign.i32", np.ascontiguousarray(assign, dtype=np.int32).tobytes(), capacity * 4),
+            ("ids.txt", "".join(f"{doc_id}\n" for doc_id in ids).encode("utf-8"), None),
+        )
+        for name, data, size in contents:
+            _write_durable(self._data_path(name, generation), data, size)
+
+    def _remove_generation(self, generation: int) -> None:
+        for name in DATA_FILES:
+            try:
+                os.remove(self._data_path(name, generation))
+            except FileNotFoundError:
+                pass
+
+    def _remove_stale_files(self) -> None:
+        """중단된 compaction이 남긴 다른 generation 파일과 임시 파일을 지웁니다."""
+        for name in os.listdir(self.directory):
+            match = DATA_FILE_PATTERN.match(name)
+            stale_generation = match is not None and int(match.group(2) or 0) != self.generation
+            if stale_generation or name.endswith(".tmp"):
+                os.remove(self._path(name))
+
+    def _flush(self) -> None:
+        self._vectors.flush()
+        self._alive.flush()
+        self._assign.flush()
+
+    # ==================== 쓰기 ====================
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        벡터를 추가합니다. 이미 있는 ID는 이전 행을 삭제 처리하고 새 행으로 교체합니다.
+
+        Args:
+            ids: 문서 ID (줄바꿈 불가)
+            vectors: (len(ids), dim) 벡터 (정규화는 여기서 수행)
+        """
+        vectors = normalize(vectors)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(ids)}, {self.dim}), got {vectors.shape}")
+        if any("\n" in doc_id for doc_id in ids):
+            raise ValueError("Document id must not contain newlines")
+
+        with self._lock:
+            self.delete(ids)
+
+            needed = self.count + len(ids)
+            if needed > self._vectors.shape[0]:
+                self._flush()
+                self._map(max(needed, self._vectors.shape[0] * 2))
+
+            start, end = self.count, needed
+            self._vectors[start:end] = vectors
+            self._alive[start:end] = 1
+            self._assign[start:end] = self._nearest_lists(vectors) if self.centroids is not None else -1
+            self._flush()
+
+            with open(self._data_path("ids.txt"), "a", encoding="utf-8") as f:
+                f.write("".join(f"{doc_id}\n" for doc_id in ids))
+                f.flush()
+                os.fsync(f.fileno())
+
+            for i, doc_id in enumerate(ids):
+                self._ids.append(doc_id)
+                self._rows[doc_id] = start + i
+            self.count = end
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        tombstone으로 삭제 표시합니다.
+
+        Returns:
+            삭제된 문서 수
+        """
+        with self._lock:
+            rows = [row for row in (self._rows.pop(doc_id, None) for doc_id in ids) if row is not None]
+            if rows:
+                self._alive[rows] = 0
+                self._alive.flush()
+                self.dead += len(rows)
+                if self._compaction_deletes is not None:
+                    self._compaction_deletes.extend(rows)
+            return len(rows)
+
+    # ==================== 검색 ====================
+
+    def search(self, queries: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[SearchResult]:
+        """
+        코사인 유사도 top-k 검색
+
+        Args:
+            queries: (q, dim) 또는 (dim,) 쿼리 벡터
+            k: 쿼리당 결과 수
+            nprobe: IVF 사용 시 탐색할 리스트 수 (기본 VECTOR_INDEX_IVF_NPROBE)
+
+        Returns:
+            쿼리별 [(문서 ID, 점수), ...] (점수 내림차순)
+        """
+        queries = normalize(queries)
+
+        with self._lock:
+            n = self.count
+            if n == 0 or not self._rows:
+                return [[] for _ in range(len(queries))]
+
+            vectors = self._vectors[:n]
+            alive = np.asarray(self._alive[:n], dtype=bool)
+
+            if self.centroids is None:
+                # (n, q): 모든 쿼리를 한 번의 행렬 곱으로
+                scores = vectors @ queries.T
+                scores[~alive] = -np.inf
+                return [self._results(scores[:, j], np.arange(n), k) for j in range(len(queries))]
+
+            nprobe = nprobe or settings.VECTOR_INDEX_IVF_NPROBE
+            assign = np.asarray(self._assign[:n])
+            probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+            results = []
+            for j, query in enumerate(queries):
+                # 미할당(-1) 행은 항상 포함
+                candidates = np.flatnonzero(alive & (np.isin(assign, probes[j]) | (assign < 0)))
+                results.append(self._results(vectors[candidates] @ query, candidates, k))
+            return results
+
+    def _results(self, scores: np.ndarray, rows: np.ndarray, k: int) -> SearchResult:
+        top = _top_k(scores, k)
+        return [(self._ids[rows[i]], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    # ==================== IVF / Compaction ====================
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10) -> None:
+        """
+        유효 벡터로 k-means(코사인) 중심점을 학습하고 모든 행을 리스트에 할당합니다.
+
+        Args:
+            nlist: 리스트 수 (기본 sqrt(유효 벡터 수))
+            iterations: k-means 반복 횟수
+        """
+        with self._lock:
+            rows = np.flatnonzero(np.asarray(self._alive[:self.count], dtype=bool))
+            sample = np.array(self._vectors[rows])
+
+        if len(sample) == 0:
+            return
+
+        nlist = min(nlist or int(np.sqrt(len(sample))), len(sample))
+        rng = np.random.default_rng(0)
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            centroids = normalize(sums)
+
+        with self._lock:
+            self.centroids = centroids
+            buffer = io.BytesIO()
+            np.save(buffer, centroids)
+            _write_durable(self._path("centroids.tmp"), buffer.getvalue())
+            os.replace(self._path("centroids.tmp"), self._path("centroids.npy"))
+            self._assign[:self.count] = self._nearest_lists(self._vectors[:self.count])
+            self._assign.flush()
+
+        logger.info(f"Built IVF index ({nlist} lists, {len(sample)} vectors): {self.directory}")
+
+    def _nearest_lists(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def needs_compaction(self) -> bool:
+        return self.count > 0 and self.dead / self.count >= settings.VECTOR_INDEX_COMPACT_RATIO
+
+    def compact(self) -> None:
+        """
+        삭제된 행을 제거한 새 generation 파일로 교체합니다.
+
+        스냅샷 시점의 유효 행으로 새 generation을 쓰고 fsync하는 작업은 락 밖에서 하고,
+        락 안에서는 그동안 추가/삭제된 행만 새 파일에 반영한 뒤 meta.json을 원자적으로 교체해 전환합니다.
+        """
+        with self._lock:
+            if self._compaction_deletes is not None:
+                return
+            n = self.count
+            keep = np.flatnonzero(np.asarray(self._alive[:n], dtype=bool))
+            # 스냅샷 범위(< n)의 행과 ID는 전환 전까지 바뀌지 않음 (추가는 뒤에 붙고, 삭제는 alive만 바꿈)
+            snapshot_ids, snapshot_vectors, snapshot_assign = self._ids, self._vectors, self._assign
+            centroids = self.centroids
+            previous = self.generation
+            self._compaction_deletes = []
+
+        generation = previous + 1
+        switched = False
+        try:
+            # 락 밖: 스냅샷의 유효 행으로 새 generation 기록
+            ids = [snapshot_ids[row] for row in keep]
+            capacity = max(self.initial_capacity, len(ids) * 2)
+            self._write_generation(generation, capacity, snapshot_vectors[keep], snapshot_assign[keep], ids)
+            rows = {doc_id: row for row, doc_id in enumerate(ids)}
+            del snapshot_ids, snapshot_vectors, snapshot_assign
+
+            with self._lock:
+                # 스냅샷 이후 변경분만 반영: 추가된 행은 뒤에 붙이고, 삭제된 기존 행은 새 위치에 tombstone
+                appended = np.arange(n, self.count)
+                appended = appended[np.asarray(self._alive[appended], dtype=bool)]
+                deleted = np.searchsorted(keep, [row for row in self._compaction_deletes if row < n])
+                appended_ids = [self._ids[row] for row in appended]
+                kept = len(ids)
+                count = kept + len(appended)
+
+                vectors, alive, assign = self._open_maps(generation, max(capacity, count))
+                vectors[kept:count] = self._vectors[appended]
+                alive[kept:count] = 1
+                alive[deleted] = 0
+                assign[kept:count] = self._assign[appended]
+                if self.centroids is not centroids:
+                    # 복사 중 IVF가 다시 빌드됨
+                    assign[:count] = self._nearest_lists(vectors[:count]) if self.centroids is not None else -1
+                for mapped in (vectors, alive, assign):
+                    mapped.flush()
+                with open(self._data_path("ids.txt", generation), "a", encoding="utf-8") as f:
+                    f.write("".join(f"{doc_id}\n" for doc_id in appended_ids))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # 새 generation을 모두 기록한 뒤 meta.json 교체로 전환 (중간에 죽으면 이전 generation 유지)
+                self._write_meta(generation)
+                switched = True
+
+                for row in deleted:
+                    del rows[ids[row]]
+                for i, doc_id in enumerate(appended_ids):
+                    rows[doc_id] = kept + i
+                ids.extend(appended_ids)
+
+                self._vectors, self._alive, self._assign = vectors, alive, assign
+                self.generation = generation
+                self._ids = ids
+                self._rows = rows
+                self.count = count
+                self.dead = len(deleted)
+                self._compaction_deletes = None
+        finally:
+            if not switched:
+                with self._lock:
+                    self._compaction_deletes = None
+                self._remove_generation(generation)
+
+        self._remove_generation(previous)
+        logger.info(f"Compacted vector index ({len(rows)} vectors): {self.directory}")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class VectorIndexRegistry:
+    """
+    네임스페이스(사용자/대화)별 인덱스를 열고, 최대 VECTOR_INDEX_MAX_OPEN개까지 유지합니다.
+
+    유지보수(compaction / IVF 빌드) 중인 인덱스는 내보내지 않습니다. 내보낸 뒤 다시 열면
+    같은 디렉토리에 인스턴스가 둘 생겨 compaction이 바꾼 파일을 다른 인스턴스가 계속 쓰게 되기 때문입니다.
+    """
+
+    def __init__(self, base_dir: str = settings.VECTOR_INDEX_DIR, max_open: int = settings.VECTOR_INDEX_MAX_OPEN):
+        self.base_dir = base_dir
+        self.max_open = max_open
+        self._indexes: "OrderedDict[str, VectorIndex]" = OrderedDict()
+        self._maintenance: Dict[str, asyncio.Task] = {}
+
+    def get(self, namespace: str, dim: int) -> VectorIndex:
+        index = self._indexes.get(namespace)
+
+        if index is None:
+            name = re.sub(r"[^A-Za-z0-9._-]", "_", namespace)
+            index = VectorIndex(os.path.join(self.base_dir, name), dim)
+            self._indexes[namespace] = index
+            self._evict()
+        else:
+            self._indexes.move_to_end(namespace)
+
+        return index
+
+    def _evict(self) -> None:
+        """오래 사용하지 않은 인덱스부터 내보냅니다 (유지보수 중인 인덱스는 건너뜀)."""
+        excess = len(self._indexes) - self.max_open
+        if excess <= 0:
+            return
+
+        for namespace in list(self._indexes):
+            if excess <= 0:
+                break
+            if self._is_maintaining(namespace):
+                continue
+            del self._indexes[namespace]
+            excess -= 1
+
+    def _is_maintaining(self, namespace: str) -> bool:
+        task = self._maintenance.get(namespace)
+        if task is None:
+            return False
+        if task.done():
+            del self._maintenance[namespace]
+            return False
+        return True
+
+    def schedule_maintenance(self, namespace: str) -> None:
+        """
+        필요하면 compaction / IVF 빌드를 백그라운드 스레드에서 실행합니다.
+        쓰기(add/delete) 후 호출합니다.
+        """
+        index = self._indexes.get(namespace)
+        if index is None or self._is_maintaining(namespace):
+            return
+
+        needs_ivf = index.centroids is None and len(index) >= settings.VECTOR_INDEX_IVF_MIN_SIZE
+        if index.needs_compaction() or needs_ivf:
+            self._maintenance[namespace] = asyncio.create_task(self._maintain(index, needs_ivf))
+
+    async def _maintain(self, index: VectorIndex, build_ivf: bool) -> None:
+        try:
+            if index.needs_compaction():
+                await asyncio.to_thread(index.compact)
+            if build_ivf:
+                await asyncio.to_thread(index.build_ivf)
+        except Exception as e:
+            logger.error(f"Vector index maintenance failed: {index.directory}: {e}")
+
+
+vector_indexes = VectorIndexRegistry()
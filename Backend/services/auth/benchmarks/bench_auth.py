@@ -0,0 +1,349 @@
+"""
+Auth Hot Path 벤치마크
+
+jwt_service / JWTValidator의 주요 흐름을 고정된 동시성으로 실행하고
+처리량, p50/p99 지연 시간, 요청당 Redis 왕복 횟수를 측정합니다.
+왕복 횟수는 commons.metrics의 redis_command_seconds 관측 횟수(명령 + 파이프라인 execute)로 셉니다.
+
+시나리오:
+    login_storm       서로 다른 사용자의 동시 로그인 (create_tokens)
+    device_limit      기기 제한에 도달한 한 사용자의 반복 로그인 (매번 가장 오래된 토큰 제거)
+    refresh_storm     서로 다른 Refresh Token의 동시 갱신 (refresh_access_token)
+    refresh_same_jti  같은 Refresh Token으로 동시에 들어온 갱신 (앱 일괄 깨어남)
+    verify_http       Access Token 검증 (verify_jwt_http)
+    revoke_token      Refresh Token 단건 무효화 (revoke_refresh_token)
+    revoke_users      사용자 일괄 무효화 (revoke_users_tokens, 연산 1회 = 500명 청크)
+
+Redis:
+    --redis-server 를 주면 빈 포트에 redis-server 프로세스를 띄워 사용하고 종료 시 정리합니다.
+    (persistence 비활성화) 주지 않으면 REDIS_URL의 Redis를 사용하며, 벤치마크 키만 삭제합니다.
+
+실행 (services/auth 디렉토리에서):
+    python -m benchmarks.bench_auth --redis-server --save benchmarks/baselines/main.json
+    python -m benchmarks.bench_auth --redis-server --compare benchmarks/baselines/main.json
+
+--compare 는 기준 대비 처리량 감소/p99 증가가 --tolerance를 넘거나 왕복 횟수가 늘어난
+시나리오가 있으면 종료 코드 1을 반환합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+USER_PREFIX = "bench-user-"
+REVOKE_CHUNK_SIZE = 500
+
+# 벤치마크에 필요 없는 설정은 더미 값으로 채움 (환경 변수가 있으면 그대로 사용)
+# 로그인/갱신 Rate Limit은 측정을 방해하지 않도록 크게 설정 (Redis 왕복 비용은 그대로 포함)
+BENCH_ENV = {
+    "MONGO_URL": "mongodb://localhost:27017",
+    "AUTH_DB_NAME": "bench",
+    "CHAT_DB_NAME": "bench",
+    "AI_DB_NAME": "bench",
+    "CALENDAR_DB_NAME": "bench",
+    "KAFKA_BOOTSTRAP_SERVERS": "localhost:9092",
+    "OLLAMA_BASE_URL": "http://localhost:11434",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "JWT_SECRET_KEY": "bench-secret-key-bench-secret-key",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_ISSUER": "marigold-bench",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_MINUTES": "10080",
+    "MAX_DEVICES_PER_USER": "3",
+    "LOGIN_RATE_PER_MINUTE": "1000000000",
+    "REFRESH_RATE_PER_MINUTE": "1000000000",
+    "LOG_DIR": "/tmp/marigold-bench-logs",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+# ==================== Redis stand-in ====================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_redis_server() -> subprocess.Popen:
+    """localhost에 persistence 없는 redis-server를 띄우고 REDIS_URL을 설정합니다."""
+    binary = shutil.which("redis-server")
+    if binary is None:
+        sys.exit("redis-server not found in PATH")
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [binary, "--port", str(port), "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    else:
+        process.kill()
+        sys.exit("redis-server did not start")
+
+    os.environ["REDIS_URL"] = f"redis://127.0.0.1:{port}/0"
+    return process
+
+
+# ==================== 측정 ====================
+
+class Scenario:
+    def __init__(self, name: str, operations: int, op: Callable[[int], Awaitable[None]],
+                 setup: Optional[Callable[[], Awaitable[None]]] = None):
+        self.name = name
+        self.operations = operations
+        self.op = op
+        self.setup = setup
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def measure(scenario: Scenario, concurrency: int, round_trips) -> Dict[str, float]:
+    if scenario.setup:
+        await scenario.setup()
+
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await scenario.op(i)
+            latencies.append(time.perf_counter() - start)
+
+    trips_before = round_trips()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(scenario.operations)))
+    elapsed = time.perf_counter() - started
+    trips = round_trips() - trips_before
+
+    latencies.sort()
+    return {
+        "operations": scenario.operations,
+        "ops_per_sec": round(scenario.operations / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "round_trips_per_op": round(trips / scenario.operations, 3),
+    }
+
+
+def build_scenarios(requests: int, concurrency: int):
+    # 설정이 환경 변수에서 로드된 뒤에 import
+    from commons.settings import settings
+    from commons.validate_jwt import JWTValidator
+    from services import jwt_service
+
+    validator = JWTValidator()
+    state: Dict[str, list] = {}
+
+    async def login(i: int) -> None:
+        await jwt_service.create_tokens(f"{USER_PREFIX}login-{i}")
+
+    async def prepare_device_limit() -> None:
+        for _ in range(settings.MAX_DEVICES_PER_USER):
+            await jwt_service.create_tokens(f"{USER_PREFIX}device")
+
+    async def device_login(i: int) -> None:
+        await jwt_service.create_tokens(f"{USER_PREFIX}device")
+
+    async def prepare_refresh() -> None:
+        state["refresh"] = [
+            (await jwt_service.create_tokens(f"{USER_PREFIX}refresh-{i}"))[1]
+            for i in range(min(requests, 2000))
+        ]
+
+    async def prepare_refresh_same() -> None:
+        state["same"] = [(await jwt_service.create_tokens(f"{USER_PREFIX}same"))[1]]
+
+    async def refresh(i: int) -> None:
+        tokens = state["refresh"]
+        await jwt_service.refresh_access_token(tokens[i % len(tokens)])
+
+    async def refresh_same(i: int) -> None:
+        await jwt_service.refresh_access_token(state["same"][0])
+
+    async def prepare_verify() -> None:
+        state["access"] = [
+            f"Bearer {(await jwt_service.create_tokens(f'{USER_PREFIX}verify-{i}'))[0]}"
+            for i in range(min(requests, 1000))
+        ]
+
+    async def verify(i: int) -> None:
+        headers = state["access"]
+        await validator.verify_jwt_http(headers[i % len(headers)])
+
+    async def prepare_revoke() -> None:
+        import jwt
+        tokens = [
+            (await jwt_service.create_tokens(f"{USER_PREFIX}revoke-{i}"))[1]
+            for i in range(requests)
+        ]
+        state["jtis"] = [jwt.decode(t, options={"verify_signature": False})["jti"] for t in tokens]
+
+    async def revoke_token(i: int) -> None:
+        await jwt_service.revoke_refresh_token(state["jtis"][i])
+
+    async def prepare_revoke_users() -> None:
+        for i in range(requests):
+            await jwt_service.create_tokens(f"{USER_PREFIX}bulk-{i}")
+
+    async def revoke_users(i: int) -> None:
+        start = i * REVOKE_CHUNK_SIZE
+        await jwt_service.revoke_users_tokens(
+            (f"{USER_PREFIX}bulk-{j}" for j in range(start, min(start + REVOKE_CHUNK_SIZE, requests))),
+            chunk_size=REVOKE_CHUNK_SIZE
+        )
+
+    return [
+        Scenario("login_storm", requests, login),
+        Scenario("device_limit", requests, device_login, prepare_device_limit),
+        Scenario("refresh_storm", requests, refresh, prepare_refresh),
+        Scenario("refresh_same_jti", requests, refresh_same, prepare_refresh_same),
+        Scenario("verify_http", requests, verify, prepare_verify),
+        Scenario("revoke_token", requests, revoke_token, prepare_revoke),
+        Scenario("revoke_users", -(-requests // REVOKE_CHUNK_SIZE), revoke_users, prepare_revoke_users),
+    ]
+
+
+async def cleanup() -> None:
+    from databases.redis_client import get_redis_client
+
+    redis = await get_redis_client()
+    async for key in redis.scan_iter(match=f"user_tokens:{USER_PREFIX}*", count=500):
+        jtis = await redis.zrange(key, 0, -1)
+        await redis.delete(key, *(f"refresh_token:{jti}" for jti in jtis))
+    async for key in redis.scan_iter(match=f"rate_limit:*:{USER_PREFIX}*", count=500):
+        await redis.delete(key)
+
+
+# ==================== 비교 ====================
+
+def compare(baseline: dict, current: dict, tolerance: float) -> bool:
+    """
+    Returns:
+        bool: 회귀가 없으면 True
+    """
+    ok = True
+    print(f"\n{'scenario':<18}{'ops/s':>22}{'p99 ms':>22}{'round trips/op':>22}")
+
+    for name, now in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            print(f"{name:<18}{'(new)':>22}")
+            continue
+
+        ops_change = now["ops_per_sec"] / base["ops_per_sec"] - 1
+        p99_change = now["p99_ms"] / base["p99_ms"] - 1 if base["p99_ms"] else 0.0
+        trips_change = now["round_trips_per_op"] - base["round_trips_per_op"]
+
+        regressed = ops_change < -tolerance or p99_change > tolerance or trips_change > 0.001
+        ok = ok and not regressed
+
+        print(
+            f"{name:<18}"
+            f"{base['ops_per_sec']:>9.0f} → {now['ops_per_sec']:>7.0f} ({ops_change:+.0%})"
+            f"{base['p99_ms']:>8.2f} → {now['p99_ms']:>6.2f} ({p99_change:+.0%})"
+            f"{base['round_trips_per_op']:>9.2f} → {now['round_trips_per_op']:>6.2f}"
+            + ("  REGRESSION" if regressed else "")
+        )
+
+    return ok
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from commons.metrics import REGISTRY
+    from databases.redis_client import close_redis_client, get_redis_client
+    from repositories.session_store import session_store
+
+    await get_redis_client()
+    await session_store.load_scripts()
+    await cleanup()
+
+    round_trips = REGISTRY.get("redis_command_seconds").total_count
+    selected = set(args.scenarios) if args.scenarios else None
+    results: Dict[str, dict] = {}
+
+    try:
+        for scenario in build_scenarios(args.requests, args.concurrency):
+            if selected and scenario.name not in selected:
+                continue
+
+            result = await measure(scenario, args.concurrency, round_trips)
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<18} ops/s={result['ops_per_sec']:>9.0f}  "
+                f"round_trips/op={result['round_trips_per_op']:>5.2f}  "
+                f"p50={result['p50_ms']:>7.3f}ms  p99={result['p99_ms']:>7.3f}ms"
+            )
+    finally:
+        await cleanup()
+        await close_redis_client()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="시나리오당 연산 수")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="*", help="실행할 시나리오 (기본: 전체)")
+    parser.add_argument("--redis-server", action="store_true", help="임시 redis-server 프로세스 사용")
+    parser.add_argument("--save", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용 변화율 (처리량, p99)")
+    args = parser.parse_args()
+
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+
+    server = start_redis_server() if args.redis_server else None
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(baseline, report, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Refresh Token 발급 벤치마크
+
+기존 경로(store_refresh_token + enforce_device_limit)와
+Lua 스크립트 경로(session_store.issue)의 Redis 왕복 횟수와 지연 시간을 비교합니다.
+
+실행 (services/auth 디렉토리에서, REDIS_URL의 Redis 사용):
+    python -m benchmarks.bench_session_store --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+from uuid import uuid4
+
+from databases.redis_client import get_redis_client
+from repositories.session_store import session_store
+from services.jwt_service import enforce_device_limit, store_refresh_token
+
+USER_PREFIX = "bench-user-"
+
+
+class RoundTripCounter:
+    """Redis 클라이언트의 execute_command 호출 횟수(= 왕복 횟수)를 셉니다."""
+
+    def __init__(self, redis):
+        self.count = 0
+        self._execute_command = redis.execute_command
+        redis.execute_command = self._counted
+
+    async def _counted(self, *args, **options):
+        self.count += 1
+        return await self._execute_command(*args, **options)
+
+
+async def legacy_issue(jti: str, user_id: str) -> None:
+    await store_refresh_token(jti, user_id)
+    await enforce_device_limit(user_id, jti)
+
+
+async def script_issue(jti: str, user_id: str) -> None:
+    await session_store.issue(jti, user_id)
+
+
+async def run(
+        name: str,
+        issue: Callable[[str, str], Awaitable[None]],
+        counter: RoundTripCounter,
+        requests: int,
+        concurrency: int,
+        users: int
+) -> None:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await issue(str(uuid4()), f"{USER_PREFIX}{i % users}")
+            latencies.append(time.perf_counter() - start)
+
+    counter.count = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+    print(
+        f"{name:<8} ops/s={requests / elapsed:>9.0f}  "
+        f"round_trips/op={counter.count / requests:>5.2f}  "
+        f"p50={p50:>7.3f}ms  p99={p99:>7.3f}ms"
+    )
+
+
+async def cleanup(redis) -> None:
+    async for key in redis.scan_iter(match=f"user_tokens:{USER_PREFIX}*", count=500):
+        jtis = await redis.zrange(key, 0, -1)
+        await redis.delete(key, *(f"refresh_token:{jti}" for jti in jtis))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=500, help="사용자 수 (작을수록 기기 제한 제거가 자주 발생)")
+    args = parser.parse_args()
+
+    redis = await get_redis_client()
+    await session_store.load_scripts()
+    counter = RoundTripCounter(redis)
+
+    try:
+        for name, issue in (("legacy", legacy_issue), ("script", script_issue)):
+            await cleanup(redis)
+            await run(name, issue, counter, args.requests, args.concurrency, args.users)
+    finally:
+        await cleanup(redis)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
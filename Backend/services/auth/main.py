@@ -1,2 +1,23 @@
+from contextlib import asynccontextmanager
+
+from commons.app_factory import create_app
+from repositories.session_store import session_store
+
+
+@asynccontextmanager
+async def session_scripts_lifespan():
+    await session_store.load_scripts()
+    yield
+
+
+app = create_app(
+    "auth",
+    use_session_view=True,
+    lifespans=[session_scripts_lifespan],
+)
+
+
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
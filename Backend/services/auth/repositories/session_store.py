@@ -0,0 +1,447 @@
+"""
+Refresh Token Session Store
+
+refresh_token:{jti} / user_tokens:{user_id} 키를 관리합니다.
+Lua 스크립트를 미리 로드(SCRIPT LOAD)해두고 EVALSHA로 호출하여
+여러 Redis 명령을 한 번의 왕복으로 원자적으로 처리합니다.
+
+발급/무효화 스크립트는 SESSION_EVENTS_CHANNEL로 세션 이벤트를 함께 발행하며,
+각 서비스의 commons.session_view가 이를 구독합니다.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import NoScriptError
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+
+logger = get_marigold_logger(__name__)
+
+REFRESH_TOKEN_PREFIX = "refresh_token:"
+USER_TOKENS_PREFIX = "user_tokens:"
+REFRESH_USED_PREFIX = "refresh_used:"
+
+# KEYS[1] = refresh_token:{jti}, KEYS[2] = user_tokens:{user_id}
+# ARGV[1] = jti, ARGV[2] = user_id, ARGV[3] = ttl(초), ARGV[4] = score,
+# ARGV[5] = 최대 기기 수, ARGV[6] = refresh_token 키 prefix, ARGV[7] = 세션 이벤트 채널
+# 반환: 기기 제한으로 제거된 JTI 목록
+ISSUE_SCRIPT = """
+redis.call('SETEX', KEYS[1], ARGV[3], ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+redis.call('PUBLISH', ARGV[7], cjson.encode({type = 'issued', userId = ARGV[2]}))
+
+local overflow = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[5])
+if overflow <= 0 then
+    return {}
+end
+
+local evicted = redis.call('ZRANGE', KEYS[2], 0, overflow - 1)
+for _, old_jti in ipairs(evicted) do
+    redis.call('DEL', ARGV[6] .. old_jti)
+end
+redis.call('ZREM', KEYS[2], unpack(evicted))
+return evicted
+"""
+
+# KEYS[1] = refresh_token:{jti}
+# ARGV[1] = jti, ARGV[2] = user_tokens 키 prefix, ARGV[3] = 세션 이벤트 채널
+# 반환: 토큰 소유자 user_id (없으면 nil)
+REVOKE_TOKEN_SCRIPT = """
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return false
+end
+
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', ARGV[2] .. user_id, ARGV[1])
+
+local remaining = redis.call('ZCARD', ARGV[2] .. user_id)
+redis.call('PUBLISH', ARGV[3], cjson.encode({type = 'revoked', userId = user_id, remaining = remaining}))
+return user_id
+"""
+
+# KEYS[1] = user_tokens:{user_id}
+# ARGV[1] = refresh_token 키 prefix, ARGV[2] = user_id, ARGV[3] = 세션 이벤트 채널
+# 반환: 무효화된 토큰 수
+REVOKE_USER_SCRIPT = """
+local jtis = redis.call('ZRANGE', KEYS[1], 0, -1)
+if #jtis == 0 then
+    return 0
+end
+
+for _, jti in ipairs(jtis) do
+    redis.call('DEL', ARGV[1] .. jti)
+end
+redis.call('DEL', KEYS[1])
+
+redis.call('PUBLISH', ARGV[3], cjson.encode({type = 'revoked', userId = ARGV[2], remaining = 0}))
+return #jtis
+"""
+
+
+# KEYS[1] = refresh_token:{jti}, KEYS[2] = refresh_used:{jti}
+# ARGV[1] = jti, ARGV[2] = user_tokens 키 prefix, ARGV[3] = refresh_token 키 prefix,
+# ARGV[4] = 교체할 새 JTI (빈 문자열이면 교체 안 함), ARGV[5] = 새 토큰 ttl(초), ARGV[6] = score,
+# ARGV[7] = 재사용 유예 시간(초), ARGV[8] = 세션 이벤트 채널
+# 반환: {상태, user_id}
+#   ok        - 유효 (교체 안 함)
+#   rotated   - 유효, 기존 JTI를 폐기하고 새 JTI 저장
+#   grace     - 방금 교체된 JTI의 동시 요청 (Access Token만 발급)
+#   reused    - 교체된 JTI 재사용 (탈취 의심, 사용자 세션 전체 무효화)
+#   revoked   - 없는 JTI (로그아웃/만료)
+#   no_session - 세션 목록에 없는 JTI
+REFRESH_SCRIPT = """
+local user_id = redis.call('GET', KEYS[1])
+
+if not user_id then
+    local used = redis.call('HMGET', KEYS[2], 'userId', 'rotatedAt')
+    if not used[1] then
+        return {'revoked', false}
+    end
+
+    local now = tonumber(redis.call('TIME')[1])
+    if now - tonumber(used[2]) <= tonumber(ARGV[7]) then
+        return {'grace', used[1]}
+    end
+
+    local tokens_key = ARGV[2] .. used[1]
+    local jtis = redis.call('ZRANGE', tokens_key, 0, -1)
+    for _, jti in ipairs(jtis) do
+        redis.call('DEL', ARGV[3] .. jti)
+    end
+    redis.call('DEL', tokens_key, KEYS[2])
+    redis.call('PUBLISH', ARGV[8], cjson.encode({type = 'revoked', userId = used[1], remaining = 0}))
+    return {'reused', used[1]}
+end
+
+local tokens_key = ARGV[2] .. user_id
+if not redis.call('ZSCORE', tokens_key, ARGV[1]) then
+    return {'no_session', user_id}
+end
+
+if ARGV[4] == '' then
+    return {'ok', user_id}
+end
+
+-- 기존 토큰의 남은 수명 동안 재사용을 감지할 수 있도록 표시
+local remaining_ms = redis.call('PTTL', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', tokens_key, ARGV[1])
+redis.call('HSET', KEYS[2], 'userId', user_id, 'rotatedAt', redis.call('TIME')[1])
+if remaining_ms > 0 then
+    redis.call('PEXPIRE', KEYS[2], remaining_ms)
+else
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+end
+
+redis.call('SETEX', ARGV[3] .. ARGV[4], ARGV[5], user_id)
+redis.call('ZADD', tokens_key, ARGV[6], ARGV[4])
+return {'rotated', user_id}
+"""
+
+
+def refresh_token_key(jti: str) -> str:
+    return f"{REFRESH_TOKEN_PREFIX}{jti}"
+
+
+def user_tokens_key(user_id: str) -> str:
+    return f"{USER_TOKENS_PREFIX}{user_id}"
+
+
+def refresh_used_key(jti: str) -> str:
+    return f"{REFRESH_USED_PREFIX}{jti}"
+
+
+@dataclass
+class RevocationResult:
+    """대량 무효화 결과"""
+    users: int = 0
+    tokens: int = 0
+
+    def add(self, other: "RevocationResult") -> None:
+        self.users += other.users
+        self.tokens += other.tokens
+
+
+def session_score() -> str:
+    """user_tokens Sorted Set의 score (발급 시각, 기존 포맷 유지)"""
+    return datetime.now().strftime("%Y%m%d%H%M%S")
+
+
+class SessionStore:
+    """
+    Refresh Token 세션 저장소
+
+    스크립트는 Redis 클라이언트별로 등록되며, 클라이언트가 교체되면
+    (재연결 등) 자동으로 다시 등록/로드합니다.
+    EVALSHA 실행 시 NOSCRIPT 에러가 나면 redis-py가 스크립트를 다시 로드합니다.
+    """
+
+    _SCRIPTS: Dict[str, str] = {
+        "issue": ISSUE_SCRIPT,
+        "revoke_token": REVOKE_TOKEN_SCRIPT,
+        "revoke_user": REVOKE_USER_SCRIPT,
+        "refresh": REFRESH_SCRIPT,
+    }
+
+    def __init__(self):
+        self._redis: Redis = None
+        self._scripts: Dict[str, AsyncScript] = {}
+
+    async def _get_script(self, name: str) -> AsyncScript:
+        redis = await get_redis_client()
+
+        if redis is not self._redis:
+            self._scripts = {
+                script_name: redis.register_script(source)
+                for script_name, source in self._SCRIPTS.items()
+            }
+            self._redis = redis
+
+        return self._scripts[name]
+
+    async def load_scripts(self) -> None:
+        """
+        모든 스크립트를 Redis에 미리 로드합니다 (서비스 시작 시 호출).
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        redis = await get_redis_client()
+
+        for name in self._SCRIPTS:
+            script = await self._get_script(name)
+            script.sha = await redis.script_load(script.script)
+
+        logger.info(f"Loaded {len(self._SCRIPTS)} session scripts")
+
+    async def issue(self, jti: str, user_id: str) -> List[str]:
+        """
+        Refresh Token을 저장하고 기기 제한을 적용합니다 (1 round trip).
+
+        SETEX, ZADD, ZCARD, ZRANGE, DEL, ZREM을 하나의 스크립트로 실행하므로
+        동시 로그인 시에도 기기 수가 MAX_DEVICES_PER_USER를 넘지 않습니다.
+
+        Args:
+            jti: JWT ID
+            user_id: 사용자 ID
+
+        Returns:
+            기기 제한으로 제거된 JTI 목록
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        script = await self._get_script("issue")
+
+        evicted = await script(
+            keys=[refresh_token_key(jti), user_tokens_key(user_id)],
+            args=[
+                jti,
+                user_id,
+                settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+                session_score(),
+                settings.MAX_DEVICES_PER_USER,
+                REFRESH_TOKEN_PREFIX,
+                settings.SESSION_EVENTS_CHANNEL,
+            ],
+        )
+
+        return list(evicted)
+
+    async def refresh(self, jti: str, new_jti: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """
+        Refresh Token의 JTI와 세션을 함께 확인하고, new_jti가 주어지면 교체합니다 (1 round trip).
+
+        교체된 JTI는 남은 수명 동안 refresh_used:{jti}로 표시되어, 유예 시간
+        (REFRESH_REUSE_GRACE_SECONDS) 이후 다시 사용되면 사용자의 모든 세션을 무효화합니다.
+
+        Args:
+            jti: 사용된 Refresh Token의 JWT ID
+            new_jti: 교체할 새 JWT ID (None이면 교체하지 않음)
+
+        Returns:
+            (상태, user_id) - 상태는 REFRESH_SCRIPT 주석 참고
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        script = await self._get_script("refresh")
+
+        status, user_id = await script(
+            keys=[refresh_token_key(jti), refresh_used_key(jti)],
+            args=[
+                jti,
+                USER_TOKENS_PREFIX,
+                REFRESH_TOKEN_PREFIX,
+                new_jti or "",
+                settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+                session_score(),
+                settings.REFRESH_REUSE_GRACE_SECONDS,
+                settings.SESSION_EVENTS_CHANNEL,
+            ],
+        )
+
+        return status, user_id or None
+
+    async def revoke_token(self, jti: str) -> Optional[str]:
+        """
+        Refresh Token 하나를 무효화합니다 (GET, DEL, ZREM을 1 round trip으로).
+
+        Args:
+            jti: JWT ID
+
+        Returns:
+            토큰 소유자 user_id, 토큰이 없으면 None
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        script = await self._get_script("revoke_token")
+        return await script(
+            keys=[refresh_token_key(jti)],
+            args=[jti, USER_TOKENS_PREFIX, settings.SESSION_EVENTS_CHANNEL],
+        )
+
+    async def revoke_user(self, user_id: str) -> int:
+        """
+        사용자의 모든 Refresh Token을 무효화합니다 (1 round trip).
+
+        Args:
+            user_id: 사용자 ID
+
+        Returns:
+            무효화된 토큰 수
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        script = await self._get_script("revoke_user")
+        return await script(
+            keys=[user_tokens_key(user_id)],
+            args=[REFRESH_TOKEN_PREFIX, user_id, settings.SESSION_EVENTS_CHANNEL],
+        )
+
+    async def revoke_users(self, user_ids: Iterable[str], chunk_size: int = 500) -> RevocationResult:
+        """
+        여러 사용자의 세션을 일괄 무효화합니다.
+
+        chunk_size명 단위로 revoke_user 스크립트를 파이프라인에 담아 전송하므로
+        chunk당 1 round trip이며, 메모리 사용량은 chunk 크기로 제한됩니다.
+        user_ids는 제너레이터여도 됩니다.
+
+        Args:
+            user_ids: 사용자 ID 목록
+            chunk_size: 한 번의 파이프라인에 담을 사용자 수
+
+        Returns:
+            무효화된 사용자 수와 토큰 수
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        result = RevocationResult()
+        chunk: List[str] = []
+
+        for user_id in user_ids:
+            chunk.append(user_tokens_key(user_id))
+            if len(chunk) >= chunk_size:
+                result.add(await self._revoke_user_keys(chunk))
+                chunk = []
+
+        if chunk:
+            result.add(await self._revoke_user_keys(chunk))
+
+        return result
+
+    async def revoke_all(self, chunk_size: int = 500) -> RevocationResult:
+        """
+        모든 사용자의 세션을 무효화합니다 (정책 변경, 보안 사고 대응).
+
+        SCAN으로 user_tokens:* 키를 chunk_size개씩 순회하며 무효화하므로
+        전체 키 목록을 메모리에 올리지 않습니다.
+
+        Args:
+            chunk_size: SCAN COUNT 및 파이프라인 크기
+
+        Returns:
+            무효화된 사용자 수와 토큰 수
+
+        Raises:
+            RedisError: Redis 연결 실패
+        """
+        result = RevocationResult()
+
+        async for chunk in self._scan_user_token_keys(chunk_size):
+            result.add(await self._revoke_user_keys(chunk))
+
+        return result
+
+    async def _scan_user_token_keys(self, chunk_size: int) -> AsyncIterator[List[str]]:
+        redis = await get_redis_client()
+        chunk: List[str] = []
+
+        async for key in redis.scan_iter(match=f"{USER_TOKENS_PREFIX}*", count=chunk_size):
+            chunk.append(key)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    async def _revoke_user_keys(self, keys: Sequence[str]) -> RevocationResult:
+        counts = await self._evalsha_many(
+            "revoke_user",
+            [
+                ([key], [REFRESH_TOKEN_PREFIX, key[len(USER_TOKENS_PREFIX):], settings.SESSION_EVENTS_CHANNEL])
+                for key in keys
+            ],
+        )
+
+        revoked = [count for count in counts if count]
+        return RevocationResult(users=len(revoked), tokens=sum(revoked))
+
+    async def _evalsha_many(self, name: str, calls: Sequence[Tuple[List, List]]) -> List:
+        """
+        같은 스크립트를 파이프라인으로 여러 번 실행합니다 (1 round trip).
+
+        스크립트 캐시가 비워져 NOSCRIPT가 발생한 호출만 다시 로드 후 재시도합니다.
+        (스크립트는 모두 멱등이므로 재시도해도 안전합니다)
+        """
+        script = await self._get_script(name)
+        results: List = [None] * len(calls)
+        pending = list(range(len(calls)))
+
+        for attempt in range(2):
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for i in pending:
+                    keys, args = calls[i]
+                    pipe.evalsha(script.sha, len(keys), *keys, *args)
+                replies = await pipe.execute(raise_on_error=False)
+
+            retry = []
+            for i, reply in zip(pending, replies):
+                if isinstance(reply, NoScriptError) and attempt == 0:
+                    retry.append(i)
+                elif isinstance(reply, Exception):
+                    raise reply
+                else:
+                    results[i] = reply
+
+            if not retry:
+                break
+
+            script.sha = await self._redis.script_load(script.script)
+            pending = retry
+
+        return results
+
+
+session_store = SessionStore()
@@ -1,19 +1,26 @@
+import asyncio
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from uuid import uuid4
 
 import jwt
 
 from commons.logger import get_marigold_logger
+from commons.rate_limiter import RateLimiter
 from commons.settings import settings
 from commons.validate_jwt import JWTValidator
 from databases.redis_client import get_redis_client
 from exceptions.auth_exceptions import TokenRevokedException, InvalidTokenException, InvalidTokenTypeException, \
-    RedisConnectionException
+    RedisConnectionException, NoActiveSessionException, TokenReuseDetectedException
+from repositories.session_store import RevocationResult, session_store
 
 logger = get_marigold_logger(__name__)
 validator = JWTValidator()
 
+# 사용자별 한도가 작으므로 lease 없이 매번 Redis에서 차감 (거절 시에는 로컬에서 바로 거절)
+login_rate_limiter = RateLimiter("login", rate=settings.LOGIN_RATE_PER_MINUTE, period=60, lease_size=1)
+refresh_rate_limiter = RateLimiter("refresh", rate=settings.REFRESH_RATE_PER_MINUTE, period=60, lease_size=1)
+
 
 async def create_tokens(user_id: str) -> Tuple[str, str]:
     """
@@ -25,9 +32,14 @@ async def create_tokens(user_id: str) -> Tuple[str, str]:
     Returns:
         (access_token, refresh_token) 튜플
 
+    Raises:
+        RateLimitExceededException: 사용자별 발급 한도 초과
+
     Example:
         access, refresh = await create_tokens("user_123")
     """
+    await login_rate_limiter.check(user_id)
+
     access_token = await create_access_token(user_id)
     refresh_token = await create_refresh_token(user_id)
 
@@ -60,16 +72,8 @@ async def create_access_token(user_id: str) -> str:
     return token
 
 
-async def create_refresh_token(user_id: str) -> str:
-    """
-    Refresh Token을 생성합니다 (JTI 포함).
-
-    Args:
-        user_id: 사용자 ID
-
-    Returns:
-        JWT Refresh Token
-    """
+def _encode_refresh_token(user_id: str) -> Tuple[str, str]:
+    """Refresh Token을 서명합니다. (저장하지 않음)"""
     now = datetime.now()
     exp = now + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
     jti = str(uuid4())
@@ -84,10 +88,31 @@ async def create_refresh_token(user_id: str) -> str:
     }
 
     token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return token, jti
 
-    # Redis에 저장 및 기기 제한 적용
-    await store_refresh_token(jti, user_id)
-    await enforce_device_limit(user_id, jti)
+
+async def create_refresh_token(user_id: str) -> str:
+    """
+    Refresh Token을 생성합니다 (JTI 포함).
+
+    Args:
+        user_id: 사용자 ID
+
+    Returns:
+        JWT Refresh Token
+    """
+    token, jti = _encode_refresh_token(user_id)
+
+    # Redis에 저장 및 기기 제한 적용 (Lua 스크립트, 1 round trip)
+    try:
+        evicted = await session_store.issue(jti, user_id)
+
+    except Exception as e:
+        logger.error(f"Failed to issue refresh token: {e}")
+        raise RedisConnectionException(str(e))
+
+    for oldest_jti in evicted:
+        logger.info(f"Removed oldest token due to device limit: {oldest_jti}")
 
     return token
 
@@ -95,6 +120,10 @@ async def store_refresh_token(jti: str, user_id: str) -> None:
     """
     Refresh Token을 Redis에 저장합니다.
 
+    Note:
+        create_refresh_token은 session_store.issue를 사용합니다.
+        이 함수는 단계별 저장이 필요한 경우와 벤치마크 비교용으로 남겨둡니다.
+
     Args:
         jti: JWT ID
         user_id: 사용자 ID
@@ -131,65 +160,101 @@ async def revoke_refresh_token(jti: str) -> None:
         RedisConnectionException: Redis 연결 실패
     """
     try:
-        redis = await get_redis_client()
+        user_id = await session_store.revoke_token(jti)
 
-        # user_id 가져오기
-        user_id = await redis.get(f"refresh_token:{jti}")
+    except Exception as e:
+        logger.error(f"Failed to revoke refresh token: {e}")
+        raise RedisConnectionException(str(e))
 
-        if user_id:
-            # refresh_token 삭제
-            await redis.delete(f"refresh_token:{jti}")
+    if user_id:
+        logger.info(f"Revoked refresh token: {jti} for user: {user_id}")
+    else:
+        logger.warning(f"Attempted to revoke non-existent token: {jti}")
 
-            # user_tokens에서 제거
-            await redis.zrem(f"user_tokens:{user_id}", jti)
 
-            logger.info(f"Revoked refresh token: {jti} for user: {user_id}")
-        else:
-            logger.warning(f"Attempted to revoke non-existent token: {jti}")
+async def revoke_all_user_tokens(user_id: str) -> int:
+    """
+    사용자의 모든 Refresh Token을 무효화합니다 (전체 로그아웃).
+
+    Args:
+        user_id: 사용자 ID
+
+    Returns:
+        무효화된 토큰 수
+
+    Raises:
+        RedisConnectionException: Redis 연결 실패
+    """
+    try:
+        count = await session_store.revoke_user(user_id)
 
     except Exception as e:
-        logger.error(f"Failed to revoke refresh token: {e}")
+        logger.error(f"Failed to revoke all user tokens: {e}")
         raise RedisConnectionException(str(e))
 
+    if count:
+        logger.info(f"Revoked all tokens ({count}) for user: {user_id}")
+    else:
+        logger.warning(f"No tokens found for user: {user_id}")
+
+    return count
 
-async def revoke_all_user_tokens(user_id: str) -> None:
+
+async def revoke_users_tokens(user_ids: Iterable[str], chunk_size: int = 500) -> RevocationResult:
     """
-    사용자의 모든 Refresh Token을 무효화합니다 (전체 로그아웃).
+    여러 사용자의 모든 Refresh Token을 일괄 무효화합니다.
 
     Args:
-        user_id: 사용자 ID
+        user_ids: 사용자 ID 목록 (제너레이터 가능)
+        chunk_size: 파이프라인 한 번에 처리할 사용자 수
+
+    Returns:
+        무효화된 사용자 수와 토큰 수
 
     Raises:
         RedisConnectionException: Redis 연결 실패
     """
     try:
-        redis = await get_redis_client()
+        result = await session_store.revoke_users(user_ids, chunk_size=chunk_size)
+
+    except Exception as e:
+        logger.error(f"Failed to revoke users tokens: {e}")
+        raise RedisConnectionException(str(e))
+
+    logger.info(f"Revoked {result.tokens} tokens for {result.users} users")
+    return result
 
-        # 모든 JTI 가져오기
-        jtis = await redis.zrange(f"user_tokens:{user_id}", 0, -1)
 
-        if jtis:
-            # 각 refresh_token 삭제
-            for jti in jtis:
-                await redis.delete(f"refresh_token:{jti}")
+async def revoke_every_user_tokens(chunk_size: int = 500) -> RevocationResult:
+    """
+    모든 사용자의 Refresh Token을 무효화합니다 (비밀번호 정책 변경, 보안 사고 대응).
 
-            # user_tokens 삭제
-            await redis.delete(f"user_tokens:{user_id}")
+    Args:
+        chunk_size: SCAN/파이프라인 한 번에 처리할 사용자 수
 
-            logger.info(f"Revoked all tokens ({len(jtis)}) for user: {user_id}")
-        else:
-            logger.warning(f"No tokens found for user: {user_id}")
+    Returns:
+        무효화된 사용자 수와 토큰 수
+
+    Raises:
+        RedisConnectionException: Redis 연결 실패
+    """
+    try:
+        result = await session_store.revoke_all(chunk_size=chunk_size)
 
     except Exception as e:
-        logger.error(f"Failed to revoke all user tokens: {e}")
+        logger.error(f"Failed to revoke every user tokens: {e}")
         raise RedisConnectionException(str(e))
 
+    logger.warning(f"Revoked every session: {result.tokens} tokens for {result.users} users")
+    return result
+
 
 async def enforce_device_limit(user_id: str, new_jti: str) -> None:
     """
     3개 기기 제한을 적용합니다.
 
     최대 기기 수를 초과하면 가장 오래된 토큰을 자동으로 제거합니다.
+    (create_refresh_token은 session_store.issue에서 원자적으로 처리합니다)
 
     Args:
         user_id: 사용자 ID
@@ -233,23 +298,37 @@ async def enforce_device_limit(user_id: str, new_jti: str) -> None:
 
 # ==================== 토큰 갱신 ====================
 
-async def refresh_access_token(refresh_token: str) -> str:
+# 같은 JTI에 대한 동시 갱신 요청이 결과를 공유하도록 진행 중인 작업을 보관 (프로세스 단위)
+_inflight_refreshes: Dict[Tuple[str, bool], asyncio.Task] = {}
+
+
+async def refresh_tokens(
+        refresh_token: str,
+        rotate: bool = settings.REFRESH_TOKEN_ROTATION
+) -> Tuple[str, Optional[str]]:
     """
-    Refresh Token으로 새로운 Access Token을 발급합니다.
+    Refresh Token으로 새로운 Access Token을 발급하고, rotate이면 Refresh Token도 교체합니다.
+
+    JTI 확인과 세션 확인(및 교체)을 스크립트 하나로 처리하므로 Redis 왕복은 1회이며,
+    같은 JTI로 동시에 들어온 요청은 하나의 결과를 공유합니다.
 
     Args:
         refresh_token: Refresh Token
+        rotate: Refresh Token 교체 여부
 
     Returns:
-        새로운 Access Token
+        (access_token, new_refresh_token) 튜플 - 교체하지 않았으면 new_refresh_token은 None
 
     Raises:
         InvalidTokenException: 토큰 검증 실패
         InvalidTokenTypeException: Refresh Token이 아님
         TokenRevokedException: 로그아웃된 토큰
+        NoActiveSessionException: 세션 목록에 없는 토큰
+        TokenReuseDetectedException: 이미 교체된 토큰 재사용 (사용자 세션 전체 무효화됨)
+        RateLimitExceededException: 사용자별 갱신 한도 초과
     """
-    # Refresh Token 검증
-    payload = await validator._validate_jwt(refresh_token)
+    # 서명/만료만 검증 (세션 확인은 refresh 스크립트에서 함께 처리)
+    payload = await validator._validate_jwt(refresh_token, check_session=False)
 
     # type 확인
     if payload.get("type") != "refresh":
@@ -260,22 +339,63 @@ async def refresh_access_token(refresh_token: str) -> str:
     if not jti:
         raise InvalidTokenException("Missing jti in refresh token")
 
-    # Redis에서 존재 여부 확인 (로그아웃 확인)
-    try:
-        redis = await get_redis_client()
-        user_id = await redis.get(f"refresh_token:{jti}")
+    key = (jti, rotate)
+    task = _inflight_refreshes.get(key)
+    if task is None:
+        task = asyncio.create_task(_refresh(jti, payload.get("userId"), rotate))
+        _inflight_refreshes[key] = task
+        task.add_done_callback(lambda _: _inflight_refreshes.pop(key, None))
 
-        if not user_id:
-            raise TokenRevokedException("Refresh token has been revoked")
+    # 한 요청이 취소되어도 공유 작업은 계속 진행
+    return await asyncio.shield(task)
 
-        # 새로운 Access Token 생성
-        new_access_token = await create_access_token(user_id)
 
-        logger.info(f"Refreshed access token for user: {user_id}")
-        return new_access_token
+async def _refresh(jti: str, claimed_user_id: Optional[str], rotate: bool) -> Tuple[str, Optional[str]]:
+    await refresh_rate_limiter.check(claimed_user_id or jti)
 
-    except TokenRevokedException:
-        raise
+    new_refresh_token, new_jti = _encode_refresh_token(claimed_user_id) if rotate else (None, None)
+
+    try:
+        status, user_id = await session_store.refresh(jti, new_jti)
     except Exception as e:
         logger.error(f"Failed to refresh access token: {e}")
-        raise RedisConnectionException(str(e))
\ No newline at end of file
+        raise RedisConnectionException(str(e))
+
+    if status == "revoked":
+        raise TokenRevokedException("Refresh token has been revoked")
+    if status == "no_session":
+        raise NoActiveSessionException()
+    if status == "reused":
+        logger.warning(f"Refresh token reuse detected, revoked all sessions for user: {user_id}")
+        raise TokenReuseDetectedException()
+
+    # 새로운 Access Token 생성
+    new_access_token = await create_access_token(user_id)
+
+    if status != "rotated":
+        new_refresh_token = None
+
+    logger.info(f"Refreshed access token for user: {user_id} ({status})")
+    return new_access_token, new_refresh_token
+
+
+async def refresh_access_token(refresh_token: str) -> str:
+    """
+    Refresh Token으로 새로운 Access Token을 발급합니다. (Refresh Token은 교체하지 않음)
+
+    Args:
+        refresh_token: Refresh Token
+
+    Returns:
+        새로운 Access Token
+
+    Raises:
+        InvalidTokenException: 토큰 검증 실패
+        InvalidTokenTypeException: Refresh Token이 아님
+        TokenRevokedException: 로그아웃된 토큰
+        NoActiveSessionException: 세션 목록에 없는 토큰
+        TokenReuseDetectedException: 이미 교체된 토큰 재사용
+        RateLimitExceededException: 사용자별 갱신 한도 초과
+    """
+    access_token, _ = await refresh_tokens(refresh_token, rotate=False)
+    return access_token
@@ -1,2 +1,16 @@
+from commons.app_factory import create_app
+from commons.settings import settings
+from models.event import Event
+
+app = create_app(
+    "calendar",
+    db_name=settings.CALENDAR_DB_NAME,
+    models=[Event],
+    use_session_view=True,
+)
+
+
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
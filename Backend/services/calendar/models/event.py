@@ -0,0 +1,50 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+
+
+class Frequency(str, Enum):
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+
+
+class RecurrenceRule(BaseModel):
+    """반복 규칙 (RFC 5545 RRULE의 부분 집합)"""
+    freq: Frequency
+    interval: int = Field(default=1, ge=1)
+    count: Optional[int] = Field(default=None, ge=1)  # 총 발생 횟수
+    until: Optional[datetime] = None  # 이 시각 이후 발생 없음 (포함)
+    by_weekday: List[int] = Field(default_factory=list)  # WEEKLY 전용, 0=월 ... 6=일
+
+
+class Event(Document):
+    """일정 (recurrence가 있으면 start/end는 첫 발생)"""
+    user_id: str  # 소유자
+    title: str
+    start: datetime
+    end: datetime
+    participants: List[str] = Field(default_factory=list)
+    recurrence: Optional[RecurrenceRule] = None
+
+    class Settings:
+        name = "events"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("start", ASCENDING)]),
+            IndexModel([("participants", ASCENDING), ("start", ASCENDING)]),
+        ]
+
+
+class EventTime(BaseModel):
+    """조회 엔진용 projection (본문 등 나머지 필드는 읽지 않음)"""
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: str
+    title: str
+    start: datetime
+    end: datetime
+    participants: List[str] = Field(default_factory=list)
+    recurrence: Optional[RecurrenceRule] = None
@@ -0,0 +1,152 @@
+"""
+Calendar Query Service
+
+사용자별 일정 시간 정보(EventTime projection)를 한 번 읽어
+- 단일 일정: IntervalIndex
+- 반복 일정: 요청 구간에서만 lazy 전개
+로 구성한 UserCalendar를 CALENDAR_INDEX_TTL_SECONDS 동안 캐시합니다.
+여러 사용자의 캘린더가 필요하면 캐시에 없는 사용자를 모아 MongoDB $in 쿼리 한 번으로 읽습니다.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from databases.base_repository import BaseRepository
+from models.event import Event, EventTime
+from services.freebusy import Busy, common_free_slots
+from services.interval_index import IntervalIndex
+from services.recurrence import occurrences
+
+
+@dataclass
+class Occurrence:
+    event_id: str
+    title: str
+    start: datetime
+    end: datetime
+
+
+class UserCalendar:
+    def __init__(self, events: List[EventTime]):
+        self.single = [event for event in events if event.recurrence is None]
+        self.recurring = [event for event in events if event.recurrence is not None]
+        self._starts = np.array([int(event.start.timestamp()) for event in self.single], dtype=np.int64)
+        self._ends = np.array([int(event.end.timestamp()) for event in self.single], dtype=np.int64)
+        self.index = IntervalIndex(self._starts, self._ends)
+
+    def between(self, start: datetime, end: datetime) -> Iterator[Occurrence]:
+        """구간과 겹치는 발생을 반환합니다 (단일 일정은 시작 순, 반복 일정은 그 뒤)."""
+        for position in self.index.overlapping(int(start.timestamp()), int(end.timestamp())):
+            event = self.single[position]
+            yield Occurrence(str(event.id), event.title, event.start, event.end)
+
+        for event in self.recurring:
+            length = event.end - event.start
+            # 구간 시작 전에 시작했지만 걸쳐 있는 발생도 포함
+            for occurrence in occurrences(event.start, event.recurrence, start - length, end):
+                if occurrence + length > start:
+                    yield Occurrence(str(event.id), event.title, occurrence, occurrence + length)
+
+    def busy(self, start: datetime, end: datetime) -> Busy:
+        """구간 내 바쁜 구간 (starts, ends) epoch seconds 배열"""
+        window_start, window_end = int(start.timestamp()), int(end.timestamp())
+        positions = self.index.overlapping(window_start, window_end)
+        starts = [self._starts[positions]]
+        ends = [self._ends[positions]]
+
+        for event in self.recurring:
+            length = event.end - event.start
+            seconds = int(length.total_seconds())
+            occurrence_starts = np.fromiter(
+                (int(o.timestamp()) for o in occurrences(event.start, event.recurrence, start - length, end)),
+                dtype=np.int64
+            )
+            starts.append(occurrence_starts)
+            ends.append(occurrence_starts + seconds)
+
+        return np.concatenate(starts), np.concatenate(ends)
+
+
+class CalendarQueryService:
+    def __init__(self):
+        self.repository = BaseRepository(Event)
+        self._calendars: TTLCache[str, UserCalendar] = TTLCache(
+            settings.CALENDAR_INDEX_MAX_USERS,
+            default_ttl=settings.CALENDAR_INDEX_TTL_SECONDS
+        )
+
+    def invalidate(self, *user_ids: str) -> None:
+        """일정 변경 시 호출 (이 프로세스의 캐시만 비움, 다른 replica는 TTL 후 반영)"""
+        for user_id in user_ids:
+            self._calendars.delete(user_id)
+
+    async def calendars(self, user_ids: Sequence[str]) -> Dict[str, UserCalendar]:
+        """사용자별 캘린더 (캐시 miss 사용자는 쿼리 한 번으로 로드)"""
+        result: Dict[str, UserCalendar] = {}
+        missing = []
+
+        for user_id in dict.fromkeys(user_ids):
+            calendar = self._calendars.get(user_id)
+            if calendar is None:
+                missing.append(user_id)
+            else:
+                result[user_id] = calendar
+
+        if missing:
+            loaded: Dict[str, List[EventTime]] = {user_id: [] for user_id in missing}
+            wanted = set(missing)
+
+            async for event in self.repository.stream(
+                    {"$or": [{"user_id": {"$in": missing}}, {"participants": {"$in": missing}}]},
+                    projection=EventTime,
+                    batch_size=1000
+            ):
+                for user_id in wanted.intersection([event.user_id, *event.participants]):
+                    loaded[user_id].append(event)
+
+            for user_id, events in loaded.items():
+                calendar = UserCalendar(events)
+                self._calendars.set(user_id, calendar)
+                result[user_id] = calendar
+
+        return result
+
+    async def events_between(self, user_id: str, start: datetime, end: datetime) -> List[Occurrence]:
+        calendar = (await self.calendars([user_id]))[user_id]
+        return sorted(calendar.between(start, end), key=lambda o: o.start)
+
+    async def find_common_free_slots(
+            self,
+            user_ids: Sequence[str],
+            start: datetime,
+            end: datetime,
+            duration: timedelta,
+            granularity: timedelta = timedelta(minutes=5),
+            limit: int = 10
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        모든 참석자가 비어 있는 duration 이상의 구간을 찾습니다.
+
+        Returns:
+            [(시작, 끝), ...] 빈 구간 (앞에서부터 최대 limit개)
+        """
+        calendars = await self.calendars(user_ids)
+        busy = [calendar.busy(start, end) for calendar in calendars.values()]
+
+        slots = common_free_slots(
+            busy,
+            int(start.timestamp()),
+            int(end.timestamp()),
+            int(duration.total_seconds()),
+            granularity=int(granularity.total_seconds()),
+            limit=limit
+        )
+        return [(datetime.fromtimestamp(s), datetime.fromtimestamp(e)) for s, e in slots]
+
+
+calendar_query_service = CalendarQueryService()
@@ -0,0 +1,76 @@
+"""
+Free/Busy 계산
+
+여러 참석자의 바쁜 구간을 granularity 단위 격자로 옮겨, 차분 배열 + 누적합으로
+"한 명이라도 바쁜 칸"을 한 번에 계산합니다. 참석자 수와 일정 수에 대해 반복문 없이 동작합니다.
+(예: 50명, 3개월, 5분 단위 → 약 26,000칸)
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+Busy = Tuple[np.ndarray, np.ndarray]  # (starts, ends) epoch seconds
+
+
+def busy_mask(busy: Sequence[Busy], window_start: int, window_end: int, granularity: int) -> np.ndarray:
+    """
+    칸별 바쁨 여부를 반환합니다. 구간이 칸에 조금이라도 걸치면 바쁨으로 봅니다.
+
+    Returns:
+        (칸 수,) bool 배열
+    """
+    slots = -(-(window_end - window_start) // granularity)
+    if not busy:
+        return np.zeros(slots, dtype=bool)
+
+    starts = np.concatenate([np.asarray(s, dtype=np.int64) for s, _ in busy])
+    ends = np.concatenate([np.asarray(e, dtype=np.int64) for _, e in busy])
+
+    first = np.clip((starts - window_start) // granularity, 0, slots)
+    last = np.clip(-(-(ends - window_start) // granularity), 0, slots)
+    valid = first < last
+
+    diff = np.zeros(slots + 1, dtype=np.int32)
+    np.add.at(diff, first[valid], 1)
+    np.add.at(diff, last[valid], -1)
+
+    return np.cumsum(diff[:-1]) > 0
+
+
+def common_free_slots(
+        busy: Sequence[Busy],
+        window_start: int,
+        window_end: int,
+        duration: int,
+        granularity: int = 300,
+        limit: int = 10
+) -> List[Tuple[int, int]]:
+    """
+    모든 참석자가 비어 있는 구간 중 duration 이상인 것을 앞에서부터 반환합니다.
+
+    Args:
+        busy: 참석자별 (starts, ends)
+        window_start: 탐색 시작 (epoch seconds)
+        window_end: 탐색 끝 (epoch seconds)
+        duration: 필요한 길이 (초)
+        granularity: 격자 크기 (초)
+        limit: 최대 결과 수
+
+    Returns:
+        [(시작, 끝), ...] 빈 구간 전체 (epoch seconds)
+    """
+    free = ~busy_mask(busy, window_start, window_end, granularity)
+
+    # free 구간 경계: 0→1 이 시작, 1→0 이 끝
+    edges = np.diff(np.concatenate(([0], free.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    need = -(-duration // granularity)
+    long_enough = (run_ends - run_starts) >= need
+
+    return [
+        (window_start + int(s) * granularity, min(window_end, window_start + int(e) * granularity))
+        for s, e in zip(run_starts[long_enough][:limit], run_ends[long_enough][:limit])
+    ]
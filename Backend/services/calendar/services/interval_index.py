@@ -0,0 +1,46 @@
+"""
+Interval Index
+
+[start, end) 구간들에 대한 겹침 질의 인덱스입니다.
+start 기준으로 정렬하고 end의 누적 최댓값(prefix max)을 유지하면
+    - start < b 인 마지막 위치: starts에서 이분 탐색
+    - end > a 가 가능한 첫 위치: prefix max(단조 증가)에서 이분 탐색
+으로 후보 범위를 좁힌 뒤 그 안에서만 벡터 연산으로 end > a를 거릅니다.
+시각은 epoch seconds(int64)로 다룹니다.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+
+class IntervalIndex:
+    def __init__(self, starts: Sequence[int], ends: Sequence[int]):
+        """
+        Args:
+            starts: 구간 시작 (epoch seconds)
+            ends: 구간 끝 (epoch seconds, 미포함)
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+
+        # positions[i]: 정렬 후 i번째 구간의 원래 위치
+        self.positions = np.argsort(starts, kind="stable")
+        self.starts = starts[self.positions]
+        self.ends = ends[self.positions]
+        self._max_end = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        """
+        [start, end)와 겹치는 구간들의 원래 위치를 시작 시각 순으로 반환합니다.
+        """
+        hi = np.searchsorted(self.starts, end, side="left")
+        lo = np.searchsorted(self._max_end, start, side="right")
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+
+        matched = np.flatnonzero(self.ends[lo:hi] > start) + lo
+        return self.positions[matched]
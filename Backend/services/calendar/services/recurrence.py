@@ -0,0 +1,128 @@
+"""
+반복 일정 전개
+
+RecurrenceRule의 발생 시각을 요청한 구간에 대해서만 generator로 만들어 냅니다.
+COUNT가 없는 DAILY/WEEKLY 규칙은 구간 시작 근처의 주기로 바로 건너뛰므로,
+오래된 반복 일정도 첫 발생부터 순회하지 않습니다.
+"""
+
+import calendar
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from models.event import Frequency, RecurrenceRule
+
+
+def occurrences(
+        first: datetime,
+        rule: RecurrenceRule,
+        window_start: datetime,
+        window_end: datetime
+) -> Iterator[datetime]:
+    """
+    window_start <= 발생 시각 < window_end 인 발생 시각을 순서대로 반환합니다.
+
+    일정 길이만큼 앞에서 시작한 발생도 포함하려면 window_start에서 길이를 빼서 호출합니다.
+
+    Args:
+        first: 첫 발생 시각 (Event.start)
+        rule: 반복 규칙
+        window_start: 구간 시작
+        window_end: 구간 끝 (미포함)
+    """
+    if rule.until is not None and rule.until < window_end:
+        window_end = rule.until + timedelta(microseconds=1)
+
+    if rule.freq == Frequency.MONTHLY:
+        yield from _monthly(first, rule, window_start, window_end)
+    elif rule.freq == Frequency.WEEKLY and rule.by_weekday:
+        yield from _weekly_by_day(first, rule, window_start, window_end)
+    else:
+        days = rule.interval * (7 if rule.freq == Frequency.WEEKLY else 1)
+        yield from _fixed_step(first, timedelta(days=days), rule.count, window_start, window_end)
+
+
+def _fixed_step(
+        first: datetime,
+        step: timedelta,
+        count: int,
+        window_start: datetime,
+        window_end: datetime
+) -> Iterator[datetime]:
+    # k번째 발생 = first + k * step 이므로 구간 시작 주기로 바로 이동
+    k = max(0, (window_start - first) // step)
+
+    while count is None or k < count:
+        occurrence = first + k * step
+        if occurrence >= window_end:
+            return
+        if occurrence >= window_start:
+            yield occurrence
+        k += 1
+
+
+def _weekly_by_day(
+        first: datetime,
+        rule: RecurrenceRule,
+        window_start: datetime,
+        window_end: datetime
+) -> Iterator[datetime]:
+    days = sorted(set(rule.by_weekday))
+    anchor = first - timedelta(days=first.weekday())  # 첫 주의 월요일 (시각은 first와 동일)
+    period = timedelta(weeks=rule.interval)
+
+    # 첫 주에는 first 이전 요일이 빠지므로 발생 순번 계산 시 보정
+    first_week = sum(1 for day in days if anchor + timedelta(days=day) >= first)
+
+    p = max(0, (window_start - anchor) // period)
+    while True:
+        week_start = anchor + p * period
+        if week_start >= window_end:
+            return
+
+        for position, day in enumerate(days):
+            occurrence = week_start + timedelta(days=day)
+            if occurrence < first:
+                continue
+
+            if rule.count is not None:
+                index = position - (len(days) - first_week) if p == 0 else first_week + (p - 1) * len(days) + position
+                if index >= rule.count:
+                    return
+
+            if occurrence >= window_end:
+                return
+            if occurrence >= window_start:
+                yield occurrence
+
+        p += 1
+
+
+def _monthly(
+        first: datetime,
+        rule: RecurrenceRule,
+        window_start: datetime,
+        window_end: datetime
+) -> Iterator[datetime]:
+    # 해당 일이 없는 달(예: 31일)은 건너뜀 → COUNT가 있으면 처음부터 세어야 함
+    month = 0
+    if rule.count is None:
+        months_until_window = (window_start.year - first.year) * 12 + window_start.month - first.month
+        month = max(0, months_until_window // rule.interval * rule.interval)
+
+    emitted = 0
+    while rule.count is None or emitted < rule.count:
+        year, month_index = divmod(first.month - 1 + month, 12)
+        year += first.year
+        month += rule.interval
+
+        if first.day > calendar.monthrange(year, month_index + 1)[1]:
+            continue
+
+        occurrence = first.replace(year=year, month=month_index + 1)
+        if occurrence >= window_end:
+            return
+
+        emitted += 1
+        if occurrence >= window_start:
+            yield occurrence
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Header, HTTPException, Query
+from pydantic import BaseModel
+
+from commons.validate_jwt import JWTValidator
+from models.message import ChatMessage
+from services.history_service import history_service
+
+validator = JWTValidator()
+
+router = APIRouter()
+
+
+class HistoryPage(BaseModel):
+    messages: List[ChatMessage]
+    next_cursor: Optional[str]
+
+
+@router.get("/rooms/{room_id}/messages", response_model=HistoryPage)
+async def get_history(
+        room_id: str,
+        before: Optional[str] = Query(default=None, description="이전 응답의 next_cursor"),
+        limit: int = Query(default=50, ge=1, le=200),
+        authorization: str = Header(default=None)
+):
+    """
+    채팅 이력 조회 (최신순, 커서 페이지네이션)
+
+    첫 페이지(before 없음)는 Redis 최신 메시지 캐시에서 응답합니다.
+    """
+    await validator.verify_jwt_http(authorization)
+
+    if before is not None:
+        if not ObjectId.is_valid(before):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        before = str(ObjectId(before))
+
+    messages, next_cursor = await history_service.page(room_id, before=before, limit=limit)
+    return HistoryPage(messages=messages, next_cursor=next_cursor)
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import orjson
+from bson import ObjectId
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from commons.validate_jwt import JWTValidator
+from services.activity_aggregator import activity_aggregator
+from services.connection_hub import connection_hub
+from services.history_service import history_service
+from services.presence_service import presence_service
+from services.read_receipt_service import is_valid_room_id, read_receipt_service
+
+logger = get_marigold_logger(__name__)
+validator = JWTValidator()
+
+router = APIRouter()
+
+CONTROL_TYPES = {"typing", "read"}
+
+
+def parse_control(text: str) -> Optional[dict]:
+    """제어 프레임({"type": "typing"} / {"type": "read", "messageId": ...})이면 dict, 아니면 None"""
+    if not text.startswith("{"):
+        return None
+    try:
+        frame = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+    if isinstance(frame, dict) and frame.get("type") in CONTROL_TYPES:
+        return frame
+    return None
+
+
+def parse_message_id(value: object) -> Optional[str]:
+    """클라이언트가 보낸 messageId를 정규화된 ObjectId 문자열로, 유효하지 않으면 None"""
+    if not isinstance(value, str) or not ObjectId.is_valid(value):
+        return None
+    return str(ObjectId(value))
+
+
+async def is_readable(room_id: str, message_id: str) -> bool:
+    """
+    임의의 값이 high-water mark를 실제 메시지보다 앞질러 고정하지 않는지 확인합니다.
+
+    읽음 이벤트마다 MongoDB를 조회하지 않도록
+    - 생성 시각이 미래(허용 오차 초과)인 id는 바로 거부하고
+    - 방의 최신 메시지(Redis 캐시) 이하이면 허용하며
+    - 최신 메시지를 앞서는 id만 MongoDB에서 존재 여부를 확인합니다.
+    """
+    skew = timedelta(seconds=settings.CHAT_READ_MAX_CLOCK_SKEW_SECONDS)
+    if ObjectId(message_id).generation_time > datetime.now(timezone.utc) + skew:
+        return False
+
+    latest = await history_service.latest_id(room_id)
+    if latest is not None and message_id <= latest:
+        return True
+
+    return await history_service.exists(room_id, message_id)
+
+
+async def handle_read(room_id: str, user_id: str, raw_message_id: object) -> None:
+    """읽음 제어 프레임 처리 (is_readable을 통과한 메시지만 반영)"""
+    message_id = parse_message_id(raw_message_id)
+    if message_id is None or not await is_readable(room_id, message_id):
+        logger.debug(f"Ignored read frame with unknown message id: room={room_id} user={user_id}")
+        return
+
+    if await read_receipt_service.mark_read(room_id, user_id, message_id):
+        activity_aggregator.read(room_id, user_id, message_id)
+
+
+@router.websocket("/ws/rooms/{room_id}")
+async def room_socket(websocket: WebSocket, room_id: str):
+    """
+    채팅방 WebSocket
+
+    클라이언트가 보낸 텍스트 프레임을 저장하고 방의 모든 구독자에게 전달합니다.
+    typing / read 제어 프레임은 저장하지 않고 방별로 모아 activity 프레임으로 전달합니다.
+    토큰은 ?token= 쿼리 파라미터로 전달합니다.
+    """
+    if not is_valid_room_id(room_id):
+        await websocket.close(code=4400, reason="Invalid room id")
+        return
+
+    try:
+        payload = await validator.verify_jwt_websocket(websocket)
+    except Exception:
+        return  # verify_jwt_websocket에서 연결 종료
+
+    await websocket.accept()
+
+    user_id = payload["userId"]
+    connection = connection_hub.connect(websocket, user_id)
+    connection_id = f"{connection_hub.node_id}:{id(connection):x}"
+    connection_hub.join(connection, room_id)
+    await presence_service.register(user_id, connection_id)
+
+    try:
+        while True:
+            body = await websocket.receive_text()
+
+            control = parse_control(body)
+            if control is not None:
+                if control["type"] == "typing":
+                    activity_aggregator.typing(room_id, user_id)
+                else:
+                    await handle_read(room_id, user_id, control.get("messageId"))
+                continue
+
+            message = await history_service.save(room_id, user_id, body)
+            await connection_hub.publish(room_id, {
+                "type": "message",
+                "room": room_id,
+                "id": message.message_id,
+                "sender": user_id,
+                "body": body,
+                "createdAt": message.created_at.isoformat()
+            })
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await presence_service.unregister(user_id, connection_id)
+        await connection_hub.disconnect(connection)
@@ -0,0 +1,157 @@
+"""
+채팅 이력 벤치마크
+
+한 방에 메시지 N개(기본 100만)를 버킷 단위로 적재한 뒤
+- 방 입장(최신 페이지): 캐시 miss(MongoDB) / hit(Redis)
+- 커서 페이지네이션: 여러 깊이에서의 페이지 조회
+- 바쁜 구간: 초당 --busy-rate개(기본 100, 구간 하나에 버킷 수천 개)로 적재한 방의 페이지 조회
+지연 시간을 측정합니다.
+
+실행 (services/chat 디렉토리에서, MONGO_URL / REDIS_URL 사용):
+    python -m benchmarks.bench_history --messages 1000000 --busy-messages 360000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+from bson import ObjectId
+
+from commons.settings import settings
+from databases.mongo_client import close_mongo_clients, init_database
+from databases.redis_client import close_redis_client, get_redis_client
+from models.message import ChatMessage, MessageBucket
+from repositories.message_repository import MessageRepository, bucket_start_of_id
+from services.history_service import HistoryService, recent_key
+
+ROOM_ID = "bench-room"
+BUSY_ROOM_ID = "bench-room-busy"
+
+
+def generate_buckets(room_id: str, count: int, rate: int = 1) -> Iterator[MessageBucket]:
+    """초당 rate개 메시지를 CHAT_BUCKET_SIZE개씩 버킷으로 묶어 생성합니다."""
+    start = datetime.now() - timedelta(seconds=count / rate)
+    bucket: List[ChatMessage] = []
+
+    def flush() -> MessageBucket:
+        return MessageBucket(
+            room_id=room_id,
+            bucket_start=bucket_start_of_id(bucket[0].message_id),
+            first_id=bucket[0].message_id,
+            last_id=bucket[-1].message_id,
+            message_count=len(bucket),
+            messages=bucket
+        )
+
+    for i in range(count):
+        created_at = start + timedelta(seconds=i / rate)
+        message = ChatMessage(
+            message_id=str(ObjectId.from_datetime(created_at))[:18] + f"{i:06x}",
+            sender_id=f"user-{i % 50}",
+            body=f"message {i}",
+            created_at=created_at
+        )
+
+        if bucket and (len(bucket) >= settings.CHAT_BUCKET_SIZE
+                       or bucket_start_of_id(message.message_id) != bucket_start_of_id(bucket[0].message_id)):
+            yield flush()
+            bucket = []
+        bucket.append(message)
+
+    if bucket:
+        yield flush()
+
+
+def report(name: str, samples: List[float]) -> None:
+    samples.sort()
+    print(
+        f"{name:<28} p50={statistics.median(samples) * 1000:>8.3f}ms  "
+        f"p99={samples[max(0, int(len(samples) * 0.99) - 1)] * 1000:>8.3f}ms"
+    )
+
+
+async def timed(samples: List[float], coro) -> object:
+    start = time.perf_counter()
+    result = await coro
+    samples.append(time.perf_counter() - start)
+    return result
+
+
+async def bench_pages(service: HistoryService, room_id: str, messages: int, page_size: int, samples: int,
+                     label: str) -> None:
+    """최신 메시지부터 여러 깊이의 커서로 페이지 조회 지연을 측정합니다."""
+    for depth in (0.1, 0.5, 0.9, 0.999):
+        # 깊이별 커서: 최신 메시지부터 비율 위치의 버킷 last_id
+        skip = int(messages * depth)
+        cursor = None
+        async for bucket in service.repository.stream(
+                {"room_id": room_id},
+                sort=[("bucket_start", -1), ("last_id", -1)]
+        ):
+            skip -= bucket.message_count
+            if skip <= 0:
+                cursor = bucket.last_id
+                break
+
+        timings: List[float] = []
+        for _ in range(samples):
+            await timed(timings, service.page(room_id, before=cursor, limit=page_size))
+        report(f"{label} at depth {depth:.1%}", timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--busy-messages", type=int, default=360_000, help="바쁜 방 메시지 수 (0이면 생략)")
+    parser.add_argument("--busy-rate", type=int, default=100, help="바쁜 방 초당 메시지 수")
+    parser.add_argument("--keep", action="store_true", help="종료 후 데이터 유지")
+    args = parser.parse_args()
+
+    await init_database(settings.MONGO_URL, settings.CHAT_DB_NAME, [MessageBucket])
+    repository = MessageRepository()
+    service = HistoryService(repository)
+    redis = await get_redis_client()
+
+    try:
+        await MessageBucket.find({"room_id": {"$in": [ROOM_ID, BUSY_ROOM_ID]}}).delete()
+        started = time.perf_counter()
+        inserted = await repository.insert_many(generate_buckets(ROOM_ID, args.messages))
+        print(f"loaded {args.messages} messages in {inserted} buckets ({time.perf_counter() - started:.1f}s)")
+
+        cold: List[float] = []
+        warm: List[float] = []
+        for _ in range(args.samples):
+            await redis.delete(recent_key(ROOM_ID))
+            await timed(cold, service.recent(ROOM_ID))
+            await timed(warm, service.recent(ROOM_ID))
+        report("open room (mongo, cold)", cold)
+        report("open room (redis, warm)", warm)
+
+        await bench_pages(service, ROOM_ID, args.messages, args.page_size, args.samples, "page")
+
+        if args.busy_messages:
+            started = time.perf_counter()
+            inserted = await repository.insert_many(
+                generate_buckets(BUSY_ROOM_ID, args.busy_messages, args.busy_rate)
+            )
+            print(
+                f"loaded {args.busy_messages} messages at {args.busy_rate}/s in {inserted} buckets "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+            await bench_pages(service, BUSY_ROOM_ID, args.busy_messages, args.page_size, args.samples, "busy page")
+
+    finally:
+        if not args.keep:
+            await MessageBucket.find({"room_id": {"$in": [ROOM_ID, BUSY_ROOM_ID]}}).delete()
+            await redis.delete(recent_key(ROOM_ID))
+        await close_redis_client()
+        await close_mongo_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+WebSocket fan-out 부하 생성기
+
+여러 방에 다수의 소켓을 연결하고, 방마다 한 소켓이 메시지를 보내
+모든 구독자에게 도착하기까지의 지연(fan-out latency)을 측정합니다.
+송신 시각을 메시지 본문에 넣으므로 같은 머신에서 실행해야 합니다.
+
+실행 (services/chat 디렉토리에서, 채팅 서비스가 떠 있는 상태):
+    python -m benchmarks.ws_fanout_load --url ws://localhost:8000 --rooms 10 --clients 500 --messages 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import jwt
+import orjson
+import websockets
+
+from commons.settings import settings
+
+
+def make_token(user_id: str) -> str:
+    now = datetime.now()
+    payload = {
+        "userId": user_id,
+        "exp": int((now + timedelta(hours=1)).timestamp()),
+        "iat": int(now.timestamp()),
+        "iss": settings.JWT_ISSUER,
+        "type": "access"
+    }
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+async def receiver(url: str, latencies: List[float], expected: int, ready: asyncio.Event, counter: list) -> None:
+    async with websockets.connect(url, max_queue=None) as ws:
+        counter[0] += 1
+        if counter[0] == counter[1]:
+            ready.set()
+
+        received = 0
+        while received < expected:
+            frame = orjson.loads(await ws.recv())
+            messages = frame if isinstance(frame, list) else [frame]
+            now = time.time()
+            for message in messages:
+                latencies.append(now - orjson.loads(message["body"])["sent_at"])
+            received += len(messages)
+
+
+async def sender(url: str, messages: int, interval: float, ready: asyncio.Event) -> None:
+    async with websockets.connect(url) as ws:
+        # 송신자도 방 구독자이므로 수신 프레임을 비워줘야 느린 소켓으로 끊기지 않음
+        drain = asyncio.create_task(_drain(ws))
+        await ready.wait()
+        for _ in range(messages):
+            await ws.send(orjson.dumps({"sent_at": time.time()}).decode())
+            await asyncio.sleep(interval)
+        drain.cancel()
+
+
+async def _drain(ws) -> None:
+    async for _ in ws:
+        pass
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://localhost:8000")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=100, help="방당 수신 소켓 수")
+    parser.add_argument("--messages", type=int, default=100, help="방당 송신 메시지 수")
+    parser.add_argument("--interval", type=float, default=0.01, help="송신 간격(초)")
+    args = parser.parse_args()
+
+    latencies: List[float] = []
+    ready = asyncio.Event()
+    counter = [0, args.rooms * args.clients]
+    tasks = []
+
+    for room in range(args.rooms):
+        room_url = f"{args.url}/ws/rooms/load-{room}"
+        for client in range(args.clients):
+            token = make_token(f"load-{room}-{client}")
+            tasks.append(receiver(f"{room_url}?token={token}", latencies, args.messages, ready, counter))
+
+    senders = [
+        sender(f"{args.url}/ws/rooms/load-{room}?token={make_token(f'sender-{room}')}",
+               args.messages, args.interval, ready)
+        for room in range(args.rooms)
+    ]
+
+    started = time.perf_counter()
+    await asyncio.gather(*tasks, *senders)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"sockets={counter[1]}  delivered={len(latencies)}  elapsed={elapsed:.2f}s")
+    print(
+        f"fan-out latency  p50={statistics.median(latencies) * 1000:.2f}ms  "
+        f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f}ms  "
+        f"max={latencies[-1] * 1000:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,2 +1,50 @@
+from contextlib import asynccontextmanager
+
+from api import history, websocket
+from commons.app_factory import create_app
+from commons.settings import settings
+from models.message import MessageBucket
+from models.read_receipt import ReadReceipt
+from services.activity_aggregator import activity_aggregator
+from services.connection_hub import connection_hub
+from services.presence_service import presence_service
+from services.read_receipt_service import read_receipt_service
+
+
+@asynccontextmanager
+async def connection_hub_lifespan():
+    await connection_hub.start()
+    try:
+        yield
+    finally:
+        await connection_hub.stop()
+
+
+@asynccontextmanager
+async def ephemeral_state_lifespan():
+    await presence_service.start()
+    await read_receipt_service.start()
+    await activity_aggregator.start()
+    try:
+        yield
+    finally:
+        await activity_aggregator.stop()
+        await read_receipt_service.stop()
+        await presence_service.stop()
+
+
+app = create_app(
+    "chat",
+    routers=[websocket.router, history.router],
+    db_name=settings.CHAT_DB_NAME,
+    models=[MessageBucket, ReadReceipt],
+    use_session_view=True,
+    use_profile_client=True,
+    lifespans=[connection_hub_lifespan, ephemeral_state_lifespan],
+)
+
+
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List
+
+from beanie import Document
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+
+class ChatMessage(BaseModel):
+    """채팅 메시지 (MessageBucket에 포함)"""
+    message_id: str  # ObjectId 문자열 (시간순 정렬, 커서로 사용)
+    sender_id: str
+    body: str
+    created_at: datetime
+
+
+class MessageBucket(Document):
+    """
+    방별 시간 구간 메시지 묶음
+
+    한 문서에 최대 CHAT_BUCKET_SIZE개의 메시지를 담습니다.
+    같은 구간의 버킷이 가득 차면 같은 bucket_start로 새 버킷이 생성됩니다.
+
+    bucket_start는 message_id(ObjectId)의 생성 시각으로 정하므로 구간이 다른 버킷끼리는
+    message_id 범위가 겹치지 않습니다. 같은 구간의 버킷끼리는 동시 추가 시 범위가 겹칠 수 있어
+    조회 시 last_id 순으로 읽으며 병합합니다.
+    """
+    room_id: str
+    bucket_start: datetime
+    first_id: str
+    last_id: str
+    message_count: int = 0
+    messages: List[ChatMessage] = Field(default_factory=list)
+
+    class Settings:
+        name = "message_buckets"
+        indexes = [
+            # 추가 대상 버킷 조회 (room_id, bucket_start, 가득 차지 않은 버킷)
+            IndexModel([("room_id", ASCENDING), ("bucket_start", DESCENDING), ("message_count", ASCENDING)]),
+            # 커서 페이지네이션 (bucket_start <= 커서 구간, last_id 최신순, first_id < 커서는 인덱스에서 거름)
+            IndexModel([
+                ("room_id", ASCENDING), ("bucket_start", DESCENDING), ("last_id", DESCENDING), ("first_id", DESCENDING)
+            ]),
+        ]
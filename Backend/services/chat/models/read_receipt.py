@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+
+class ReadReceipt(Document):
+    """
+    사용자별 방 읽음 위치 (high-water mark)
+
+    메시지마다 기록하지 않고 (room_id, user_id)당 마지막으로 읽은 message_id 하나만 유지합니다.
+    Redis가 최신 값을 갖고, 이 컬렉션에는 주기적으로 일괄 반영됩니다.
+    """
+    room_id: str
+    user_id: str
+    last_read_id: str  # ObjectId 문자열 (사전순 = 시간순)
+    updated_at: datetime
+
+    class Settings:
+        name = "read_receipts"
+        indexes = [
+            IndexModel([("room_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        ]
@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+
+from commons.settings import settings
+from databases.base_repository import BaseRepository
+from models.message import ChatMessage, MessageBucket
+
+
+def bucket_start_of(created_at: datetime) -> datetime:
+    """메시지가 속할 시간 구간의 시작 시각"""
+    span = settings.CHAT_BUCKET_SPAN_MINUTES * 60
+    timestamp = int(created_at.timestamp())
+    return datetime.fromtimestamp(timestamp - timestamp % span)
+
+
+def bucket_start_of_id(message_id: str) -> datetime:
+    """message_id(ObjectId)의 생성 시각이 속한 구간의 시작 시각"""
+    return bucket_start_of(ObjectId(message_id).generation_time)
+
+
+class MessageRepository(BaseRepository[MessageBucket]):
+    def __init__(self):
+        super().__init__(MessageBucket)
+
+    async def append(self, room_id: str, message: ChatMessage) -> None:
+        """
+        메시지를 message_id가 속한 구간의 버킷에 추가합니다 (upsert, 1 round trip).
+
+        버킷이 가득 찼으면(message_count >= CHAT_BUCKET_SIZE) 필터에 걸리지 않으므로 같은 구간에
+        새 버킷이 생성됩니다. 동시에 여러 버킷이 생겨도 history가 구간 단위로 합치므로 순서가 어긋나지 않습니다.
+        """
+        await self.collection.update_one(
+            {
+                "room_id": room_id,
+                "bucket_start": bucket_start_of_id(message.message_id),
+                "message_count": {"$lt": settings.CHAT_BUCKET_SIZE},
+            },
+            {
+                "$push": {"messages": message.model_dump()},
+                "$inc": {"message_count": 1},
+                "$min": {"first_id": message.message_id},
+                "$max": {"last_id": message.message_id},
+            },
+            upsert=True
+        )
+
+    async def exists(self, room_id: str, message_id: str) -> bool:
+        """방에 해당 메시지가 있는지 확인합니다 (메시지 구간에서 id 범위가 맞는 버킷만 조회)."""
+        bucket = await self.collection.find_one(
+            {
+                "room_id": room_id,
+                "bucket_start": bucket_start_of_id(message_id),
+                "last_id": {"$gte": message_id},
+                "first_id": {"$lte": message_id},
+                "messages.message_id": message_id,
+            },
+            {"_id": 1}
+        )
+        return bucket is not None
+
+    async def history(self, room_id: str, before: Optional[str], limit: int) -> List[ChatMessage]:
+        """
+        before(message_id)보다 오래된 메시지를 최신순으로 limit개 반환합니다 (keyset pagination).
+
+        skip을 쓰지 않고, first_id < before 조건으로 커서보다 새로운 버킷은 인덱스에서 건너뛰므로
+        구간에 버킷이 많아도 필요한 버킷만 읽습니다.
+
+        같은 구간의 버킷은 message_id 범위가 겹칠 수 있으므로 last_id 내림차순으로 읽으며 병합합니다.
+        다음 버킷의 last_id보다 큰 메시지는 아직 읽지 않은 버킷에 더 최신 메시지가 없으므로 바로 내보냅니다.
+
+        Args:
+            room_id: 방 ID
+            before: 커서 (이전 페이지의 가장 오래된 message_id, 유효한 ObjectId), None이면 최신부터
+            limit: 최대 메시지 수
+        """
+        filter_ = {"room_id": room_id}
+        if before:
+            filter_["bucket_start"] = {"$lte": bucket_start_of_id(before)}
+            filter_["first_id"] = {"$lt": before}
+
+        result: List[ChatMessage] = []
+        pending: List[ChatMessage] = []
+
+        def emit(bound: Optional[str]) -> None:
+            """bound보다 최신인 대기 메시지를 최신순으로 결과에 추가합니다 (None이면 전부)."""
+            nonlocal pending
+            ready = [message for message in pending if bound is None or message.message_id > bound]
+            pending = [message for message in pending if bound is not None and message.message_id <= bound]
+            for message in sorted(ready, key=lambda m: m.message_id, reverse=True):
+                result.append(message)
+                if len(result) >= limit:
+                    break
+
+        async for bucket in self.stream(
+                filter_,
+                sort=[("bucket_start", -1), ("last_id", -1)],
+                batch_size=max(1, limit // settings.CHAT_BUCKET_SIZE + 1)
+        ):
+            emit(bucket.last_id)
+            if len(result) >= limit:
+                return result
+            pending.extend(message for message in bucket.messages if not before or message.message_id < before)
+
+        emit(None)
+        return result
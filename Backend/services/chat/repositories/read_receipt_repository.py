@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from pymongo import UpdateOne
+
+from databases.base_repository import BaseRepository, BulkWriteSummary
+from models.read_receipt import ReadReceipt
+
+
+class ReadReceiptRepository(BaseRepository[ReadReceipt]):
+    def __init__(self):
+        super().__init__(ReadReceipt)
+
+    async def save_positions(self, positions: Iterable[Tuple[str, str, str]]) -> BulkWriteSummary:
+        """
+        읽음 위치를 일괄 반영합니다 (chunk당 bulk_write 1회).
+
+        여러 replica의 flush 순서가 뒤바뀌어도 위치가 뒤로 가지 않도록 $max로 갱신합니다.
+
+        Args:
+            positions: (room_id, user_id, last_read_id) 목록
+        """
+        now = datetime.now()
+        return await self.bulk_write(
+            UpdateOne(
+                {"room_id": room_id, "user_id": user_id},
+                {"$max": {"last_read_id": last_read_id}, "$set": {"updated_at": now}},
+                upsert=True
+            )
+            for room_id, user_id, last_read_id in positions
+        )
+
+    async def positions(self, room_id: str) -> Dict[str, str]:
+        """방의 사용자별 읽음 위치"""
+        return {
+            doc["user_id"]: doc["last_read_id"]
+            async for doc in self.collection.find(
+                {"room_id": room_id},
+                {"_id": 0, "user_id": 1, "last_read_id": 1}
+            )
+        }
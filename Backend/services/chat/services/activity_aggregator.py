@@ -0,0 +1,94 @@
+"""
+Room Activity Aggregator
+
+입력 중(typing)과 읽음(read) 이벤트를 방별로 CHAT_ACTIVITY_WINDOW_SECONDS 동안 모아
+방마다 프레임 하나로 브로드캐스트합니다.
+
+    {"type": "activity", "room": "...", "typing": ["user1", ...], "read": {"user2": "<message_id>"}}
+
+같은 윈도우 안의 반복 typing은 한 번으로, 같은 사용자의 여러 read는 마지막 위치 하나로 합쳐지므로
+Redis Pub/Sub과 소켓 송신량이 이벤트 수가 아니라 (활성 방 수 × 윈도우 수)에 비례합니다.
+클라이언트는 typing 표시를 몇 초 뒤 스스로 지웁니다.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from services.connection_hub import ConnectionHub, connection_hub
+
+logger = get_marigold_logger(__name__)
+
+
+class RoomActivity:
+    __slots__ = ("typing", "read")
+
+    def __init__(self):
+        self.typing: Set[str] = set()
+        self.read: Dict[str, str] = {}
+
+
+class ActivityAggregator:
+    def __init__(self, hub: ConnectionHub = connection_hub, window: float = settings.CHAT_ACTIVITY_WINDOW_SECONDS):
+        self.hub = hub
+        self.window = window
+        self._pending: Dict[str, RoomActivity] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _room(self, room_id: str) -> RoomActivity:
+        activity = self._pending.get(room_id)
+        if activity is None:
+            activity = self._pending[room_id] = RoomActivity()
+        return activity
+
+    def typing(self, room_id: str, user_id: str) -> None:
+        self._room(room_id).typing.add(user_id)
+
+    def read(self, room_id: str, user_id: str, message_id: str) -> None:
+        reads = self._room(room_id).read
+        if reads.get(user_id, "") < message_id:
+            reads[user_id] = message_id
+
+    async def flush(self) -> int:
+        """
+        모인 활동을 방별 프레임 하나로 보냅니다.
+
+        Returns:
+            int: 보낸 프레임 수
+        """
+        pending, self._pending = self._pending, {}
+
+        for room_id, activity in pending.items():
+            await self.hub.publish(room_id, {
+                "type": "activity",
+                "room": room_id,
+                "typing": sorted(activity.typing),
+                "read": activity.read,
+            })
+
+        return len(pending)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.window)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Activity flush failed: {e}")
+
+
+activity_aggregator = ActivityAggregator()
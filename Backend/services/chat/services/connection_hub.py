@@ -0,0 +1,311 @@
+"""
+WebSocket Connection Hub
+
+채팅 소켓 연결과 방(room) 구독을 관리합니다.
+
+- 방은 CHAT_HUB_SHARDS개의 shard로 나뉘며, shard마다 전용 dispatch 태스크가 fan-out 합니다.
+  큰 방의 fan-out이 다른 shard의 방을 막지 않습니다. shard 입력 큐는 CHAT_SHARD_INBOX_SIZE로 제한하며,
+  가득 차면 프레임을 버립니다.
+- 다른 replica로의 전달은 Redis Pub/Sub(방별 채널)로 하며, 각 노드는 로컬 연결이 있는 방의 채널만 구독합니다.
+  (첫 연결이 들어올 때 구독, 마지막 연결이 나갈 때 해지)
+- 소켓마다 크기가 제한된 송신 큐와 writer 태스크를 두고, 쌓인 프레임을 묶어 한 번에 보냅니다.
+  송신 큐가 가득 찬 느린 클라이언트는 연결을 끊어 방 전체가 밀리지 않도록 합니다.
+
+프레임 형식:
+    단일 메시지는 JSON 객체, 여러 메시지를 묶은 프레임은 JSON 배열입니다.
+"""
+
+import asyncio
+import zlib
+from typing import Dict, List, Optional, Set
+from uuid import uuid4
+
+import orjson
+from fastapi import WebSocket
+from redis.asyncio.client import PubSub
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+
+logger = get_marigold_logger(__name__)
+
+# fan-out 중 이 수만큼 전달할 때마다 이벤트 루프에 양보
+FANOUT_YIELD_EVERY = 1000
+
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ClientConnection:
+    def __init__(self, websocket: WebSocket, user_id: str, max_queue: int, max_batch: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.rooms: Set[str] = set()
+        self.max_batch = max_batch
+        self.closed = False
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def enqueue(self, frame: str) -> bool:
+        """
+        송신 큐에 프레임을 넣습니다.
+
+        Returns:
+            큐가 가득 차서 넣지 못했으면 False (느린 클라이언트)
+        """
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        if self.closed:
+            return
+
+        self.closed = True
+        self._writer.cancel()
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass  # 이미 끊긴 소켓
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                frames = [await self._queue.get()]
+                while len(frames) < self.max_batch and not self._queue.empty():
+                    frames.append(self._queue.get_nowait())
+
+                if len(frames) == 1:
+                    await self.websocket.send_text(frames[0])
+                else:
+                    await self.websocket.send_text(f"[{','.join(frames)}]")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"WebSocket send failed for user {self.user_id}: {e}")
+            self.closed = True
+
+
+class RoomShard:
+    def __init__(self, index: int, inbox_size: int):
+        self.index = index
+        self.rooms: Dict[str, Set[ClientConnection]] = {}
+        self.inbox: asyncio.Queue = asyncio.Queue(maxsize=inbox_size)
+        self.task: Optional[asyncio.Task] = None
+
+
+class ConnectionHub:
+    def __init__(
+            self,
+            shard_count: int = settings.CHAT_HUB_SHARDS,
+            send_queue_size: int = settings.CHAT_SEND_QUEUE_SIZE,
+            send_batch_size: int = settings.CHAT_SEND_BATCH_SIZE,
+            shard_inbox_size: int = settings.CHAT_SHARD_INBOX_SIZE,
+            channel_prefix: str = settings.CHAT_FANOUT_CHANNEL_PREFIX
+    ):
+        self.node_id = uuid4().hex
+        self.send_queue_size = send_queue_size
+        self.send_batch_size = send_batch_size
+        self.channel_prefix = channel_prefix
+        self._shards = [RoomShard(i, shard_inbox_size) for i in range(shard_count)]
+        self._subscriber: Optional[asyncio.Task] = None
+        self._subscription_sync: Optional[asyncio.Task] = None
+        self._pubsub: Optional[PubSub] = None
+        # 구독해야 할 채널 (로컬 연결이 있는 방), 변경 시 _subscriptions_dirty로 동기화 태스크를 깨움
+        self._channels: Set[str] = set()
+        self._subscriptions_dirty = asyncio.Event()
+        self._subscribed = asyncio.Event()
+        self._background: Set[asyncio.Task] = set()
+        self.slow_disconnects = 0
+        self.dropped_frames = 0
+
+    # ==================== 수명 주기 ====================
+
+    async def start(self) -> None:
+        for shard in self._shards:
+            shard.task = asyncio.create_task(self._dispatch_loop(shard))
+        self._subscriber = asyncio.create_task(self._subscribe_loop())
+        self._subscription_sync = asyncio.create_task(self._subscription_sync_loop())
+        logger.info(f"Connection hub started (node: {self.node_id}, shards: {len(self._shards)})")
+
+    async def stop(self) -> None:
+        tasks = [shard.task for shard in self._shards if shard.task]
+        tasks += [self._subscriber, self._subscription_sync, *self._background]
+        for task in tasks:
+            if task:
+                task.cancel()
+        await asyncio.gather(*(t for t in tasks if t), return_exceptions=True)
+
+        for shard in self._shards:
+            for connections in shard.rooms.values():
+                for connection in list(connections):
+                    await connection.close(code=1001, reason="Server shutdown")
+            shard.rooms.clear()
+
+    # ==================== 연결/구독 ====================
+
+    def connect(self, websocket: WebSocket, user_id: str) -> ClientConnection:
+        return ClientConnection(websocket, user_id, self.send_queue_size, self.send_batch_size)
+
+    def join(self, connection: ClientConnection, room_id: str) -> None:
+        shard = self._shard(room_id)
+        if room_id not in shard.rooms:
+            shard.rooms[room_id] = set()
+            self._channels.add(self._channel(room_id))
+            self._subscriptions_dirty.set()
+
+        shard.rooms[room_id].add(connection)
+        connection.rooms.add(room_id)
+
+    def leave(self, connection: ClientConnection, room_id: str) -> None:
+        shard = self._shard(room_id)
+        connections = shard.rooms.get(room_id)
+
+        if connections is not None:
+            connections.discard(connection)
+            if not connections:
+                del shard.rooms[room_id]
+                self._channels.discard(self._channel(room_id))
+                self._subscriptions_dirty.set()
+
+        connection.rooms.discard(room_id)
+
+    async def disconnect(self, connection: ClientConnection, code: int = 1000, reason: str = "") -> None:
+        for room_id in list(connection.rooms):
+            self.leave(connection, room_id)
+        await connection.close(code=code, reason=reason)
+
+    def connection_count(self) -> int:
+        return sum(len(c) for shard in self._shards for c in shard.rooms.values())
+
+    # ==================== 전송 ====================
+
+    async def publish(self, room_id: str, message: dict) -> None:
+        """
+        방의 모든 구독자(다른 replica 포함)에게 메시지를 보냅니다.
+
+        메시지는 한 번만 직렬화되어 모든 소켓에 같은 프레임으로 전달됩니다.
+        """
+        frame = orjson.dumps(message).decode()
+        self.deliver_local(room_id, frame)
+
+        redis = await get_redis_client()
+        await redis.publish(
+            self._channel(room_id),
+            orjson.dumps({"node": self.node_id, "room": room_id, "frame": frame})
+        )
+
+    def deliver_local(self, room_id: str, frame: str) -> None:
+        """이 노드의 구독자에게만 프레임을 전달합니다 (shard dispatch 큐에 적재, 가득 차면 버림)."""
+        shard = self._shard(room_id)
+        if room_id not in shard.rooms:
+            return
+
+        try:
+            shard.inbox.put_nowait((room_id, frame))
+        except asyncio.QueueFull:
+            self.dropped_frames += 1
+            if self.dropped_frames % 1000 == 1:
+                logger.warning(f"Shard {shard.index} inbox full, dropped {self.dropped_frames} frames so far")
+
+    # ==================== 내부 ====================
+
+    def _shard(self, room_id: str) -> RoomShard:
+        return self._shards[zlib.crc32(room_id.encode()) % len(self._shards)]
+
+    def _channel(self, room_id: str) -> str:
+        return f"{self.channel_prefix}:{room_id}"
+
+    def _spawn(self, coro) -> None:
+        """참조를 유지하는 백그라운드 태스크 (완료 시 제거, stop 시 취소)"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _dispatch_loop(self, shard: RoomShard) -> None:
+        while True:
+            room_id, frame = await shard.inbox.get()
+            connections = shard.rooms.get(room_id)
+            if not connections:
+                continue
+
+            slow: List[ClientConnection] = []
+            for i, connection in enumerate(list(connections), 1):
+                if connection.closed or not connection.enqueue(frame):
+                    slow.append(connection)
+                if i % FANOUT_YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+
+            for connection in slow:
+                if not connection.closed:
+                    self.slow_disconnects += 1
+                    logger.warning(f"Disconnecting slow consumer: {connection.user_id}")
+                self._spawn(
+                    self.disconnect(connection, code=SLOW_CONSUMER_CLOSE_CODE, reason="Send queue overflow")
+                )
+
+    async def _sync_subscriptions(self, pubsub: PubSub) -> None:
+        """구독 중인 채널을 _channels와 맞춥니다 (명령 전송만 하고 응답은 _subscribe_loop가 읽음)."""
+        current = set(pubsub.channels) - set(pubsub.pending_unsubscribe_channels)
+        wanted = set(self._channels)
+
+        if wanted - current:
+            await pubsub.subscribe(*(wanted - current))
+        if current - wanted:
+            await pubsub.unsubscribe(*(current - wanted))
+        if pubsub.subscribed:
+            self._subscribed.set()
+
+    async def _subscription_sync_loop(self) -> None:
+        while True:
+            await self._subscriptions_dirty.wait()
+            self._subscriptions_dirty.clear()
+
+            pubsub = self._pubsub
+            if pubsub is None:
+                continue  # _subscribe_loop가 연결 후 다시 동기화를 요청함
+            try:
+                await self._sync_subscriptions(pubsub)
+            except Exception as e:
+                logger.error(f"Chat fan-out subscription update failed: {e}")
+
+    async def _subscribe_loop(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                redis = await get_redis_client()
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                self._pubsub = pubsub
+                self._subscriptions_dirty.set()
+
+                while True:
+                    if not pubsub.subscribed:
+                        # 로컬 연결이 있는 방이 없음 → 첫 구독까지 대기
+                        self._subscribed.clear()
+                        if not pubsub.subscribed:
+                            await self._subscribed.wait()
+                        continue
+
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if not message or message["type"] != "message":
+                        continue
+
+                    envelope = orjson.loads(message["data"])
+                    if envelope["node"] != self.node_id:
+                        self.deliver_local(envelope["room"], envelope["frame"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Chat fan-out subscription failed: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self._pubsub = None
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+
+connection_hub = ConnectionHub()
@@ -0,0 +1,169 @@
+"""
+Chat History Service
+
+메시지를 시간 구간 버킷(MongoDB)에 저장하고, 방별 최신 CHAT_RECENT_CACHE_SIZE개를
+Redis 리스트(chat:recent:{room_id}, 최신순)에 캐시합니다.
+방 입장 시 첫 페이지는 Redis LRANGE 한 번으로 응답합니다.
+
+캐시가 없을 때 MongoDB를 읽는 동안 저장된 메시지가 빠진 채로 채워지지 않도록,
+save가 방별 버전(chat:recent:{room_id}:v)을 올리고 fill은 읽기 전 버전이 그대로일 때만 캐시를 채웁니다.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+from models.message import ChatMessage
+from repositories.message_repository import MessageRepository
+
+logger = get_marigold_logger(__name__)
+
+# KEYS[1] = chat:recent:{room_id}, KEYS[2] = chat:recent:{room_id}:v
+# ARGV[1] = TTL(초), ARGV[2] = MongoDB 조회 전 버전 ('' = 없음), ARGV[3..] = 메시지(최신순)
+# 다른 요청이 먼저 채웠거나 조회 중에 새 메시지가 저장되었으면 채우지 않음
+FILL_RECENT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[2] then
+    return 0
+end
+redis.call('RPUSH', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def recent_key(room_id: str) -> str:
+    return f"chat:recent:{room_id}"
+
+
+def recent_version_key(room_id: str) -> str:
+    return f"chat:recent:{room_id}:v"
+
+
+class HistoryService:
+    _SCRIPTS: Dict[str, str] = {
+        "fill_recent": FILL_RECENT_SCRIPT,
+    }
+
+    def __init__(self, repository: Optional[MessageRepository] = None):
+        self.repository = repository or MessageRepository()
+        self.cache_size = settings.CHAT_RECENT_CACHE_SIZE
+        self.cache_ttl = settings.CHAT_RECENT_CACHE_TTL_SECONDS
+        self._redis: Optional[Redis] = None
+        self._scripts: Dict[str, AsyncScript] = {}
+
+    async def _get_script(self, name: str) -> AsyncScript:
+        redis = await get_redis_client()
+
+        if redis is not self._redis:
+            self._scripts = {
+                script_name: redis.register_script(source)
+                for script_name, source in self._SCRIPTS.items()
+            }
+            self._redis = redis
+
+        return self._scripts[name]
+
+    async def save(self, room_id: str, sender_id: str, body: str) -> ChatMessage:
+        """
+        메시지를 저장하고 최신 메시지 캐시에 추가합니다.
+
+        캐시는 이미 존재할 때만 갱신합니다 (LPUSHX). 없으면 다음 조회 시 MongoDB에서 채우며,
+        버전을 올려 진행 중인 fill이 이 메시지가 빠진 목록을 캐시하지 않도록 합니다.
+        LPUSHX와 버전 증가는 MULTI/EXEC로 묶습니다. 사이에 fill이 끼어들면 이전 버전으로 채운 목록에
+        이 메시지가 빠진 채 TTL까지 남습니다.
+        """
+        message = ChatMessage(
+            message_id=str(ObjectId()),
+            sender_id=sender_id,
+            body=body,
+            created_at=datetime.now()
+        )
+
+        await self.repository.append(room_id, message)
+
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.lpushx(recent_key(room_id), message.model_dump_json())
+            pipe.ltrim(recent_key(room_id), 0, self.cache_size - 1)
+            pipe.incr(recent_version_key(room_id))
+            pipe.expire(recent_version_key(room_id), self.cache_ttl)
+            await pipe.execute()
+
+        return message
+
+    async def recent(self, room_id: str) -> List[ChatMessage]:
+        """
+        방의 최신 메시지를 최신순으로 반환합니다 (캐시 hit 시 Redis 1 round trip).
+        """
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.lrange(recent_key(room_id), 0, self.cache_size - 1)
+            pipe.get(recent_version_key(room_id))
+            cached, version = await pipe.execute()
+
+        if cached:
+            return [ChatMessage.model_validate_json(item) for item in cached]
+
+        messages = await self.repository.history(room_id, before=None, limit=self.cache_size)
+        if messages:
+            script = await self._get_script("fill_recent")
+            await script(
+                keys=[recent_key(room_id), recent_version_key(room_id)],
+                args=[self.cache_ttl, version or "", *(message.model_dump_json() for message in messages)]
+            )
+
+        return messages
+
+    async def latest_id(self, room_id: str) -> Optional[str]:
+        """
+        방의 최신 message_id를 반환합니다 (캐시 hit 시 Redis LINDEX 1 round trip).
+
+        캐시가 없으면 recent로 채우므로 이후 호출은 Redis에서 처리됩니다.
+        """
+        redis = await get_redis_client()
+        cached = await redis.lindex(recent_key(room_id), 0)
+        if cached is not None:
+            return ChatMessage.model_validate_json(cached).message_id
+
+        messages = await self.recent(room_id)
+        return messages[0].message_id if messages else None
+
+    async def exists(self, room_id: str, message_id: str) -> bool:
+        return await self.repository.exists(room_id, message_id)
+
+    async def page(
+            self,
+            room_id: str,
+            before: Optional[str] = None,
+            limit: int = 50
+    ) -> Tuple[List[ChatMessage], Optional[str]]:
+        """
+        메시지 이력 한 페이지를 반환합니다.
+
+        Args:
+            room_id: 방 ID
+            before: 커서 (이전 응답의 next_cursor), None이면 최신 페이지
+            limit: 페이지 크기
+
+        Returns:
+            (최신순 메시지 목록, next_cursor), 더 이상 없으면 next_cursor는 None
+        """
+        if before is None and limit <= self.cache_size:
+            messages = (await self.recent(room_id))[:limit]
+        else:
+            messages = await self.repository.history(room_id, before=before, limit=limit)
+
+        next_cursor = messages[-1].message_id if len(messages) == limit else None
+        return messages, next_cursor
+
+
+history_service = HistoryService()
@@ -0,0 +1,116 @@
+"""
+Presence Service
+
+사용자 접속 상태를 Redis 해시(presence:{user_id})에 저장합니다.
+
+- 필드는 연결 단위({node_id}:{connection_id}), 값은 마지막 heartbeat 시각입니다.
+  여러 기기로 접속해도 연결별로 독립적으로 갱신/삭제됩니다.
+- 이 노드의 모든 연결을 CHAT_PRESENCE_HEARTBEAT_SECONDS마다 파이프라인 한 번으로 갱신하고
+  키 TTL(CHAT_PRESENCE_TTL_SECONDS)을 연장합니다. 노드가 죽으면 필드는 갱신되지 않아
+  오래된 값으로 판정되고, 모든 연결이 사라진 키는 TTL로 삭제됩니다.
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+
+logger = get_marigold_logger(__name__)
+
+PRESENCE_PREFIX = "presence:"
+
+
+def presence_key(user_id: str) -> str:
+    return f"{PRESENCE_PREFIX}{user_id}"
+
+
+class PresenceService:
+    def __init__(
+            self,
+            ttl: int = settings.CHAT_PRESENCE_TTL_SECONDS,
+            heartbeat_interval: float = settings.CHAT_PRESENCE_HEARTBEAT_SECONDS,
+            chunk_size: int = 500
+    ):
+        self.ttl = ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.chunk_size = chunk_size
+        # (user_id, field) → 등록 여부
+        self._local: Dict[Tuple[str, str], None] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def register(self, user_id: str, connection_id: str) -> None:
+        """연결을 등록하고 즉시 online으로 기록합니다 (1 round trip)."""
+        self._local[(user_id, connection_id)] = None
+        await self._write([(user_id, connection_id)])
+
+    async def unregister(self, user_id: str, connection_id: str) -> None:
+        self._local.pop((user_id, connection_id), None)
+        try:
+            redis = await get_redis_client()
+            await redis.hdel(presence_key(user_id), connection_id)
+        except Exception as e:
+            # 삭제에 실패해도 heartbeat가 멈추므로 TTL 내에 offline으로 판정됨
+            logger.warning(f"Failed to clear presence for {user_id}: {e}")
+
+    async def online(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        """
+        사용자별 접속 여부를 반환합니다 (1 round trip).
+
+        TTL 안에 heartbeat를 보낸 연결이 하나라도 있으면 online입니다.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hvals(presence_key(user_id))
+            replies = await pipe.execute()
+
+        threshold = time.time() - self.ttl
+        return {
+            user_id: any(float(seen) >= threshold for seen in values)
+            for user_id, values in zip(user_ids, replies)
+        }
+
+    async def _write(self, entries: List[Tuple[str, str]]) -> None:
+        now = time.time()
+        redis = await get_redis_client()
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id, connection_id in entries:
+                pipe.hset(presence_key(user_id), connection_id, now)
+                pipe.expire(presence_key(user_id), self.ttl)
+            await pipe.execute()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+
+            entries = list(self._local)
+            for i in range(0, len(entries), self.chunk_size):
+                try:
+                    await self._write(entries[i:i + self.chunk_size])
+                except Exception as e:
+                    logger.error(f"Presence heartbeat failed: {e}")
+                    break
+
+
+presence_service = PresenceService()
@@ -0,0 +1,250 @@
+"""
+Read Receipt Service
+
+방별 사용자 읽음 위치를 high-water mark 하나로 관리합니다.
+
+- Redis 해시 read:{room_id}의 user_id 필드에 마지막으로 읽은 message_id를 저장하며,
+  MARK_READ 스크립트가 더 큰 값일 때만 갱신하고 변경된 (room, user)를 dirty 집합에 넣습니다.
+  (message_id는 ObjectId 문자열이라 사전순 = 시간순)
+- 해시가 없으면(만료/재시작) MongoDB에 반영된 위치로 먼저 채운 뒤 갱신하므로,
+  해시가 존재하면 방 전체 위치를 담고 있고 MongoDB보다 뒤로 가지 않습니다.
+- flush 루프가 CHAT_READ_FLUSH_SECONDS마다 dirty 집합에서 꺼낸 최종 위치만 MongoDB에 일괄 반영합니다.
+  SPOP으로 꺼내므로 여러 replica가 동시에 flush해도 같은 항목을 나눠 가지며,
+  반영에 실패한 항목은 dirty 집합에 되돌립니다.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+from repositories.read_receipt_repository import ReadReceiptRepository
+
+logger = get_marigold_logger(__name__)
+
+READ_PREFIX = "read:"
+READ_DIRTY_KEY = "read:dirty"
+DIRTY_SEPARATOR = "|"
+
+# KEYS[1] = read:{room_id}, KEYS[2] = read:dirty
+# ARGV[1] = user_id, ARGV[2] = message_id, ARGV[3] = TTL(초), ARGV[4] = dirty 멤버,
+# ARGV[5] = MongoDB 위치로 채웠는지 여부 (1이면 해시가 없어도 생성)
+# 반환: 위치가 앞으로 이동했으면 1, 해시가 없어 MongoDB에서 채워야 하면 -1
+MARK_READ_SCRIPT = """
+if ARGV[5] ~= '1' and redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current and current >= ARGV[2] then
+    return 0
+end
+
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[4])
+return 1
+"""
+
+# KEYS[1] = read:{room_id}, ARGV[1] = TTL(초), ARGV[2..] = user_id, message_id, ...
+# 사용자별로 더 큰 값만 반영 (동시에 채우거나 이미 갱신된 위치를 되돌리지 않음)
+SEED_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    local current = redis.call('HGET', KEYS[1], ARGV[i])
+    if not current or current < ARGV[i + 1] then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS[1] = read:dirty, ARGV[1] = 최대 개수, ARGV[2] = read 키 prefix, ARGV[3] = 구분자
+# 반환: {room_id, user_id, message_id, ...}
+TAKE_DIRTY_SCRIPT = """
+local members = redis.call('SPOP', KEYS[1], tonumber(ARGV[1]))
+local result = {}
+
+for _, member in ipairs(members) do
+    local sep = string.find(member, ARGV[3], 1, true)
+    if sep then
+        local room_id = string.sub(member, 1, sep - 1)
+        local user_id = string.sub(member, sep + 1)
+        local position = redis.call('HGET', ARGV[2] .. room_id, user_id)
+        if position then
+            result[#result + 1] = room_id
+            result[#result + 1] = user_id
+            result[#result + 1] = position
+        end
+    end
+end
+
+return result
+"""
+
+
+def read_key(room_id: str) -> str:
+    return f"{READ_PREFIX}{room_id}"
+
+
+def dirty_member(room_id: str, user_id: str) -> str:
+    return f"{room_id}{DIRTY_SEPARATOR}{user_id}"
+
+
+def is_valid_room_id(room_id: str) -> bool:
+    """dirty 멤버 구분자를 포함한 room_id는 flush 시 분리할 수 없으므로 허용하지 않음"""
+    return bool(room_id) and DIRTY_SEPARATOR not in room_id
+
+
+class ReadReceiptService:
+    _SCRIPTS: Dict[str, str] = {
+        "mark_read": MARK_READ_SCRIPT,
+        "seed": SEED_SCRIPT,
+        "take_dirty": TAKE_DIRTY_SCRIPT,
+    }
+
+    def __init__(
+            self,
+            repository: Optional[ReadReceiptRepository] = None,
+            flush_interval: float = settings.CHAT_READ_FLUSH_SECONDS,
+            flush_batch: int = settings.CHAT_READ_FLUSH_BATCH,
+            state_ttl: int = settings.CHAT_READ_STATE_TTL_SECONDS
+    ):
+        self.repository = repository or ReadReceiptRepository()
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.state_ttl = state_ttl
+        self._redis: Optional[Redis] = None
+        self._scripts: Dict[str, AsyncScript] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _get_script(self, name: str) -> AsyncScript:
+        redis = await get_redis_client()
+
+        if redis is not self._redis:
+            self._scripts = {
+                script_name: redis.register_script(source)
+                for script_name, source in self._SCRIPTS.items()
+            }
+            self._redis = redis
+
+        return self._scripts[name]
+
+    async def mark_read(self, room_id: str, user_id: str, message_id: str) -> bool:
+        """
+        읽음 위치를 갱신합니다 (해시가 있으면 1 round trip).
+
+        Args:
+            room_id: 방 ID (is_valid_room_id를 통과해야 함)
+            user_id: 사용자 ID
+            message_id: 검증된 ObjectId 문자열 (소문자)
+
+        Returns:
+            bool: 위치가 앞으로 이동했으면 True (이미 더 뒤까지 읽었으면 False)
+        """
+        if not is_valid_room_id(room_id):
+            raise ValueError(f"Invalid room_id: {room_id!r}")
+
+        script = await self._get_script("mark_read")
+        keys = [read_key(room_id), READ_DIRTY_KEY]
+        args = [user_id, message_id, self.state_ttl, dirty_member(room_id, user_id)]
+
+        advanced = await script(keys=keys, args=[*args, 0])
+        if advanced == -1:
+            await self._seed(room_id)
+            advanced = await script(keys=keys, args=[*args, 1])
+
+        return advanced == 1
+
+    async def _seed(self, room_id: str) -> None:
+        """MongoDB에 반영된 위치로 Redis 해시를 채웁니다."""
+        persisted = await self.repository.positions(room_id)
+        if not persisted:
+            return
+
+        script = await self._get_script("seed")
+        args: List[str] = []
+        for user_id, position in persisted.items():
+            args.extend((user_id, position))
+        await script(keys=[read_key(room_id)], args=[self.state_ttl, *args])
+
+    async def positions(self, room_id: str) -> Dict[str, str]:
+        """
+        방의 사용자별 읽음 위치를 반환합니다.
+
+        Redis에 없으면(만료/재시작) MongoDB에 반영된 위치를 반환합니다.
+        """
+        redis = await get_redis_client()
+        positions = await redis.hgetall(read_key(room_id))
+        if positions:
+            return positions
+        return await self.repository.positions(room_id)
+
+    async def flush(self) -> int:
+        """
+        변경된 읽음 위치를 MongoDB에 반영합니다.
+
+        Returns:
+            int: 반영한 위치 수
+        """
+        script = await self._get_script("take_dirty")
+        flushed = 0
+
+        while True:
+            reply = await script(
+                keys=[READ_DIRTY_KEY],
+                args=[self.flush_batch, READ_PREFIX, DIRTY_SEPARATOR]
+            )
+            if not reply:
+                break
+
+            positions: List[Tuple[str, str, str]] = [
+                (reply[i], reply[i + 1], reply[i + 2]) for i in range(0, len(reply), 3)
+            ]
+            try:
+                await self.repository.save_positions(positions)
+            except Exception:
+                redis = await get_redis_client()
+                await redis.sadd(READ_DIRTY_KEY, *(dirty_member(room, user) for room, user, _ in positions))
+                raise
+
+            flushed += len(positions)
+            if len(positions) < self.flush_batch:
+                break
+
+        return flushed
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final read receipt flush failed: {e}")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                flushed = await self.flush()
+                if flushed:
+                    logger.debug(f"Flushed {flushed} read receipts")
+            except Exception as e:
+                logger.error(f"Read receipt flush failed: {e}")
+
+
+read_receipt_service = ReadReceiptService()
@@ -1,2 +1,48 @@
+from contextlib import asynccontextmanager
+
+from commons.app_factory import create_app
+from commons.settings import settings
+from kafka.consumer import MarigoldConsumer, kafka_consumer_lifespan
+from services.coalescer import NotificationCoalescer
+from services.delivery import deliver_coalesced, deliver_scheduled
+from services.scheduler import NotificationScheduler
+
+coalescer = NotificationCoalescer(deliver=deliver_coalesced)
+scheduler = NotificationScheduler(handler=deliver_scheduled)
+
+
+@asynccontextmanager
+async def notification_pipeline_lifespan():
+    """
+    예약 알림 스케줄러와 채팅 이벤트 병합 파이프라인을 시작합니다.
+
+    종료 시 consumer를 먼저 멈춘 뒤 coalescer에 남은 알림을 발송합니다.
+    """
+    consumer = MarigoldConsumer(
+        [settings.NOTIFICATION_EVENTS_TOPIC],
+        group_id=settings.NOTIFICATION_CONSUMER_GROUP,
+        handler=coalescer.handle
+    )
+
+    await scheduler.start()
+    await coalescer.start()
+    try:
+        async with kafka_consumer_lifespan(consumer):
+            yield
+    finally:
+        await coalescer.stop()
+        await scheduler.stop()
+
+
+app = create_app(
+    "notification",
+    use_kafka=True,
+    use_profile_client=True,
+    lifespans=[notification_pipeline_lifespan],
+)
+
+
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,294 @@
+"""
+Notification Coalescer
+
+채팅 이벤트를 (수신자, 대화방) 단위로 묶어 짧은 윈도우 동안 알림 한 건으로 합친 뒤
+배치로 발송합니다.
+
+처리 순서:
+    1. 이벤트 ID 중복 제거 (RotatingSeenSet, Kafka 재전달 대비)
+    2. (user_id, conversation_id)별 대기 알림에 병합 (개수/마지막 미리보기만 유지)
+    3. 윈도우가 지난 알림을 사용자별 토큰 버킷으로 제한해 max_batch 단위로 발송
+       (토큰이 없으면 버리지 않고 윈도우 하나만큼 미룬 뒤 계속 병합)
+
+대기 알림은 처음 생긴 순서대로 두므로 flush는 윈도우가 지나지 않은 첫 알림에서 멈춥니다.
+대기 알림 수는 max_pending으로 제한하며, 가득 차면 새 (수신자, 대화방)의 이벤트는 버립니다.
+대기 중인 알림은 메모리에만 있으므로 프로세스가 죽으면 유실될 수 있습니다. (알림은 best-effort)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from commons.ttl_cache import TTLCache
+from kafka.consumer import ConsumedMessage
+from services.seen_set import RotatingSeenSet
+
+logger = get_marigold_logger(__name__)
+
+
+@dataclass
+class CoalescedNotification:
+    user_id: str
+    conversation_id: str
+    count: int
+    last_sender_id: Optional[str]
+    last_preview: Optional[str]
+    first_at: float
+    last_at: float
+    # 최근 이벤트 ID만 유지 (전체 개수는 count)
+    event_ids: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=settings.NOTIFICATION_MAX_EVENT_IDS)
+    )
+    deferred: bool = False  # 사용자별 제한으로 미뤄진 적이 있는지 (rate_limited 통계용)
+
+
+Deliver = Callable[[List[CoalescedNotification]], Awaitable[None]]
+PendingKey = Tuple[str, str]
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def take(self, rate: float, burst: float) -> bool:
+        now = time.monotonic()
+        self.tokens = min(burst, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class NotificationCoalescer:
+    def __init__(
+            self,
+            deliver: Deliver,
+            window_seconds: float = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS,
+            max_batch: int = settings.NOTIFICATION_DELIVERY_BATCH_SIZE,
+            max_pending: int = settings.NOTIFICATION_MAX_PENDING,
+            user_rate_per_minute: float = settings.NOTIFICATION_USER_RATE_PER_MINUTE,
+            user_burst: float = settings.NOTIFICATION_USER_BURST,
+            seen_capacity: int = settings.NOTIFICATION_SEEN_SET_CAPACITY,
+            seen_error_rate: float = settings.NOTIFICATION_SEEN_SET_ERROR_RATE,
+            seen_rotate_seconds: float = settings.NOTIFICATION_SEEN_SET_ROTATE_SECONDS
+    ):
+        """
+        Args:
+            deliver: 배치 발송 코루틴 (예외 시 다음 flush에서 재시도)
+            window_seconds: 병합 윈도우 (첫 이벤트 기준)
+            max_batch: deliver 한 번에 넘길 최대 알림 수
+            max_pending: 대기 알림 수 상한 (도달 시 윈도우와 무관하게 flush, 새 알림은 버림)
+            user_rate_per_minute: 사용자별 분당 알림 수
+            user_burst: 사용자별 순간 허용량
+            seen_capacity / seen_error_rate / seen_rotate_seconds: 중복 제거 설정
+        """
+        self.deliver = deliver
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.user_rate = user_rate_per_minute / 60
+        self.user_burst = user_burst
+
+        self._seen = RotatingSeenSet(seen_capacity, seen_error_rate, seen_rotate_seconds)
+        # 삽입 순서 = first_at 순 (앞에서 꺼내고 뒤로 보내는 연산이 O(1))
+        self._pending: OrderedDict[PendingKey, CoalescedNotification] = OrderedDict()
+        # 오래 알림이 없던 사용자의 버킷은 가득 찬 상태와 같으므로 만료시켜도 됨
+        self._buckets: TTLCache[str, TokenBucket] = TTLCache(
+            max_size=max_pending,
+            default_ttl=user_burst / self.user_rate if self.user_rate else None
+        )
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.received = 0
+        self.duplicates = 0
+        self.delivered = 0
+        self.rate_limited = 0
+        self.dropped = 0
+
+    # ==================== 입력 ====================
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """
+        이벤트를 대기 알림에 병합합니다.
+
+        Args:
+            event: {"event_id", "conversation_id", "recipient_ids", "sender_id", "preview"}
+        """
+        self.received += 1
+        event_id = str(event["event_id"])
+
+        if self._seen.check_and_add(event_id):
+            self.duplicates += 1
+            return
+
+        now = time.monotonic()
+        conversation_id = str(event["conversation_id"])
+        sender_id = event.get("sender_id")
+
+        for user_id in event.get("recipient_ids", ()):
+            if user_id == sender_id:
+                continue
+
+            key = (user_id, conversation_id)
+            pending = self._pending.get(key)
+            if pending is None:
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    continue
+                pending = CoalescedNotification(
+                    user_id=user_id,
+                    conversation_id=conversation_id,
+                    count=0,
+                    last_sender_id=None,
+                    last_preview=None,
+                    first_at=now,
+                    last_at=now
+                )
+                self._pending[key] = pending
+                if len(self._pending) == self.max_pending:
+                    # 상한에 도달한 순간에만 깨움 (이벤트마다 flush를 깨우지 않음)
+                    self._wakeup.set()
+
+            pending.count += 1
+            pending.last_sender_id = sender_id
+            pending.last_preview = event.get("preview")
+            pending.last_at = now
+            pending.event_ids.append(event_id)
+
+    async def handle(self, message: ConsumedMessage) -> None:
+        """MarigoldConsumer 핸들러"""
+        self.offer(message.value)
+
+    # ==================== 수명 주기 ====================
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # 남은 알림은 윈도우와 무관하게 발송
+        await self.flush(force=True)
+
+    # ==================== 발송 ====================
+
+    def _take_token(self, user_id: str) -> bool:
+        bucket = self._buckets.get(user_id, count=False)
+        if bucket is None:
+            bucket = TokenBucket(self.user_burst)
+        allowed = bucket.take(self.user_rate, self.user_burst)
+        self._buckets.set(user_id, bucket)
+        return allowed
+
+    def _collect(self, force: bool) -> List[CoalescedNotification]:
+        """
+        윈도우가 지난 알림을 꺼냅니다.
+
+        _pending은 first_at 순이므로 윈도우가 지나지 않은 첫 알림에서 멈춥니다.
+        제한에 걸린 알림은 first_at을 갱신해 뒤로 보내므로 다음 윈도우까지 다시 검사하지 않습니다.
+        """
+        now = time.monotonic()
+        deadline = now - self.window_seconds
+        overflow = len(self._pending) >= self.max_pending
+        ready: List[CoalescedNotification] = []
+        deferred: List[Tuple[PendingKey, CoalescedNotification]] = []
+
+        while self._pending:
+            key = next(iter(self._pending))
+            if not (force or overflow or self._pending[key].first_at <= deadline):
+                break
+
+            pending = self._pending.pop(key)
+            if force or self._take_token(pending.user_id):
+                ready.append(pending)
+            else:
+                if not pending.deferred:
+                    pending.deferred = True
+                    self.rate_limited += 1
+                deferred.append((key, pending))
+
+        for key, pending in deferred:
+            pending.first_at = now
+            self._pending[key] = pending
+
+        return ready
+
+    def _requeue(self, batch: List[CoalescedNotification]) -> None:
+        """발송에 실패한 알림을 다시 대기시킵니다 (다음 윈도우에 재시도, 순서 유지를 위해 first_at 갱신)."""
+        now = time.monotonic()
+
+        for item in batch:
+            key = (item.user_id, item.conversation_id)
+            newer = self._pending.pop(key, None)
+            if newer is not None:
+                item.count += newer.count
+                item.last_sender_id = newer.last_sender_id
+                item.last_preview = newer.last_preview
+                item.last_at = newer.last_at
+                item.event_ids.extend(newer.event_ids)
+            item.first_at = now
+            self._pending[key] = item
+
+    async def flush(self, force: bool = False) -> int:
+        """
+        윈도우가 지난 알림을 발송합니다.
+
+        Returns:
+            int: 발송한 알림 수
+        """
+        ready = self._collect(force)
+        sent = 0
+
+        for i in range(0, len(ready), self.max_batch):
+            batch = ready[i:i + self.max_batch]
+            try:
+                await self.deliver(batch)
+                sent += len(batch)
+            except Exception as e:
+                logger.error(f"Notification delivery failed ({len(batch)} items): {e}")
+                self._requeue(batch)
+
+        self.delivered += sent
+        return sent
+
+    async def _run(self) -> None:
+        interval = max(self.window_seconds / 4, 0.05)
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Notification flush failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "pending": len(self._pending),
+            "delivered": self.delivered,
+            "rate_limited": self.rate_limited,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,64 @@
+"""
+Notification Delivery
+
+병합된 알림과 예약 알림을 발송 토픽(NOTIFICATION_DELIVERY_TOPIC)으로 내보냅니다.
+푸시 게이트웨이 등 실제 전송은 이 토픽을 구독하는 쪽이 담당합니다.
+
+- 수신자 ID를 파티션 키로 써서 사용자별 순서를 유지합니다.
+- 배치의 발신자 이름은 profile_client로 한 번에 조회하며, 조회에 실패해도 이름 없이 발송합니다.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from commons.logger import get_marigold_logger
+from commons.profile_client import profile_client
+from commons.settings import settings
+from kafka.producer import get_kafka_producer
+from services.coalescer import CoalescedNotification
+
+logger = get_marigold_logger(__name__)
+
+
+async def deliver_coalesced(batch: List[CoalescedNotification]) -> None:
+    """
+    NotificationCoalescer의 deliver 코루틴
+
+    배치 전체를 버퍼에 넣은 뒤 브로커 응답을 한 번에 기다립니다. (예외 시 coalescer가 재시도)
+    """
+    sender_ids = [item.last_sender_id for item in batch if item.last_sender_id]
+    try:
+        senders = await profile_client.get_many(sender_ids)
+    except Exception as e:
+        logger.warning(f"Failed to load sender profiles for notifications: {e}")
+        senders = {}
+
+    producer = await get_kafka_producer()
+    futures = []
+    for item in batch:
+        sender = senders.get(item.last_sender_id) if item.last_sender_id else None
+        futures.append(await producer.send(
+            settings.NOTIFICATION_DELIVERY_TOPIC,
+            {
+                "type": "chat",
+                "userId": item.user_id,
+                "conversationId": item.conversation_id,
+                "count": item.count,
+                "senderId": item.last_sender_id,
+                "senderName": sender.display_name if sender else None,
+                "preview": item.last_preview,
+            },
+            key=item.user_id
+        ))
+
+    await asyncio.gather(*futures)
+
+
+async def deliver_scheduled(item_id: str, payload: Dict[str, Any]) -> None:
+    """NotificationScheduler의 handler 코루틴 (예외 시 lease 만료 후 재시도)"""
+    producer = await get_kafka_producer()
+    await producer.send_and_wait(
+        settings.NOTIFICATION_DELIVERY_TOPIC,
+        {"type": "scheduled", "id": item_id, **payload},
+        key=payload.get("userId")
+    )
@@ -0,0 +1,409 @@
+"""
+Notification Scheduler
+
+예약 알림(일정 리마인더, 지연 채팅 알림)을 Redis 지연 큐로 관리합니다.
+
+키 구성:
+    notif:sched:b:{bucket}   ZSET  item_id → 발송 시각 (bucket = 발송 시각 // BUCKET_SECONDS)
+    notif:sched:buckets      ZSET  비어 있지 않은 bucket 번호 (score = bucket)
+    notif:sched:items        HASH  item_id → payload(JSON)
+    notif:sched:where        HASH  item_id → 현재 bucket (재예약 / 취소 시 이전 bucket에서 제거)
+    notif:sched:inflight     ZSET  item_id → lease 만료 시각 (처리 중)
+    notif:sched:claims       HASH  item_id → claim 토큰 (lease를 가진 claim만 ack / 연장 가능)
+    notif:sched:attempts     HASH  item_id → lease 만료로 되돌아간 횟수
+    notif:sched:dead         HASH  item_id → payload (최대 시도 횟수 초과, dead-letter)
+
+- claim 스크립트가 기한이 지난 bucket만 골라 배치 단위로 원자적으로 가져가므로
+  여러 replica가 동시에 돌아도 같은 항목을 중복으로 가져가지 않고, 모든 키를 훑지 않습니다.
+- 처리 완료 시 ack로 삭제하며, 처리 중 프로세스가 죽으면 lease 만료 후 다시 큐에 들어갑니다.
+  (재시작 후에도 유지, at-least-once)
+- 배치를 처리하는 동안 남은 항목의 lease를 주기적으로 연장하고, handler 하나는 lease_seconds를 넘기지 못합니다.
+- ack / 연장은 claim 토큰이 일치할 때만 반영되므로, lease를 잃은 뒤 늦게 끝난 처리가
+  다른 replica가 다시 가져간 항목을 지우지 않습니다.
+- lease 만료로 max_attempts번 되돌아간 항목은 dead-letter로 옮겨 더 이상 재시도하지 않습니다.
+- 처리 중에 재예약된 항목은 ack 시 지우지 않고 새 예약을 유지합니다.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+import orjson
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+
+logger = get_marigold_logger(__name__)
+
+KEY_PREFIX = "notif:sched"
+BUCKET_PREFIX = f"{KEY_PREFIX}:b:"
+BUCKETS_KEY = f"{KEY_PREFIX}:buckets"
+ITEMS_KEY = f"{KEY_PREFIX}:items"
+WHERE_KEY = f"{KEY_PREFIX}:where"
+INFLIGHT_KEY = f"{KEY_PREFIX}:inflight"
+CLAIMS_KEY = f"{KEY_PREFIX}:claims"
+ATTEMPTS_KEY = f"{KEY_PREFIX}:attempts"
+DEAD_KEY = f"{KEY_PREFIX}:dead"
+
+# KEYS[1] = buckets, KEYS[2] = items, KEYS[3] = where, KEYS[4] = attempts
+# ARGV[1] = item_id, ARGV[2] = 발송 시각, ARGV[3] = bucket, ARGV[4] = payload, ARGV[5] = bucket 키 prefix
+SCHEDULE_SCRIPT = """
+local old = redis.call('HGET', KEYS[3], ARGV[1])
+if old then
+    redis.call('ZREM', ARGV[5] .. old, ARGV[1])
+end
+
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[4])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+redis.call('HDEL', KEYS[4], ARGV[1])
+redis.call('ZADD', ARGV[5] .. ARGV[3], ARGV[2], ARGV[1])
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[3])
+return 1
+"""
+
+# KEYS[1] = items, KEYS[2] = where, KEYS[3] = inflight, KEYS[4] = attempts, KEYS[5] = claims
+# ARGV[1] = item_id, ARGV[2] = bucket 키 prefix
+# 빈 bucket은 다음 claim에서 정리됨
+CANCEL_SCRIPT = """
+local old = redis.call('HGET', KEYS[2], ARGV[1])
+if old then
+    redis.call('ZREM', ARGV[2] .. old, ARGV[1])
+end
+
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('HDEL', KEYS[5], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+return redis.call('HDEL', KEYS[1], ARGV[1])
+"""
+
+# KEYS[1] = buckets, KEYS[2] = items, KEYS[3] = inflight, KEYS[4] = where, KEYS[5] = claims
+# ARGV[1] = 현재 시각, ARGV[2] = 최대 개수, ARGV[3] = lease 만료 시각,
+# ARGV[4] = bucket 키 prefix, ARGV[5] = 현재 bucket, ARGV[6] = claim 토큰
+# 반환: {item_id, payload, item_id, payload, ...}
+CLAIM_SCRIPT = """
+local claimed = {}
+local limit = tonumber(ARGV[2])
+local buckets = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[5], 'LIMIT', 0, 32)
+
+for _, bucket in ipairs(buckets) do
+    local need = limit - #claimed / 2
+    if need <= 0 then
+        break
+    end
+
+    local key = ARGV[4] .. bucket
+    local ids = redis.call('ZRANGEBYSCORE', key, '-inf', ARGV[1], 'LIMIT', 0, need)
+    for _, id in ipairs(ids) do
+        redis.call('ZREM', key, id)
+        redis.call('HDEL', KEYS[4], id)
+        local payload = redis.call('HGET', KEYS[2], id)
+        if payload then
+            redis.call('ZADD', KEYS[3], ARGV[3], id)
+            redis.call('HSET', KEYS[5], id, ARGV[6])
+            claimed[#claimed + 1] = id
+            claimed[#claimed + 1] = payload
+        end
+    end
+
+    if redis.call('ZCARD', key) == 0 then
+        redis.call('ZREM', KEYS[1], bucket)
+    end
+end
+
+return claimed
+"""
+
+# KEYS[1] = inflight, KEYS[2] = items, KEYS[3] = where, KEYS[4] = attempts, KEYS[5] = claims
+# ARGV[1] = claim 토큰, ARGV[2..] = item_id 목록
+# lease를 잃은 항목(토큰 불일치)은 건드리지 않고, 처리 중에 재예약된 항목(where에 다시 등록됨)은 새 예약을 남겨 둠
+ACK_SCRIPT = """
+local acked = 0
+for i = 2, #ARGV do
+    local id = ARGV[i]
+    if redis.call('HGET', KEYS[5], id) == ARGV[1] then
+        redis.call('ZREM', KEYS[1], id)
+        redis.call('HDEL', KEYS[5], id)
+        if redis.call('HEXISTS', KEYS[3], id) == 0 then
+            redis.call('HDEL', KEYS[2], id)
+            redis.call('HDEL', KEYS[4], id)
+            acked = acked + 1
+        end
+    end
+end
+return acked
+"""
+
+# KEYS[1] = inflight, KEYS[2] = claims
+# ARGV[1] = claim 토큰, ARGV[2] = 새 lease 만료 시각, ARGV[3..] = item_id 목록
+# 반환: 연장한 수 (lease를 잃은 항목은 제외)
+RENEW_SCRIPT = """
+local renewed = 0
+for i = 3, #ARGV do
+    local id = ARGV[i]
+    if redis.call('HGET', KEYS[2], id) == ARGV[1] then
+        redis.call('ZADD', KEYS[1], 'XX', ARGV[2], id)
+        renewed = renewed + 1
+    end
+end
+return renewed
+"""
+
+# KEYS[1] = inflight, KEYS[2] = items, KEYS[3] = buckets, KEYS[4] = where,
+# KEYS[5] = attempts, KEYS[6] = dead, KEYS[7] = claims
+# ARGV[1] = 현재 시각, ARGV[2] = bucket 키 prefix, ARGV[3] = 현재 bucket, ARGV[4] = 최대 개수,
+# ARGV[5] = 최대 시도 횟수
+# lease가 만료된 항목의 claim을 무효화하고 현재 bucket으로 되돌리며, 시도 횟수를 넘긴 항목은 dead-letter로 옮김
+# 반환: {되돌린 수, dead-letter로 옮긴 수}
+REQUEUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[4]))
+local max_attempts = tonumber(ARGV[5])
+local requeued = 0
+local dead = 0
+
+for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('HDEL', KEYS[7], id)
+    local payload = redis.call('HGET', KEYS[2], id)
+    if payload and redis.call('HEXISTS', KEYS[4], id) == 0 then
+        if redis.call('HINCRBY', KEYS[5], id, 1) >= max_attempts then
+            redis.call('HSET', KEYS[6], id, payload)
+            redis.call('HDEL', KEYS[2], id)
+            redis.call('HDEL', KEYS[5], id)
+            dead = dead + 1
+        else
+            redis.call('ZADD', ARGV[2] .. ARGV[3], ARGV[1], id)
+            redis.call('HSET', KEYS[4], id, ARGV[3])
+            requeued = requeued + 1
+        end
+    end
+end
+
+if requeued > 0 then
+    redis.call('ZADD', KEYS[3], ARGV[3], ARGV[3])
+end
+return {requeued, dead}
+"""
+
+Handler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class NotificationScheduler:
+    _SCRIPTS: Dict[str, str] = {
+        "schedule": SCHEDULE_SCRIPT,
+        "cancel": CANCEL_SCRIPT,
+        "claim": CLAIM_SCRIPT,
+        "ack": ACK_SCRIPT,
+        "renew": RENEW_SCRIPT,
+        "requeue": REQUEUE_SCRIPT,
+    }
+
+    def __init__(
+            self,
+            handler: Handler,
+            bucket_seconds: int = settings.NOTIFICATION_SCHEDULER_BUCKET_SECONDS,
+            batch_size: int = settings.NOTIFICATION_SCHEDULER_BATCH_SIZE,
+            concurrency: int = settings.NOTIFICATION_SCHEDULER_CONCURRENCY,
+            lease_seconds: float = settings.NOTIFICATION_SCHEDULER_LEASE_SECONDS,
+            max_attempts: int = settings.NOTIFICATION_SCHEDULER_MAX_ATTEMPTS,
+            poll_interval: float = settings.NOTIFICATION_SCHEDULER_POLL_INTERVAL_SECONDS
+    ):
+        """
+        Args:
+            handler: 발송 코루틴 (item_id, payload), 예외 시 lease 만료 후 재시도
+            bucket_seconds: 시간 bucket 크기
+            batch_size: claim 한 번에 가져올 최대 항목 수
+            concurrency: 동시에 실행할 최대 handler 수
+            lease_seconds: lease 길이이자 handler 하나의 처리 제한 시간
+                (배치 처리 중에는 lease_seconds / 3마다 연장, 연장이 끊기면 다른 replica가 다시 가져감)
+            max_attempts: 최대 시도 횟수 (초과 시 dead-letter로 이동)
+            poll_interval: 기한이 된 항목이 없을 때 대기 시간
+        """
+        self.handler = handler
+        self.bucket_seconds = bucket_seconds
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._redis: Optional[Redis] = None
+        self._scripts: Dict[str, AsyncScript] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.dispatched = 0
+        self.failed = 0
+        self.dead_lettered = 0
+
+    # ==================== 예약 ====================
+
+    async def schedule(self, item_id: str, due_at: datetime, payload: Dict[str, Any]) -> None:
+        """
+        알림을 예약합니다. 같은 item_id로 다시 호출하면 시각/내용을 교체합니다.
+
+        Args:
+            item_id: 알림 ID (멱등 키)
+            due_at: 발송 시각
+            payload: 알림 내용
+        """
+        due = due_at.timestamp()
+        bucket = self._bucket(due)
+        script = await self._get_script("schedule")
+
+        await script(
+            keys=[BUCKETS_KEY, ITEMS_KEY, WHERE_KEY, ATTEMPTS_KEY],
+            args=[item_id, due, bucket, orjson.dumps(payload), BUCKET_PREFIX]
+        )
+
+    async def cancel(self, item_id: str) -> bool:
+        """
+        예약을 취소합니다.
+
+        Returns:
+            bool: 취소할 예약이 있었는지 여부
+        """
+        script = await self._get_script("cancel")
+        removed = await script(
+            keys=[ITEMS_KEY, WHERE_KEY, INFLIGHT_KEY, ATTEMPTS_KEY, CLAIMS_KEY],
+            args=[item_id, BUCKET_PREFIX]
+        )
+        return bool(removed)
+
+    # ==================== 수명 주기 ====================
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Notification scheduler started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Notification scheduler stopped")
+
+    # ==================== 내부 ====================
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    async def _get_script(self, name: str) -> AsyncScript:
+        redis = await get_redis_client()
+
+        if redis is not self._redis:
+            self._scripts = {
+                script_name: redis.register_script(source)
+                for script_name, source in self._SCRIPTS.items()
+            }
+            self._redis = redis
+
+        return self._scripts[name]
+
+    async def _claim(self) -> Tuple[str, List[Tuple[str, Dict[str, Any]]]]:
+        """기한이 된 항목을 가져옵니다. Returns: (claim 토큰, [(item_id, payload), ...])"""
+        now = time.time()
+        token = uuid4().hex
+        script = await self._get_script("claim")
+        reply = await script(
+            keys=[BUCKETS_KEY, ITEMS_KEY, INFLIGHT_KEY, WHERE_KEY, CLAIMS_KEY],
+            args=[now, self.batch_size, now + self.lease_seconds, BUCKET_PREFIX, self._bucket(now), token]
+        )
+        return token, [(reply[i], orjson.loads(reply[i + 1])) for i in range(0, len(reply), 2)]
+
+    async def _requeue_expired(self) -> Tuple[int, int]:
+        now = time.time()
+        script = await self._get_script("requeue")
+        requeued, dead = await script(
+            keys=[INFLIGHT_KEY, ITEMS_KEY, BUCKETS_KEY, WHERE_KEY, ATTEMPTS_KEY, DEAD_KEY, CLAIMS_KEY],
+            args=[now, BUCKET_PREFIX, self._bucket(now), self.batch_size, self.max_attempts]
+        )
+        return int(requeued), int(dead)
+
+    async def _renew_loop(self, token: str, held: Set[str]) -> None:
+        """배치를 ack할 때까지 held 항목의 lease를 연장합니다."""
+        script = await self._get_script("renew")
+
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not held:
+                continue
+            try:
+                await script(keys=[INFLIGHT_KEY, CLAIMS_KEY], args=[token, time.time() + self.lease_seconds, *held])
+            except Exception as e:
+                logger.warning(f"Failed to renew notification leases: {e}")
+
+    async def _dispatch(self, item_id: str, payload: Dict[str, Any], held: Set[str]) -> Optional[str]:
+        try:
+            async with self._semaphore:
+                # lease 연장은 배치 단위이므로 handler 하나가 lease를 넘겨 붙잡지 않도록 제한
+                await asyncio.wait_for(self.handler(item_id, payload), timeout=self.lease_seconds)
+            return item_id
+        except Exception as e:
+            # 실패한 항목은 연장을 멈춰 lease 만료 후 재시도되도록 함 (성공한 항목은 ack까지 유지)
+            held.discard(item_id)
+            self.failed += 1
+            logger.error(f"Scheduled notification failed (retry after lease): {item_id}: {e!r}")
+            return None
+
+    async def _dispatch_batch(self, token: str, claimed: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """claim한 배치를 처리하고 성공한 항목을 ack합니다. Returns: 성공한 수"""
+        held = {item_id for item_id, _ in claimed}
+        renewer = asyncio.create_task(self._renew_loop(token, held))
+        try:
+            done = await asyncio.gather(*(self._dispatch(i, p, held) for i, p in claimed))
+        finally:
+            renewer.cancel()
+            try:
+                await renewer
+            except asyncio.CancelledError:
+                pass
+
+        succeeded = [item_id for item_id in done if item_id is not None]
+        if not succeeded:
+            return 0
+
+        script = await self._get_script("ack")
+        acked = await script(
+            keys=[INFLIGHT_KEY, ITEMS_KEY, WHERE_KEY, ATTEMPTS_KEY, CLAIMS_KEY],
+            args=[token, *succeeded]
+        )
+        if acked < len(succeeded):
+            logger.debug(f"{len(succeeded) - acked} notifications were rescheduled or lost their lease before ack")
+        return len(succeeded)
+
+    async def _run(self) -> None:
+        last_requeue = 0.0
+
+        while True:
+            try:
+                if time.monotonic() - last_requeue >= self.lease_seconds / 2:
+                    requeued, dead = await self._requeue_expired()
+                    if requeued:
+                        logger.warning(f"Requeued {requeued} notifications with expired lease")
+                    if dead:
+                        self.dead_lettered += dead
+                        logger.error(
+                            f"Moved {dead} notifications to dead-letter after {self.max_attempts} attempts"
+                        )
+                    last_requeue = time.monotonic()
+
+                token, claimed = await self._claim()
+                if claimed:
+                    self.dispatched += await self._dispatch_batch(token, claimed)
+
+                # 배치가 가득 찼으면 밀린 항목이 더 있으므로 바로 다음 claim
+                if len(claimed) < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification scheduler loop failed: {e}")
+                await asyncio.sleep(self.poll_interval)
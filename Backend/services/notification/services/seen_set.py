@@ -0,0 +1,85 @@
+"""
+Seen Set
+
+Kafka at-least-once 재전달로 들어오는 중복 이벤트 ID를 걸러내는 Bloom filter 기반 집합입니다.
+
+- 두 세대(current / previous)를 유지하며, current가 용량에 도달하거나 rotate_interval이 지나면
+  previous를 버리고 새 세대로 교체합니다. 따라서 메모리는 세대 크기의 2배로 고정되고,
+  최소 한 세대 동안 본 ID는 중복으로 판정됩니다.
+- Bloom filter 특성상 거짓 양성(처음 본 ID를 중복으로 판정)이 error_rate 확률로 발생하며,
+  거짓 음성은 없습니다. 알림 한 건이 드물게 빠지는 것은 허용합니다.
+"""
+
+import hashlib
+import math
+import time
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: 저장할 최대 원소 수
+            error_rate: capacity만큼 채웠을 때의 거짓 양성 확률
+        """
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # double hashing: h1 + i * h2
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> None:
+        for p in self._positions(item):
+            self._bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class RotatingSeenSet:
+    def __init__(self, capacity: int, error_rate: float, rotate_interval: float):
+        """
+        Args:
+            capacity: 세대당 최대 원소 수
+            error_rate: 세대당 거짓 양성 확률
+            rotate_interval: 세대 교체 주기 (초)
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rotate_interval = rotate_interval
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = BloomFilter(capacity, error_rate)
+        self._rotated_at = time.monotonic()
+
+    def _maybe_rotate(self) -> None:
+        if (
+                self._current.count >= self.capacity
+                or time.monotonic() - self._rotated_at >= self.rotate_interval
+        ):
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = time.monotonic()
+
+    def check_and_add(self, item: str) -> bool:
+        """
+        ID를 기록합니다.
+
+        Returns:
+            bool: 이미 본 ID이면 True
+        """
+        self._maybe_rotate()
+
+        if item in self._current or item in self._previous:
+            return True
+
+        self._current.add(item)
+        return False
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from commons.service_auth import require_service_token
+from commons.validate_jwt import JWTValidator
+from dto.profile_dto import ProfileBatchRequest, ProfileBatchResponse, ProfileSummary
+from models.user_profile import ProfileUpdate
+from services.profile_service import profile_service
+
+validator = JWTValidator()
+
+router = APIRouter()
+
+
+@router.post(
+    "/profiles/batch",
+    response_model=ProfileBatchResponse,
+    dependencies=[Depends(require_service_token)]
+)
+async def get_profiles(request: ProfileBatchRequest):
+    """
+    프로필 일괄 조회 (서비스 간 호출용, commons.profile_client, X-Service-Token 필요)
+
+    요청 크기와 무관하게 Redis MGET 1회 + miss 시 MongoDB 1회로 응답합니다.
+    """
+    return ProfileBatchResponse(profiles=await profile_service.get_many(request.ids))
+
+
+@router.get("/profiles/{user_id}", response_model=ProfileSummary)
+async def get_profile(user_id: str, authorization: str = Header(default=None)):
+    await validator.verify_jwt_http(authorization)
+
+    profile = await profile_service.get(user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return profile
+
+
+@router.patch("/profiles/me", response_model=ProfileSummary)
+async def update_my_profile(update: ProfileUpdate, authorization: str = Header(default=None)):
+    payload = await validator.verify_jwt_http(authorization)
+    return await profile_service.update(payload["userId"], update)
@@ -1,2 +1,18 @@
+from api import profiles
+from commons.app_factory import create_app
+from commons.settings import settings
+from models.user_profile import UserProfile
+
+app = create_app(
+    "user",
+    routers=[profiles.router],
+    db_name=settings.USER_DB_NAME,
+    models=[UserProfile],
+    use_session_view=True,
+)
+
+
 if __name__ == "__main__":
-    pass
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+
+from beanie import Document
+from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel
+
+from dto.profile_dto import ProfileSummary
+
+
+class UserProfile(Document):
+    """사용자 프로필"""
+    user_id: str
+    display_name: str
+    avatar_url: Optional[str] = None
+    version: int = 0  # 수정할 때마다 증가 (캐시가 오래된 값으로 덮어쓰이지 않도록 비교)
+    updated_at: datetime
+
+    class Settings:
+        name = "user_profiles"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], unique=True),
+        ]
+
+
+class ProfileUpdate(BaseModel):
+    """프로필 수정 요청 (None인 필드는 변경하지 않음)"""
+    display_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+
+class VersionedProfile(ProfileSummary):
+    """캐시 저장용 프로필 (응답에는 version을 포함하지 않음)"""
+    version: int = 0
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from pymongo import ReturnDocument
+
+from databases.base_repository import BaseRepository
+from models.user_profile import UserProfile, VersionedProfile
+
+
+class ProfileRepository(BaseRepository[UserProfile]):
+    def __init__(self):
+        super().__init__(UserProfile)
+
+    async def find_many(self, user_ids: Sequence[str]) -> List[VersionedProfile]:
+        """user_id $in 조회 1회 (user_id unique 인덱스 사용)"""
+        return await self.find_projected({"user_id": {"$in": list(user_ids)}}, VersionedProfile)
+
+    async def update(self, user_id: str, fields: Dict[str, Any]) -> VersionedProfile:
+        """프로필을 수정(없으면 생성)하고 version을 올린 뒤 수정된 프로필을 반환합니다."""
+        update: Dict[str, Any] = {
+            "$set": {**fields, "updated_at": datetime.now()},
+            "$inc": {"version": 1},
+        }
+        if "display_name" not in fields:
+            # 새로 생성되는 경우 필수 필드 기본값
+            update["$setOnInsert"] = {"display_name": user_id}
+
+        doc = await self.collection.find_one_and_update(
+            {"user_id": user_id},
+            update,
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection={"_id": 0, "user_id": 1, "display_name": 1, "avatar_url": 1, "version": 1}
+        )
+        return VersionedProfile.model_validate(doc)
@@ -0,0 +1,162 @@
+"""
+Profile Service
+
+프로필 조회용 read-through 캐시입니다.
+
+- 캐시 키: profile:{user_id} ("{version}|{ProfileSummary JSON}"), 존재하지 않는 사용자는 빈 문자열로
+  PROFILE_MISSING_TTL_SECONDS 동안 캐시해 반복 조회가 MongoDB로 가지 않도록 합니다.
+- get_many는 요청 크기와 무관하게 MGET 1회 + (miss가 있으면) MongoDB $in 1회 + SET NX 파이프라인 1회로
+  처리합니다.
+- 수정 시 캐시를 지우지 않고 새 값을 씁니다. 캐시 채우기는 SET NX라 수정 전에 MongoDB에서 읽은 값이
+  덮어쓰지 못하고, 수정끼리는 version이 더 클 때만 반영합니다.
+- 수정 후 PROFILE_EVENTS_CHANNEL로 {"userId": ...} 이벤트를 발행해
+  다른 서비스의 near-cache(commons.profile_client)를 무효화합니다.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from commons.logger import get_marigold_logger
+from commons.settings import settings
+from databases.redis_client import get_redis_client
+from dto.profile_dto import ProfileSummary
+from models.user_profile import ProfileUpdate, VersionedProfile
+from repositories.profile_repository import ProfileRepository
+
+logger = get_marigold_logger(__name__)
+
+PROFILE_PREFIX = "profile:"
+MISSING = ""
+VERSION_SEPARATOR = "|"
+
+# KEYS[1] = profile:{user_id}, ARGV[1] = version, ARGV[2] = 캐시 값, ARGV[3] = TTL(초)
+# 캐시에 같거나 더 새로운 version이 있으면 덮어쓰지 않음
+SET_IF_NEWER_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= '' then
+    local sep = string.find(current, '|', 1, true)
+    if sep and tonumber(string.sub(current, 1, sep - 1)) >= tonumber(ARGV[1]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+def profile_key(user_id: str) -> str:
+    return f"{PROFILE_PREFIX}{user_id}"
+
+
+def encode_entry(profile: VersionedProfile) -> str:
+    return f"{profile.version}{VERSION_SEPARATOR}{profile.model_dump_json(exclude={'version'})}"
+
+
+def decode_entry(value: str) -> ProfileSummary:
+    _, _, body = value.partition(VERSION_SEPARATOR)
+    return ProfileSummary.model_validate_json(body)
+
+
+class ProfileService:
+    _SCRIPTS: Dict[str, str] = {
+        "set_if_newer": SET_IF_NEWER_SCRIPT,
+    }
+
+    def __init__(self, repository: Optional[ProfileRepository] = None):
+        self.repository = repository or ProfileRepository()
+        self.ttl = settings.PROFILE_CACHE_TTL_SECONDS
+        self.missing_ttl = settings.PROFILE_MISSING_TTL_SECONDS
+        self._redis: Optional[Redis] = None
+        self._scripts: Dict[str, AsyncScript] = {}
+
+    async def _get_script(self, name: str) -> AsyncScript:
+        redis = await get_redis_client()
+
+        if redis is not self._redis:
+            self._scripts = {
+                script_name: redis.register_script(source)
+                for script_name, source in self._SCRIPTS.items()
+            }
+            self._redis = redis
+
+        return self._scripts[name]
+
+    async def get_many(self, user_ids: Iterable[str]) -> Dict[str, ProfileSummary]:
+        """
+        여러 사용자의 프로필을 조회합니다.
+
+        Args:
+            user_ids: 사용자 ID 목록 (중복 허용)
+
+        Returns:
+            user_id → 프로필 (존재하지 않는 사용자는 제외)
+        """
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+
+        redis = await get_redis_client()
+        cached = await redis.mget([profile_key(user_id) for user_id in ids])
+
+        profiles: Dict[str, ProfileSummary] = {}
+        misses: List[str] = []
+        for user_id, value in zip(ids, cached):
+            if value is None:
+                misses.append(user_id)
+            elif value != MISSING:
+                profiles[user_id] = decode_entry(value)
+
+        if not misses:
+            return profiles
+
+        loaded = {profile.user_id: profile for profile in await self.repository.find_many(misses)}
+        profiles.update(
+            (user_id, ProfileSummary.model_validate(profile.model_dump(exclude={"version"})))
+            for user_id, profile in loaded.items()
+        )
+
+        try:
+            # NX: 조회하는 동안 update가 쓴 더 새로운 값을 덮어쓰지 않음
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id in misses:
+                    profile = loaded.get(user_id)
+                    if profile is not None:
+                        pipe.set(profile_key(user_id), encode_entry(profile), ex=self.ttl, nx=True)
+                    else:
+                        pipe.set(profile_key(user_id), MISSING, ex=self.missing_ttl, nx=True)
+                await pipe.execute()
+        except Exception as e:
+            # 캐시 채우기 실패는 응답에 영향 없음
+            logger.warning(f"Failed to fill profile cache: {e}")
+
+        return profiles
+
+    async def get(self, user_id: str) -> Optional[ProfileSummary]:
+        return (await self.get_many([user_id])).get(user_id)
+
+    async def update(self, user_id: str, update: ProfileUpdate) -> ProfileSummary:
+        """
+        프로필을 수정하고 캐시에 새 값을 씁니다.
+
+        Mongo 반영 후 캐시 갱신(version 비교)과 이벤트 발행을 파이프라인 한 번으로 처리합니다.
+        """
+        profile = await self.repository.update(user_id, update.model_dump(exclude_none=True))
+        script = await self._get_script("set_if_newer")
+
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            await script(
+                keys=[profile_key(user_id)],
+                args=[profile.version, encode_entry(profile), self.ttl],
+                client=pipe
+            )
+            pipe.publish(settings.PROFILE_EVENTS_CHANNEL, orjson.dumps({"userId": user_id}))
+            await pipe.execute()
+
+        return ProfileSummary.model_validate(profile.model_dump(exclude={"version"}))
+
+
+profile_service = ProfileService()